@@ -1,11 +1,50 @@
 import streamlit as st
-import pandas as pd
-from src.data_sources.linkedin import LinkedInSource
-from src.data_sources.pubmed import PubMedSource
-from src.enrichment.geo import enrich_location_data
-from src.enrichment.contact import enrich_contact_info
-from src.ranking.scorer import LeadScorer
-import pydeck as pdk
+import numpy as np
+from src.data_sources.registry import create_source, register_source, source_names
+from src.ranking.rules import load_scorer
+from src.pipeline.streaming import default_stages
+from src.ranking.cache import CachedScorer, ScoreCache
+from src.storage.lead_store import LeadStore
+from src.storage.lead_index import LeadIndex, field_query, parse_query
+from src.enrichment.dedup import dedupe_leads
+from src.enrichment.lookup import render_location_details
+from src.ranking.topk import rank_page, page_count, top_k
+from src.pipeline.export import CrmExporter, write_csv, write_parquet
+from src.pipeline.refresh import RefreshScheduler
+from src.enrichment.map_data import map_layer_data
+from src.pipeline.instrumentation import collector, stage
+from src.enrichment.resolver import BatchContactEnricher, RestResolver, StubResolver
+import io
+import os
+import time
+from functools import partial
+
+LEAD_STORE_PATH = os.environ.get("LEAD_STORE_PATH", "data/leads.db")
+SCORE_CACHE_PATH = os.environ.get("SCORE_CACHE_PATH", "data/score_cache.db")
+SCORING_RULES_PATH = os.environ.get("SCORING_RULES_PATH", "config/scoring_rules.json")
+# Domain/email-pattern service; the offline stub is used when unset
+CONTACT_RESOLVER_URL = os.environ.get("CONTACT_RESOLVER_URL")
+# CRM upsert endpoint base URL; pushing is disabled when unset
+CRM_URL = os.environ.get("CRM_URL")
+# Background polling: seconds between polls of each source (0 = only when asked) and leads per poll
+REFRESH_INTERVAL = float(os.environ.get("REFRESH_INTERVAL", 900))
+# The same for synthetic (mock) sources, which mint new leads on every poll
+MOCK_REFRESH_INTERVAL = float(os.environ.get("MOCK_REFRESH_INTERVAL", 0))
+REFRESH_LIMIT = int(os.environ.get("REFRESH_LIMIT", 50))
+# How often the sidebar checks on the background refresh
+REFRESH_STATUS_SECONDS = 2
+# PubMed backend: "mock" (synthetic papers) or "eutils" (live NCBI E-utilities)
+PUBMED_SOURCE = os.environ.get("PUBMED_SOURCE", "mock")
+# E-utilities options; the NCBI API key raises the request limit from 3/s to 10/s
+EUTILS_OPTIONS = {key: value for key, value in {
+    "base_url": os.environ.get("EUTILS_URL"),
+    "api_key": os.environ.get("NCBI_API_KEY"),
+    "email": os.environ.get("NCBI_EMAIL"),
+    "cache_dir": os.environ.get("EUTILS_CACHE_DIR"),
+}.items() if value}
+
+if PUBMED_SOURCE == "eutils":
+    register_source("PubMed", "src.data_sources.eutils:PubMedEUtilsSource")
 
 # Page Config
 # Page Config
@@ -117,6 +156,151 @@ def display_metric_card(col, title, value, description=None):
             </div>
         """, unsafe_allow_html=True)
 
+# --- CACHED RESOURCES & COMPUTE STAGE ---
+@st.cache_resource
+def get_store(path):
+    return LeadStore(path)
+
+@st.cache_resource
+def get_source(name):
+    # Imports the source's module on first use
+    if name == "PubMed" and PUBMED_SOURCE == "eutils":
+        return create_source(name, **EUTILS_OPTIONS)
+    return create_source(name)
+
+@st.cache_resource
+def get_contact_enricher():
+    # One enricher per process so its domain cache outlives reruns
+    resolver = RestResolver(CONTACT_RESOLVER_URL) if CONTACT_RESOLVER_URL else StubResolver()
+    return BatchContactEnricher(resolver)
+
+@st.cache_resource
+def get_crm_exporter():
+    # One pooled session per process
+    return CrmExporter(CRM_URL)
+
+@st.cache_resource
+def get_refresher():
+    # One background poller per process, writing into the shared store
+    enricher = get_contact_enricher()
+
+    def stages():
+        # Rules are re-read per poll, so edits apply from the next one
+        return default_stages(load_scorer(SCORING_RULES_PATH), text=False, contacts=enricher)
+
+    refresher = RefreshScheduler(get_store(LEAD_STORE_PATH), stages)
+    for name in source_names():
+        source = get_source(name)
+        interval = MOCK_REFRESH_INTERVAL if source.synthetic else REFRESH_INTERVAL
+        refresher.add(name, source, REFRESH_LIMIT, interval=interval or None,
+                      rate=source.rate_limit, burst=source.rate_burst)
+    return refresher.start()
+
+def format_age(seconds):
+    seconds = max(0, int(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m"
+    return f"{seconds // 3600}h {seconds % 3600 // 60}m"
+
+def refresh_caption(status, now):
+    """One line of background refresh state for a source."""
+    if status.state == "running":
+        text = f"{status.name}: refreshing, {status.stats.total} leads so far"
+        if status.throttled >= 1:
+            text += f" ({format_age(status.throttled)} waiting on rate limit)"
+        return text
+    if status.state == "queued":
+        return f"{status.name}: queued"
+    if status.state == "backoff":
+        return (f"{status.name}: failed {status.failures}x ({status.last_error}), "
+                f"retrying in {format_age(status.next_run - now)}")
+    if status.last_success is None:
+        return f"{status.name}: not refreshed yet"
+    stats = status.stats
+    text = (f"{status.name}: {format_age(now - status.last_success)} ago, "
+            f"{stats.new} new, {stats.changed} changed, {stats.unchanged} unchanged")
+    if status.next_run is not None:
+        text += f"; next in {format_age(status.next_run - now)}"
+    return text
+
+@st.fragment(run_every=REFRESH_STATUS_SECONDS)
+def refresh_status(refresher, store, rendered_revision):
+    """Background refresh state; reruns the page once new leads are stored."""
+    now = time.time()
+    for status in refresher.status().values():
+        st.caption(refresh_caption(status, now))
+    st.caption(f"Refresh queue: {refresher.queue_depth()} waiting")
+    if store.revision() != rendered_revision:
+        st.rerun()
+
+def export_bytes(df, write):
+    """The view ranked by score and written by `write_csv`/`write_parquet`, for a download."""
+    buffer = io.BytesIO()
+    write(top_k(df, len(df)), buffer)
+    return buffer.getvalue()
+
+def rules_version(path):
+    # Rules file edits bump the mtime, which rebuilds the scorer
+    return os.path.getmtime(path) if os.path.exists(path) else None
+
+@st.cache_resource
+def get_scorer(path, version):
+    return CachedScorer(load_scorer(path), ScoreCache(path=SCORE_CACHE_PATH))
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def compute_leads(sources, store_revision, scorer_version):
+    """Scored pool for the selected sources; shared read-only between reruns."""
+    df = get_store(LEAD_STORE_PATH).load(sources=list(sources))
+    if not df.empty:
+        # Same person across LinkedIn/PubMed counts once, with paper signals merged
+        with stage("dedupe_leads", rows=len(df)):
+            df = dedupe_leads(df)
+        # Display text is rendered per shown row from score_flags and the location parts
+        df = df.drop(columns=["score_reasons", "location_details"], errors="ignore")
+        with stage("score_frame", rows=len(df)):
+            df = get_scorer(SCORING_RULES_PATH, scorer_version).score_frame(df, reasons=False)
+    return df
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def get_pool_index(sources, store_revision, scorer_version):
+    """
+    Inverted index over the scored pool; its positions are pool rows.
+
+    Built from the pool rather than taken from `LeadStore.index()`, because
+    dedupe makes pool rows the store never held: the kept record carries a
+    merged paper title and is rescored, so "title:director AND paper:..."
+    must match fields that came from different stored records. The O(pool)
+    build runs once per store revision and source selection.
+    """
+    return LeadIndex.from_frame(compute_leads(sources, store_revision, scorer_version))
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+def filter_view(df, index, min_score, location_filter="", query="", signal_masks=()):
+    """Cheap view stage: score, text and signal filters over the cached pool.
+
+    Text and score filters are answered by the pool's inverted index; rows
+    stay unsorted, the table ranks only the page it shows.
+    """
+    # Location words match as prefixes, so "bos" already finds Boston
+    text = field_query("location", location_filter)
+    if query:
+        text = f"{text} ({query})"
+    # Scores come from the frame, which may be rescored under what-if weights
+    df = df.iloc[index.positions(text, min_score=min_score, scores=df["score"].to_numpy())]
+    for mask in signal_masks:
+        df = df[(df['score_flags'] & mask) != 0]
+    return df
+
+def with_display_text(df, scorer):
+    """Materialize score_reasons and location_details for the rows being shown."""
+    df = df.copy()
+    df["location_details"] = render_location_details(df)
+    df["score_reasons"] = scorer.render_reasons(df)
+    return df
+
 # Title and Breadcrumbs styled header
 st.markdown("""
     <div style="margin-bottom: 30px;">
@@ -129,80 +313,113 @@ st.markdown("""
 st.sidebar.header("Filter Controls")
 source_type = st.sidebar.multiselect(
     "Data Sources", 
-    ["LinkedIn", "PubMed"], 
+    source_names(), 
     default=["LinkedIn", "PubMed"]
 )
 st.sidebar.markdown("---")
 num_leads = st.sidebar.slider("Leads to Fetch", 10, 100, 50)
 min_score = st.sidebar.slider("Min Propensity Score", 0, 100, 50)
 location_filter = st.sidebar.text_input("Location Filter (e.g., Boston)")
+keyword_query = st.sidebar.text_input(
+    "Keyword Search",
+    help="Words match title, company, location or paper title. Narrow with field:word "
+         "(e.g. title:director), combine with AND / OR / parentheses, end a word with * to match prefixes."
+)
+try:
+    parse_query(keyword_query)
+except ValueError as error:
+    st.sidebar.warning(f"Ignoring keyword search: {error}")
+    keyword_query = ""
 
-# Run Agent Button (Styled)
-if st.sidebar.button("🚀 Run Lead Gen Agent", type="primary"):
-    with st.spinner("Gathering intelligence..."):
-        all_leads = []
-        
-        # 1. Identification
-        if "LinkedIn" in source_type:
-            li_source = LinkedInSource()
-            leads = li_source.fetch_data(limit=num_leads//2 if "PubMed" in source_type else num_leads)
-            all_leads.extend(leads)
-            
-        if "PubMed" in source_type:
-            pm_source = PubMedSource()
-            leads = pm_source.fetch_data(limit=num_leads//2 if "LinkedIn" in source_type else num_leads)
-            all_leads.extend(leads)
-            
-        # 2. Enrichment & 3. Ranking
-        scorer = LeadScorer()
-        processed_leads = []
-        
-        for lead in all_leads:
-            # Enrichment
-            lead = enrich_location_data(lead)
-            lead = enrich_contact_info(lead)
-            
-            # Ranking
-            lead = scorer.score_profile(lead)
-            
-            processed_leads.append(lead)
-            
-        # Create DataFrame
-        df = pd.DataFrame(processed_leads)
-        
-        # Filtering
-        if location_filter:
-            df = df[df['location'].str.contains(location_filter, case=False, na=False)]
-            
-        df = df[df['score'] >= min_score]
-        
-        # Sort by Score
-        df = df.sort_values(by="score", ascending=False)
-        
-        # --- DASHBOARD METRICS ---
-        st.markdown("### Key Performance Indicators")
-        m_col1, m_col2, m_col3 = st.columns(3)
-        
-        total_found = len(all_leads)
-        qualified_count = len(df)
-        avg_score = df['score'].mean() if not df.empty else 0
-        
-        display_metric_card(m_col1, "Total Leads Found", f"{total_found}", "Raw leads gathered from sources")
-        display_metric_card(m_col2, "Qualified Opportunities", f"{qualified_count}", f"> {min_score} Propensity Score")
-        display_metric_card(m_col3, "Avg. Propensity Score", f"{avg_score:.1f}", "Overall lead quality index")
-        
-        st.markdown("<div style='height: 30px;'></div>", unsafe_allow_html=True)
+# Lead Store: results persist between sessions and refreshes only process churn
+store = get_store(LEAD_STORE_PATH)
+scorer_version = rules_version(SCORING_RULES_PATH)
+reason_masks = get_scorer(SCORING_RULES_PATH, scorer_version).reason_masks()
+required_signals = st.sidebar.multiselect(
+    "Required Signals",
+    list(reason_masks),
+    format_func=lambda name: name.replace("_", " ").title()
+)
 
-        # --- MAIN TABLE ---
-        st.markdown("### 🎯 Qualified Targets")
-        
-        # Configure columns for display
-        display_cols = [
-            "score", "name", "title", "company", "location_details", "email", "score_reasons", "source"
-        ]
-        
+# Sources are polled in the background: fetching, enrichment and scoring (only
+# of new or changed leads) never block the page, which reads the store
+refresher = get_refresher()
+
+# Run Agent Button (Styled): queues an immediate poll of the selected sources
+if st.sidebar.button("🚀 Run Lead Gen Agent", type="primary") and source_type:
+    for name in source_type:
+        refresher.trigger([name], limit=num_leads // len(source_type))
+
+store_revision = store.revision()
+with st.sidebar:
+    refresh_status(refresher, store, store_revision)
+
+# What-if weights: the pool is rescored from its score_flags, without re-matching
+rule_weights = get_scorer(SCORING_RULES_PATH, scorer_version).weights()
+weight_keys = {name: f"weight_{name}_{scorer_version}" for name in rule_weights}
+
+def reset_weights():
+    for key in weight_keys.values():
+        st.session_state.pop(key, None)
+
+with st.sidebar.expander("⚖️ What-if Weights"):
+    what_if = {
+        name: st.slider(name.replace("_", " ").title(), 0, max(60, points), points, key=weight_keys[name])
+        for name, points in rule_weights.items()
+    }
+    st.button("Reset to rules", on_click=reset_weights)
+view_scorer = get_scorer(SCORING_RULES_PATH, scorer_version)
+if what_if != rule_weights:
+    view_scorer = view_scorer.scorer.with_weights(what_if)
+
+# Compute stage: cached on sources, store contents and scoring rules, so
+# filter changes below never refetch or re-score
+pool = compute_leads(tuple(source_type), store_revision, scorer_version)
+if what_if != rule_weights and not pool.empty:
+    with stage("rescore", rows=len(pool)):
+        pool = view_scorer.rescore(pool)
+total_found = len(pool)
+
+if not pool.empty:
+    # View stage
+    with stage("filter_view", rows=total_found):
+        df = filter_view(pool, get_pool_index(tuple(source_type), store_revision, scorer_version),
+                         min_score, location_filter, keyword_query, [reason_masks[name] for name in required_signals])
+    
+    # --- DASHBOARD METRICS ---
+    st.markdown("### Key Performance Indicators")
+    m_col1, m_col2, m_col3 = st.columns(3)
+    
+    qualified_count = len(df)
+    avg_score = df['score'].mean() if not df.empty else 0
+    
+    display_metric_card(m_col1, "Total Leads Found", f"{total_found}", "Raw leads gathered from sources")
+    display_metric_card(m_col2, "Qualified Opportunities", f"{qualified_count}", f"> {min_score} Propensity Score")
+    display_metric_card(m_col3, "Avg. Propensity Score", f"{avg_score:.1f}", "Overall lead quality index")
+    
+    st.markdown("<div style='height: 30px;'></div>", unsafe_allow_html=True)
+
+    # --- MAIN TABLE ---
+    st.markdown("### 🎯 Qualified Targets")
+    
+    # Configure columns for display
+    display_cols = [
+        "score", "name", "title", "company", "location_details", "email", "score_reasons", "source"
+    ]
+    
+    # Only the current page is ranked, rendered and styled
+    p_col1, p_col2, _ = st.columns([1, 1, 4])
+    page_size = p_col1.selectbox("Rows per page", PAGE_SIZES, index=1)
+    pages = page_count(qualified_count, page_size)
+    page = p_col2.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, step=1)
+    page_df = rank_page(df, min(page, pages) - 1, page_size)
+    if qualified_count:
+        first_row = (min(page, pages) - 1) * page_size + 1
+        st.caption(f"Showing {first_row}–{first_row + len(page_df) - 1} of {qualified_count} qualified leads")
+    
+    with stage("render.table", rows=len(page_df)):
         st.dataframe(
-            df[display_cols].style.background_gradient(subset=['score'], cmap='Greens'),
+            with_display_text(page_df, view_scorer)[display_cols].style.background_gradient(subset=['score'], cmap='Greens'),
             column_config={
                 "score": st.column_config.ProgressColumn(
                     "Score",
@@ -217,40 +434,65 @@ if st.sidebar.button("🚀 Run Lead Gen Agent", type="primary"):
             use_container_width=True,
             hide_index=True
         )
+    
+    # --- EXPORT ---
+    # Files are built only when a download is clicked, in bounded chunks
+    with st.expander("📤 Export"):
+        x_col1, x_col2, x_col3 = st.columns(3)
+        x_col1.download_button("Download CSV", partial(export_bytes, df, write_csv), "helix_leads.csv",
+                               "text/csv", on_click="ignore")
+        x_col2.download_button("Download Parquet", partial(export_bytes, df, write_parquet), "helix_leads.parquet",
+                               "application/vnd.apache.parquet", on_click="ignore")
+        if CRM_URL:
+            if x_col3.button(f"Push {qualified_count} leads to CRM"):
+                with st.spinner("Pushing to CRM..."):
+                    try:
+                        pushed = get_crm_exporter().push(top_k(df, len(df)))
+                        st.success(f"Upserted {pushed.rows} leads in {pushed.chunks} batches "
+                                   f"({pushed.seconds:.1f}s, {pushed.retries} retries)")
+                    except OSError as error:  # requests' errors are OSErrors
+                        st.error(f"CRM push failed: {error}")
+        else:
+            x_col3.caption("Set CRM_URL to push leads to your CRM.")
+    
+    st.markdown("<div style='height: 30px;'></div>", unsafe_allow_html=True)
+    
+    # --- VISUALIZATION ---
+    st.markdown("### 🌍 Location Intelligence")
+    col_map, col_stat = st.columns([2, 1])
+    
+    with col_stat:
+        remote_count = df['is_remote'].sum()
+        hq_count = len(df) - remote_count
         
-        st.markdown("<div style='height: 30px;'></div>", unsafe_allow_html=True)
-        
-        # --- VISUALIZATION ---
-        st.markdown("### 🌍 Location Intelligence")
-        col_map, col_stat = st.columns([2, 1])
+        # Using custom card for stats too, or just simple text
+        st.markdown(f"""
+            <div class="metric-card" style="margin-bottom: 10px;">
+                <div class="metric-title">Remote / Field</div>
+                <div class="metric-value">{remote_count}</div>
+            </div>
+            <div class="metric-card">
+                <div class="metric-title">HQ / Office</div>
+                <div class="metric-value">{hq_count}</div>
+            </div>
+        """, unsafe_allow_html=True)
         
-        with col_stat:
-            remote_count = df['is_remote'].sum()
-            hq_count = len(df) - remote_count
-            
-            # Using custom card for stats too, or just simple text
-            st.markdown(f"""
-                <div class="metric-card" style="margin-bottom: 10px;">
-                    <div class="metric-title">Remote / Field</div>
-                    <div class="metric-value">{remote_count}</div>
-                </div>
-                <div class="metric-card">
-                    <div class="metric-title">HQ / Office</div>
-                    <div class="metric-value">{hq_count}</div>
-                </div>
-            """, unsafe_allow_html=True)
+        if not df.empty:
+           st.markdown("#### Top Hubs")
+           st.bar_chart(df['company_hq'].value_counts().head(5), color="#3C71DD") # Using one of the theme colors
+
+    with col_map:
+         if not df.empty:
+            # Map data stage: only the tooltip columns, aggregated into grid
+            # cells once there are too many leads to send individually
+            with stage("map_layer_data", rows=len(df)):
+                map_kind, map_data = map_layer_data(df)
             
-            if not df.empty:
-               st.markdown("#### Top Hubs")
-               st.bar_chart(df['company_hq'].value_counts().head(5), color="#3C71DD") # Using one of the theme colors
-
-        with col_map:
-             if not df.empty:
-                # Placeholder for map
-                # Filter valid coordinates
-                map_data = df.dropna(subset=['lat', 'lon'])
+            if not map_data.empty:
+                # pydeck is only imported once there is a map to draw
+                import pydeck as pdk
                 
-                if not map_data.empty:
+                if map_kind == "points":
                     # Calculate view state
                     mid_lat = map_data['lat'].mean()
                     mid_lon = map_data['lon'].mean()
@@ -264,23 +506,42 @@ if st.sidebar.button("🚀 Run Lead Gen Agent", type="primary"):
                         pickable=True,
                         auto_highlight=True,
                     )
+                    tooltip = {"text": "{name}\n{company}\n{location}"}
+                else:
+                    mid_lat = np.average(map_data['lat'], weights=map_data['count'])
+                    mid_lon = np.average(map_data['lon'], weights=map_data['count'])
                     
-                    view_state = pdk.ViewState(
-                        latitude=mid_lat,
-                        longitude=mid_lon,
-                        zoom=3,
-                        pitch=0,
+                    # One column per cell: height by lead count, brighter for higher mean score
+                    layer = pdk.Layer(
+                        "ColumnLayer",
+                        data=map_data,
+                        get_position='[lon, lat]',
+                        get_elevation='count',
+                        elevation_scale=200_000 / map_data['count'].max(), # tallest cell ~200km
+                        radius=25000,
+                        get_fill_color='[60, 113, 221, 80 + mean_score * 1.75]',
+                        pickable=True,
+                        auto_highlight=True,
                     )
-                    
+                    tooltip = {"text": "{location}\n{count} leads\nAvg. score {mean_score}"}
+                
+                view_state = pdk.ViewState(
+                    latitude=mid_lat,
+                    longitude=mid_lon,
+                    zoom=3,
+                    pitch=0 if map_kind == "points" else 40,
+                )
+                
+                with stage("render.map", rows=len(map_data)):
                     st.pydeck_chart(pdk.Deck(
                         map_style='mapbox://styles/mapbox/dark-v10', # Dark style, careful with token requirements in real apps, Streamlit handles some defaults
                         initial_view_state=view_state,
                         layers=[layer],
-                        tooltip={"text": "{name}\n{company}\n{location}"}
+                        tooltip=tooltip
                     ))
-                else:
-                    st.info("No location data available for map.")
-            
+            else:
+                st.info("No location data available for map.")
+        
 else:
     # Empty State with style
     st.markdown("""
@@ -290,3 +551,33 @@ else:
             <p style="color: #818898;">Adjust filters in the sidebar and click 'Run Lead Gen Agent' to start.</p>
         </div>
     """, unsafe_allow_html=True)
+
+# --- PERFORMANCE ---
+with st.expander("⏱️ Performance"):
+    capture = st.checkbox("Capture mode (cProfile + tracemalloc)", value=collector.profile,
+                          help="Profiles every timed stage from the next run on; adds overhead")
+    collector.set_capture(capture)
+    perf = collector.to_frame()
+    if perf.empty:
+        st.caption("No stages timed yet.")
+    else:
+        st.dataframe(
+            perf,
+            column_config={
+                "seconds": st.column_config.NumberColumn("Wall time (s)", format="%.4f"),
+                "rows_per_second": st.column_config.NumberColumn("Rows/s", format="%.0f"),
+                "process_max_rss_bytes": st.column_config.NumberColumn(
+                    "Process max RSS (B)", help="Whole-process high-water mark when the stage finished"),
+                "traced_peak_bytes": st.column_config.NumberColumn("Traced peak (B)"),
+            },
+            use_container_width=True
+        )
+        e_col1, e_col2, e_col3 = st.columns(3)
+        e_col1.download_button("Export JSON", collector.to_json(indent=2), "helix_metrics.json", "application/json")
+        e_col2.download_button("Export Prometheus", collector.to_prometheus(), "helix_metrics.prom", "text/plain")
+        if e_col3.button("Reset timings"):
+            collector.reset()
+        profiled = collector.profiled_stages()
+        if profiled:
+            chosen = st.selectbox("Profile for stage", profiled)
+            st.code(collector.profile_report(chosen), language="text")
@@ -1,9 +1,17 @@
+import asyncio
 from abc import ABC, abstractmethod
-import pandas as pd
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
+from .lead import LeadBatch
+from src.pipeline.instrumentation import stage
 
 class DataSource(ABC):
     """Abstract base class for all data sources."""
+
+    # Upstream quota for background polling: fetch calls per second (None = unlimited) and burst size
+    rate_limit: Optional[float] = None
+    rate_burst: int = 1
+    # Synthetic sources mint new leads on every fetch, so polling them on a timer only grows the store
+    synthetic: bool = False
     
     @abstractmethod
     def fetch_data(self, query: str = None, **kwargs) -> List[Dict[str, Any]]:
@@ -19,6 +27,31 @@ class DataSource(ABC):
         """
         pass
 
-    def normalize(self, data: List[Dict[str, Any]]) -> pd.DataFrame:
-        """Convert list of dicts to DataFrame."""
-        return pd.DataFrame(data)
+    async def afetch_data(self, query: str = None, **kwargs) -> List[Dict[str, Any]]:
+        """
+        Async variant of `fetch_data`.
+
+        Runs the blocking `fetch_data` in a worker thread by default; sources
+        with a native async client can override it.
+        """
+        return await asyncio.to_thread(self.fetch_data, query, **kwargs)
+
+    def iter_chunks(self, query: str = None, limit: int = 100, chunk_size: int = 500, **kwargs) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Lazily fetch `limit` records as successive lists of at most `chunk_size`.
+
+        Sources backed by paginated APIs can override this to map chunks onto pages.
+        """
+        remaining = limit
+        while remaining > 0:
+            with stage(f"fetch_data.{type(self).__name__}") as span:
+                batch = self.fetch_data(query, limit=min(chunk_size, remaining), **kwargs)
+                span.rows = len(batch)
+            if not batch:
+                break
+            remaining -= len(batch)
+            yield batch
+
+    def normalize(self, data: List[Dict[str, Any]]) -> LeadBatch:
+        """Convert list of dicts to a columnar LeadBatch."""
+        return LeadBatch.from_records(data)
@@ -0,0 +1,112 @@
+import datetime
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from src.enrichment.lookup import get_location_index
+from src.data_sources.fakes import seeded_faker
+from src.data_sources.mock_data import (
+    CITY_COORDINATES, COMPANY_HQS, ACADEMIC_INSTITUTES, LINKEDIN_TITLES, PUBMED_TITLES, PUBMED_KEYWORDS
+)
+
+# Faker is only used to fill pools of this size; rows then sample the pools
+DEFAULT_POOL_SIZE = 2000
+
+_HEX = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+# Hex digits before each hyphen of the 8-4-4-4-12 form
+_UUID_HYPHENS = [8, 12, 16, 20]
+
+
+def uuid4_array(rows: int, rng: np.random.Generator) -> np.ndarray:
+    """Random version-4 UUID strings for `rows` rows, built without a Python loop."""
+    raw = rng.integers(0, 256, size=(rows, 16), dtype=np.uint8)
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40  # version 4
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80  # RFC 4122 variant
+    nibbles = np.empty((rows, 32), dtype=np.uint8)
+    nibbles[:, 0::2] = _HEX[raw >> 4]
+    nibbles[:, 1::2] = _HEX[raw & 0x0F]
+    chars = np.insert(nibbles, _UUID_HYPHENS, ord("-"), axis=1)
+    return np.ascontiguousarray(chars).view("S36").ravel().astype(str)
+
+
+def _pool(fake, make, size: int) -> np.ndarray:
+    return np.array([make(fake) for _ in range(size)], dtype=object)
+
+
+def _pick(rng: np.random.Generator, values, rows: int) -> np.ndarray:
+    values = np.asarray(values, dtype=object)
+    return values[rng.integers(0, len(values), rows)]
+
+
+def _pick_category(rng: np.random.Generator, categories: list, values, rows: int) -> pd.Categorical:
+    """Sample `values` as a Categorical keyed to the shared lookup index's `categories`."""
+    codes = np.array([categories.index(value) for value in values], dtype=np.int32)
+    return pd.Categorical.from_codes(codes[rng.integers(0, len(codes), rows)], categories=categories)
+
+
+def generate_linkedin_frame(rows: int, seed: Optional[int] = None, pool_size: int = DEFAULT_POOL_SIZE) -> pd.DataFrame:
+    """Synthetic LinkedIn profiles with the same columns as `LinkedInSource.fetch_data`."""
+    rng = np.random.default_rng(seed)
+    fake = seeded_faker(int(rng.integers(2**63)))
+    pool_size = max(1, min(rows, pool_size))
+    index = get_location_index()
+
+    usernames = _pick(rng, _pool(fake, lambda f: f.user_name(), pool_size), rows)
+    return pd.DataFrame({
+        "id": uuid4_array(rows, rng),
+        "name": _pick(rng, _pool(fake, lambda f: f.name(), pool_size), rows),
+        "title": _pick(rng, LINKEDIN_TITLES, rows),
+        "company": _pick_category(rng, index.companies, COMPANY_HQS.keys(), rows),
+        "location": _pick_category(rng, index.locations, CITY_COORDINATES.keys(), rows),
+        "linkedin_url": "https://linkedin.com/in/" + usernames,
+        "summary": _pick(rng, _pool(fake, lambda f: f.text(max_nb_chars=100), pool_size), rows),
+        "source": pd.Categorical.from_codes(np.zeros(rows, dtype=np.int8), categories=index.sources),
+    })
+
+
+def generate_pubmed_frame(rows: int, seed: Optional[int] = None, pool_size: int = DEFAULT_POOL_SIZE) -> pd.DataFrame:
+    """Synthetic PubMed authors with the same columns as `PubMedSource.fetch_data`."""
+    rng = np.random.default_rng(seed)
+    fake = seeded_faker(int(rng.integers(2**63)))
+    pool_size = max(1, min(rows, pool_size))
+    index = get_location_index()
+
+    today = np.datetime64(datetime.date.today(), "D")
+    days_back = rng.integers(0, 2 * 365 + 1, rows)
+    sentences = _pick(rng, _pool(fake, lambda f: f.sentence(), pool_size), rows)
+    return pd.DataFrame({
+        "id": uuid4_array(rows, rng),
+        "name": _pick(rng, _pool(fake, lambda f: f.name(), pool_size), rows),
+        "title": _pick(rng, PUBMED_TITLES, rows),
+        "company": _pick_category(rng, index.companies, ACADEMIC_INSTITUTES.keys(), rows),
+        "location": _pick_category(rng, index.locations, CITY_COORDINATES.keys(), rows),
+        "paper_title": "Novel approaches in " + _pick(rng, PUBMED_KEYWORDS, rows) + ": " + sentences,
+        "publication_date": (today - days_back).astype(str),
+        "source": pd.Categorical.from_codes(np.ones(rows, dtype=np.int8), categories=index.sources),
+    })
+
+
+def generate_leads(rows: int, seed: Optional[int] = None, pubmed_share: float = 0.5,
+                   as_arrow: bool = False, pool_size: int = DEFAULT_POOL_SIZE):
+    """
+    Bulk synthetic lead pool mixing LinkedIn and PubMed rows.
+
+    `company`, `location` and `source` are Categoricals keyed to the shared
+    `LocationIndex`. Returns a DataFrame, or a `pyarrow.Table` if `as_arrow` is set. The same
+    `seed` always produces the same pool (for a given generation date).
+    """
+    pubmed_rows = int(round(rows * pubmed_share))
+    seeds = [int(s) for s in np.random.SeedSequence(seed).generate_state(2)]
+    frames = [
+        generate_linkedin_frame(rows - pubmed_rows, seeds[0], pool_size),
+        generate_pubmed_frame(pubmed_rows, seeds[1], pool_size),
+    ]
+    df = pd.concat(frames, ignore_index=True)
+    if not as_arrow:
+        return df
+    try:
+        import pyarrow as pa
+    except ImportError as exc:
+        raise ImportError("as_arrow=True requires pyarrow (pip install pyarrow)") from exc
+    return pa.Table.from_pandas(df, preserve_index=False)
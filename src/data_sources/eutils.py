@@ -0,0 +1,446 @@
+import hashlib
+import json
+import os
+import re
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .base import DataSource
+from src.data_sources.mock_data import ACADEMIC_INSTITUTES, CITY_COORDINATES, PUBMED_KEYWORDS
+from src.pipeline.instrumentation import stage
+from src.pipeline.ratelimit import TokenBucket
+
+EUTILS_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
+
+# Searched when no query is given: the research topics the scorer cares about
+DEFAULT_TERM = " OR ".join(f'"{keyword}"[tiab]' for keyword in PUBMED_KEYWORDS)
+
+# PubMed lists no job titles; the author's position on the paper stands in
+AUTHOR_TITLES = {"first": "Research Scientist", "last": "Principal Investigator", "middle": "Research Associate"}
+
+# Parameters identifying the caller rather than the request; left out of cache keys
+IDENTITY_PARAMS = ("api_key", "email", "tool")
+
+# Affiliation spellings of ACADEMIC_INSTITUTES, most specific first (the Broad's contains "MIT")
+INSTITUTE_PATTERNS = [(re.compile(pattern, re.IGNORECASE), institute) for pattern, institute in [
+    (r"Broad Institute", "Broad Institute"),
+    (r"Dana[- ]Farber", "Dana-Farber Cancer Institute"),
+    (r"Harvard Medical School", "Harvard Medical School"),
+    (r"Massachusetts Institute of Technology|\bMIT\b", "MIT"),
+    (r"University of California,? San Francisco|\bUCSF\b", "UCSF"),
+    (r"University of California,? San Diego|\bUCSD\b", "UCSD"),
+    (r"Stanford University", "Stanford University"),
+    (r"Francis Crick Institute", "Francis Crick Institute"),
+]]
+
+US_STATES = {"MA": "Massachusetts", "CA": "California", "NY": "New York", "NC": "North Carolina", "TX": "Texas"}
+
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_ORGANIZATION = re.compile(r"Universit|Institut|Hospital|School|College|Cent(?:er|re)|Laborator|Foundation|"
+                           r"\bClinic|Inc\b|Ltd\b|GmbH|\bAG\b|Pharma", re.IGNORECASE)
+_US_STATE_ZIP = re.compile(r"^([A-Z]{2})\s+\d{5}")
+_SUBUNIT = re.compile(r"^(?:Department|Dept|Division|Section|Unit|Program|Graduate Program)\b", re.IGNORECASE)
+_MONTHS = {month: i for i, month in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], 1)}
+
+
+class EUtilsError(Exception):
+    """An error reported in the body of an E-utilities response."""
+
+
+def _city_pattern(location: str) -> "re.Pattern":
+    city, _, region = location.partition(", ")
+    if region in US_STATES:
+        # US cities need their state nearby, so Cambridge, UK stays out of Cambridge, MA
+        return re.compile(rf"\b{re.escape(city)}\b,?\s*(?:{region}\b|{US_STATES[region]}\b)", re.IGNORECASE)
+    return re.compile(rf"\b{re.escape(city)}\b", re.IGNORECASE)
+
+
+# Longest first, so "South San Francisco, CA" wins over "San Francisco, CA"
+CITY_PATTERNS = [(_city_pattern(location), location)
+                 for location in sorted(CITY_COORDINATES, key=len, reverse=True) if not location.startswith("Remote")]
+
+
+def map_affiliation(affiliation: Optional[str]) -> Tuple[str, str]:
+    """
+    (company, location) for a PubMed affiliation string.
+
+    Known institutes map onto ACADEMIC_INSTITUTES and their hub; otherwise
+    the company is the first organisation-like segment and the location is
+    a CITY_COORDINATES hub named in the text, else "City, ST" for US
+    addresses or the last two segments (usually "City, Country").
+    """
+    if not affiliation:
+        return "Unknown", ""
+    text = _EMAIL.sub("", affiliation).replace("Electronic address:", "")
+    for pattern, institute in INSTITUTE_PATTERNS:
+        if pattern.search(text):
+            return institute, ACADEMIC_INSTITUTES[institute]
+    segments = [segment.strip(" .;") for segment in text.split(",")]
+    segments = [segment for segment in segments if segment]
+    units = [segment for segment in segments if not _SUBUNIT.match(segment)] or segments or ["Unknown"]
+    company = next((segment for segment in units if _ORGANIZATION.search(segment)), units[0])
+    for pattern, location in CITY_PATTERNS:
+        if pattern.search(text):
+            return company, location
+    for i in range(1, len(segments)):
+        state = _US_STATE_ZIP.match(segments[i])
+        if state:
+            return company, f"{segments[i - 1]}, {state.group(1)}"
+    tail = [re.sub(r"\s*\b[A-Z0-9]*\d[A-Z0-9]*\b", "", segment).strip() for segment in segments[-2:]]
+    return company, ", ".join(segment for segment in tail if segment)
+
+
+def _text(element: Optional[ET.Element]) -> str:
+    # Titles may carry inline markup such as <i>
+    return " ".join("".join(element.itertext()).split()) if element is not None else ""
+
+
+def _publication_date(article: ET.Element) -> str:
+    """ISO date of an Article: its electronic date, else the journal issue date."""
+    dated = article.find("ArticleDate")
+    if dated is None:
+        dated = article.find("Journal/JournalIssue/PubDate")
+    if dated is None:
+        return ""
+    medline = dated.findtext("MedlineDate")
+    if medline:
+        # e.g. "2024 Nov-Dec"
+        year, _, rest = medline.partition(" ")
+        month = _MONTHS.get(rest[:3].lower(), 1)
+        day = 1
+    else:
+        year = dated.findtext("Year", "")
+        month_text = dated.findtext("Month", "1")
+        month = int(month_text) if month_text.isdigit() else _MONTHS.get(month_text[:3].lower(), 1)
+        day = int(dated.findtext("Day", "1"))
+    return f"{year}-{month:02d}-{day:02d}" if year.isdigit() else ""
+
+
+def parse_articles(stream: BinaryIO) -> Iterator[Dict[str, Any]]:
+    """
+    Articles of an efetch PubmedArticleSet, one at a time.
+
+    Parsed with `iterparse` and cleared as they are yielded, so memory does
+    not grow with the batch. Each article is a dict with `pmid`, `title`,
+    `publication_date` and `authors`, a list of (name, affiliation) pairs
+    for the named (non-collective) authors. Raises EUtilsError for an
+    `<ERROR>` response, e.g. an expired WebEnv.
+    """
+    for _, element in ET.iterparse(stream, events=("end",)):
+        if element.tag == "ERROR":
+            raise EUtilsError(_text(element))
+        if element.tag != "PubmedArticle":
+            continue
+        citation = element.find("MedlineCitation")
+        article = citation.find("Article")
+        authors = []
+        for author in article.iterfind("AuthorList/Author"):
+            last = author.findtext("LastName")
+            if not last:
+                continue
+            name = " ".join(filter(None, [author.findtext("ForeName"), last]))
+            affiliation = author.findtext("AffiliationInfo/Affiliation")
+            authors.append((name, affiliation))
+        yield {
+            "pmid": citation.findtext("PMID"),
+            "title": _text(article.find("ArticleTitle")),
+            "publication_date": _publication_date(article),
+            "authors": authors,
+        }
+        element.clear()
+
+
+def article_leads(article: Dict[str, Any], all_authors: bool = False) -> List[Dict[str, Any]]:
+    """
+    Leads for an article's authors: by default the first and the last
+    (usually the lab head), or every named author.
+    """
+    authors = list(enumerate(article["authors"]))
+    if not all_authors and len(authors) > 2:
+        authors = [authors[0], authors[-1]]
+    leads = []
+    for position, (name, affiliation) in authors:
+        company, location = map_affiliation(affiliation)
+        # A sole author counts as the lab head
+        role = "last" if position == len(article["authors"]) - 1 else "first" if position == 0 else "middle"
+        lead = {
+            "id": f"{article['pmid']}.{position}",
+            "name": name,
+            "title": AUTHOR_TITLES[role],
+            "company": company,
+            "location": location,
+            "paper_title": article["title"],
+            "publication_date": article["publication_date"],
+            "pmid": article["pmid"],
+            "affiliation": affiliation,
+            "source": "PubMed",
+        }
+        email = _EMAIL.search(affiliation or "")
+        if email:
+            lead["email"] = email.group().rstrip(".")
+        leads.append(lead)
+    return leads
+
+
+class ResponseCache:
+    """
+    Raw E-utilities responses on disk, keyed by endpoint and parameters.
+
+    A response younger than `ttl` seconds is served without a request.
+    Older ones are revalidated with the ETag / Last-Modified the server
+    sent, and reused on 304 Not Modified. Entries unused for `keep`
+    seconds are deleted by `prune`.
+
+    Keys cover every parameter, so efetch pages belong to the WebEnv of
+    the search that produced them: once that search is redone (after `ttl`,
+    or when its WebEnv expires) its pages are fetched afresh, not reused.
+    Pages are slices by position of a result set that shifts as papers are
+    published, so reusing them across searches could serve the wrong
+    articles.
+    """
+
+    def __init__(self, directory: str, ttl: float = 3600.0, keep: float = 7 * 24 * 3600.0, clock=time.time):
+        self.directory = directory
+        self.ttl = ttl
+        self.keep = keep
+        self.clock = clock
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(endpoint: str, params: Dict[str, Any]) -> str:
+        request = [endpoint] + sorted((k, str(v)) for k, v in params.items() if k not in IDENTITY_PARAMS)
+        return hashlib.sha1(json.dumps(request).encode()).hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def meta(self, key: str) -> Optional[Dict[str, Any]]:
+        """Stored validators and time of the entry, or None when there is none."""
+        try:
+            with open(self.path(key) + ".json") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return meta if os.path.exists(self.path(key)) else None
+
+    def fresh(self, meta: Dict[str, Any]) -> bool:
+        return self.clock() - meta["stored_at"] < self.ttl
+
+    def store(self, key: str, chunks: Iterable[bytes], etag: Optional[str] = None,
+              last_modified: Optional[str] = None) -> str:
+        """Write a response body chunk by chunk; returns its path."""
+        path = self.path(key)
+        with open(path + ".part", "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(path + ".part", path)
+        self._write_meta(key, {"etag": etag, "last_modified": last_modified, "stored_at": self.clock()})
+        return path
+
+    def touch(self, key: str):
+        """Mark a revalidated entry fresh again."""
+        meta = self.meta(key)
+        if meta is not None:
+            meta["stored_at"] = self.clock()
+            self._write_meta(key, meta)
+
+    def invalidate(self, key: str):
+        for path in (self.path(key), self.path(key) + ".json"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def prune(self) -> int:
+        """Delete entries stored more than `keep` seconds ago; returns how many."""
+        removed = 0
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                key = name[:-len(".json")]
+                meta = self.meta(key)
+                if meta is None or self.clock() - meta["stored_at"] > self.keep:
+                    self.invalidate(key)
+                    removed += 1
+        return removed
+
+    def _write_meta(self, key: str, meta: Dict[str, Any]):
+        with open(self.path(key) + ".json.part", "w") as f:
+            json.dump(meta, f)
+        os.replace(self.path(key) + ".json.part", self.path(key) + ".json")
+
+
+@dataclass
+class EUtilsStats:
+    """Where E-utilities responses came from."""
+    requests: int = 0
+    cache_hits: int = 0
+    not_modified: int = 0
+    stale: int = 0
+
+
+@dataclass
+class SearchResult:
+    """An esearch result set parked on the NCBI history server."""
+    term: str
+    count: int
+    webenv: str
+    query_key: str
+
+
+def eutils_session(pool_size: int = 4, retries: int = 3, backoff: float = 1.0) -> requests.Session:
+    """Session keeping `pool_size` connections alive, retrying connection errors, 429 and 5xx with backoff."""
+    retry = Retry(total=retries, backoff_factor=backoff, status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=frozenset({"GET"}), raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class PubMedEUtilsSource(DataSource):
+    """
+    PubMed authors fetched from NCBI E-utilities.
+
+    A query runs one `esearch` that parks the matching PMIDs on the history
+    server (WebEnv); `efetch` then pages through them `batch_size`
+    articles per call, and each XML response is parsed as it streams from
+    disk. Responses are cached in `cache_dir` (see ResponseCache), so
+    repeated polls and overlapping sweeps cost no requests until `ttl`
+    passes. Requests are paced to NCBI's limit: 3 per second, or 10 with an
+    `api_key`. Each article yields leads for its first and last authors (see
+    `article_leads`), with source "PubMed".
+    """
+
+    # Requests are paced inside the source, where cache hits cost nothing
+    rate_limit = None
+
+    def __init__(self, base_url: str = EUTILS_URL, term: str = DEFAULT_TERM, api_key: Optional[str] = None,
+                 email: Optional[str] = None, tool: str = "helix-iq", batch_size: int = 500,
+                 cache_dir: str = "data/eutils_cache", ttl: float = 3600.0,
+                 session: Optional[requests.Session] = None, timeout: float = 30.0, all_authors: bool = False):
+        self.base_url = base_url.rstrip("/")
+        self.term = term
+        self.identity = {key: value for key, value in (("api_key", api_key), ("email", email), ("tool", tool))
+                         if value}
+        self.batch_size = batch_size
+        self.cache = ResponseCache(cache_dir, ttl=ttl)
+        self.cache.prune()
+        self.session = session or eutils_session()
+        self.timeout = timeout
+        self.all_authors = all_authors
+        self.bucket = TokenBucket(10.0 if api_key else 3.0)
+        self.stats = EUtilsStats()
+
+    def _get(self, endpoint: str, params: Dict[str, Any], revalidate: bool = False) -> Tuple[str, str]:
+        """(cache key, path of the response body) for a GET of `endpoint`."""
+        key = self.cache.key(endpoint, params)
+        meta = self.cache.meta(key)
+        if meta is not None and not revalidate and self.cache.fresh(meta):
+            self.stats.cache_hits += 1
+            return key, self.cache.path(key)
+        headers = {}
+        if meta is not None and not revalidate:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        self.bucket.acquire()
+        self.stats.requests += 1
+        try:
+            with self.session.get(f"{self.base_url}/{endpoint}", params={**params, **self.identity}, headers=headers,
+                                  timeout=self.timeout, stream=True) as response:
+                if response.status_code == 304 and meta is not None:
+                    self.stats.not_modified += 1
+                    self.cache.touch(key)
+                    return key, self.cache.path(key)
+                response.raise_for_status()
+                path = self.cache.store(key, response.iter_content(64 * 1024), response.headers.get("ETag"),
+                                        response.headers.get("Last-Modified"))
+                return key, path
+        except requests.RequestException:
+            if meta is None or revalidate:
+                raise
+            # NCBI unreachable: an outdated answer beats none
+            self.stats.stale += 1
+            return key, self.cache.path(key)
+
+    def search(self, term: Optional[str] = None, revalidate: bool = False) -> SearchResult:
+        """Run `esearch` for `term` (default `self.term`) on the history server, newest papers first."""
+        term = term or self.term
+        params = {"db": "pubmed", "term": term, "usehistory": "y", "retmax": 0, "sort": "pub_date",
+                  "retmode": "json"}
+        with stage("eutils.esearch"):
+            key, path = self._get("esearch.fcgi", params, revalidate)
+            with open(path, "rb") as f:
+                result = json.load(f).get("esearchresult", {})
+        if "ERROR" in result or "webenv" not in result:
+            self.cache.invalidate(key)
+            raise EUtilsError(result.get("ERROR", "esearch returned no WebEnv"))
+        return SearchResult(term, int(result["count"]), result["webenv"], result["querykey"])
+
+    def fetch_articles(self, search: SearchResult, start: int, count: int) -> List[Dict[str, Any]]:
+        """Articles `start` to `start + count` of a search result, in one `efetch`."""
+        params = {"db": "pubmed", "WebEnv": search.webenv, "query_key": search.query_key,
+                  "retstart": start, "retmax": count, "retmode": "xml"}
+        with stage("eutils.efetch") as span:
+            key, path = self._get("efetch.fcgi", params)
+            try:
+                with open(path, "rb") as f:
+                    articles = list(parse_articles(f))
+            except (EUtilsError, ET.ParseError):
+                # Never keep an error answer around
+                self.cache.invalidate(key)
+                raise
+            span.rows = len(articles)
+        return articles
+
+    def iter_articles(self, query: Optional[str] = None, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Articles matching `query`, newest first, fetched `batch_size` at a time."""
+        search = self.search(query)
+        total = search.count if limit is None else min(limit, search.count)
+        start = 0
+        while start < total:
+            count = min(self.batch_size, total - start)
+            try:
+                articles = self.fetch_articles(search, start, count)
+            except EUtilsError:
+                # A cached search may outlive its WebEnv on the server: search again once
+                search = self.search(query, revalidate=True)
+                total = search.count if limit is None else min(limit, search.count)
+                articles = self.fetch_articles(search, start, count)
+            if not articles:
+                return
+            yield from articles
+            start += count
+
+    def iter_chunks(self, query: str = None, limit: int = 100, chunk_size: int = 500,
+                    **kwargs) -> Iterator[List[Dict[str, Any]]]:
+        """Up to `limit` author leads in chunks of `chunk_size`, fetching articles only as needed."""
+        if limit <= 0:
+            return
+        chunk: List[Dict[str, Any]] = []
+        produced = 0
+        for article in self.iter_articles(query):
+            for lead in article_leads(article, self.all_authors):
+                chunk.append(lead)
+                produced += 1
+                if len(chunk) == chunk_size or produced == limit:
+                    yield chunk
+                    chunk = []
+                if produced == limit:
+                    return
+        if chunk:
+            yield chunk
+
+    def fetch_data(self, query: str = None, limit: int = 10, **kwargs) -> List[Dict[str, Any]]:
+        """
+        Fetch up to `limit` author leads for `query` (an E-utilities search
+        term; default `term`).
+        """
+        return [lead for chunk in self.iter_chunks(query, limit=limit, chunk_size=max(1, limit)) for lead in chunk]
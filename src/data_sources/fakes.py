@@ -0,0 +1,21 @@
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def get_faker():
+    """
+    The Faker instance shared by the per-row mock sources.
+
+    It is created the first time a source generates data. Importing faker and
+    building its providers is the slowest part of loading a source module.
+    """
+    from faker import Faker
+    return Faker()
+
+
+def seeded_faker(seed: int):
+    """A new Faker instance seeded with `seed`, for reproducible bulk pools."""
+    from faker import Faker
+    fake = Faker()
+    fake.seed_instance(seed)
+    return fake
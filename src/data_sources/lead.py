@@ -0,0 +1,129 @@
+from dataclasses import dataclass, fields
+from functools import wraps
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+import pandas as pd
+
+# Columns stored as Categoricals in the batch form: few distinct values, many rows
+CATEGORICAL_FIELDS = ("title", "company", "location", "source", "company_hq", "location_details")
+
+
+@dataclass(slots=True)
+class Lead:
+    """
+    Row form of a lead: a fixed set of slotted fields instead of a free-form dict.
+
+    Supports the mapping subset the enrichers and scorer use (`get`, `[]`,
+    `in`, `keys`), so it can be passed anywhere a lead dict is expected. A
+    field that is None counts as absent, matching a missing dict key. The
+    sources and pipelines still pass dicts; this form is opt-in, e.g. the
+    rows of `DataSource.normalize`.
+    """
+    id: Optional[str] = None
+    name: Optional[str] = None
+    title: Optional[str] = None
+    company: Optional[str] = None
+    location: Optional[str] = None
+    source: Optional[str] = None
+    linkedin_url: Optional[str] = None
+    summary: Optional[str] = None
+    paper_title: Optional[str] = None
+    publication_date: Optional[str] = None
+    has_recent_paper: Optional[bool] = None
+    company_hq: Optional[str] = None
+    is_remote: Optional[bool] = None
+    location_details: Optional[str] = None
+    lat: Optional[float] = None
+    lon: Optional[float] = None
+    email: Optional[str] = None
+    score: Optional[int] = None
+    score_flags: Optional[int] = None
+    score_reasons: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Lead":
+        """Build from a lead dict, ignoring keys outside the schema."""
+        return cls(**{key: value for key, value in data.items() if key in LEAD_FIELDS})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: getattr(self, key) for key in self.keys()}
+
+    def keys(self) -> List[str]:
+        return [key for key in LEAD_FIELDS if getattr(self, key) is not None]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key) if key in LEAD_FIELDS else None
+        return default if value is None else value
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any):
+        if key not in LEAD_FIELDS:
+            raise KeyError(f"Lead has no field {key!r}")
+        setattr(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+
+LEAD_FIELDS = frozenset(field.name for field in fields(Lead))
+LEAD_COLUMNS = [field.name for field in fields(Lead)]
+
+
+class LeadBatch:
+    """
+    Struct-of-arrays form of many leads: one typed column per field.
+
+    Text fields with few distinct values are Categoricals, so a million leads
+    share a handful of strings instead of holding a dict and string
+    references each. Wraps a DataFrame, available as `.frame`.
+    """
+
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame
+
+    @classmethod
+    def from_records(cls, records: Iterable[Union[Dict[str, Any], Lead]]) -> "LeadBatch":
+        rows = [record.to_dict() if isinstance(record, Lead) else record for record in records]
+        return cls.from_frame(pd.DataFrame(rows))
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> "LeadBatch":
+        frame = frame.copy()
+        for column in CATEGORICAL_FIELDS:
+            if column in frame.columns and not isinstance(frame[column].dtype, pd.CategoricalDtype):
+                frame[column] = frame[column].astype("category")
+        return cls(frame)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def row(self, i: int) -> Lead:
+        record = self.frame.iloc[i].to_dict()
+        return Lead.from_dict({key: None if pd.isna(value) else value for key, value in record.items()})
+
+    def __iter__(self) -> Iterator[Lead]:
+        for i in range(len(self)):
+            yield self.row(i)
+
+
+def accepts_batch(func):
+    """
+    Let a DataFrame -> DataFrame batch function also take a LeadBatch.
+
+    The frame is unwrapped before the call and the result re-wrapped, so
+    callers get back the form they passed in.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        args = list(args)
+        for i, arg in enumerate(args):
+            if isinstance(arg, LeadBatch):
+                args[i] = arg.frame
+                return LeadBatch(func(*args, **kwargs))
+        return func(*args, **kwargs)
+    return wrapper
@@ -1,18 +1,23 @@
 import random
 from typing import List, Dict, Any
-from faker import Faker
+import pandas as pd
 from .base import DataSource
+from .fakes import get_faker
+from .bulk import generate_linkedin_frame
 from src.data_sources.mock_data import CITY_COORDINATES, COMPANY_HQS, LINKEDIN_TITLES
 
-fake = Faker()
-
 class LinkedInSource(DataSource):
     """Mock LinkedIn Data Source generating synthetic profiles."""
+
+    # Partner API quota: one profile page per second
+    rate_limit = 1.0
+    synthetic = True
     
     def fetch_data(self, query: str = None, limit: int = 20, **kwargs) -> List[Dict[str, Any]]:
         """
         Generate synthetic LinkedIn profiles.
         """
+        fake = get_faker()
         results = []
         titles = LINKEDIN_TITLES
         
@@ -34,3 +39,9 @@ class LinkedInSource(DataSource):
             results.append(profile)
             
         return results
+
+    def fetch_frame(self, limit: int = 20, seed: int = None) -> pd.DataFrame:
+        """
+        Bulk mode: generate `limit` profiles column-wise as a DataFrame.
+        """
+        return generate_linkedin_frame(limit, seed=seed)
@@ -54,3 +54,12 @@ PUBMED_TITLES = [
     "Research Associate",
     "Principal Investigator"
 ]
+
+# Research topics used in synthetic PubMed paper titles
+PUBMED_KEYWORDS = [
+    "Drug-Induced Liver Injury", 
+    "3D cell culture", 
+    "Organ-on-chip", 
+    "Hepatic spheroids", 
+    "Investigative Toxicology"
+]
@@ -1,26 +1,27 @@
 import random
 from typing import List, Dict, Any
-from faker import Faker
+import pandas as pd
 from .base import DataSource
-from src.data_sources.mock_data import CITY_COORDINATES, ACADEMIC_INSTITUTES, PUBMED_TITLES
-
-fake = Faker()
+from .fakes import get_faker
+from .bulk import generate_pubmed_frame
+from src.data_sources.mock_data import CITY_COORDINATES, ACADEMIC_INSTITUTES, PUBMED_TITLES, PUBMED_KEYWORDS
 
 class PubMedSource(DataSource):
     """Mock PubMed Data Source generating synthetic papers."""
+
+    # NCBI E-utilities allow 3 requests per second without an API key
+    rate_limit = 3.0
+    synthetic = True
     
     def fetch_data(self, query: str = None, limit: int = 10, **kwargs) -> List[Dict[str, Any]]:
         """
         Generate synthetic PubMed papers (authors).
         """
+        fake = get_faker()
         results = []
-        keywords = [
-            "Drug-Induced Liver Injury", 
-            "3D cell culture", 
-            "Organ-on-chip", 
-            "Hepatic spheroids", 
-            "Investigative Toxicology"
-        ]
+        keywords = PUBMED_KEYWORDS
+        institutes = list(ACADEMIC_INSTITUTES.keys())
+        locations = list(CITY_COORDINATES.keys())
         
         for _ in range(limit):
             keyword = random.choice(keywords)
@@ -28,8 +29,8 @@ class PubMedSource(DataSource):
                 "id": fake.uuid4(),
                 "name": fake.name(),
                 "title": random.choice(PUBMED_TITLES), # Academic titles
-                "company": random.choice(list(ACADEMIC_INSTITUTES.keys())), # Academic affiliation
-                "location": random.choice(list(CITY_COORDINATES.keys())), # Key hubs
+                "company": random.choice(institutes), # Academic affiliation
+                "location": random.choice(locations), # Key hubs
                 "paper_title": f"Novel approaches in {keyword}: {fake.sentence()}",
                 "publication_date": fake.date_between(start_date='-2y', end_date='today').isoformat(),
                 "source": "PubMed"
@@ -37,3 +38,9 @@ class PubMedSource(DataSource):
             results.append(author)
             
         return results
+
+    def fetch_frame(self, limit: int = 10, seed: int = None) -> pd.DataFrame:
+        """
+        Bulk mode: generate `limit` papers column-wise as a DataFrame.
+        """
+        return generate_pubmed_frame(limit, seed=seed)
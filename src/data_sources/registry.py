@@ -0,0 +1,50 @@
+import importlib
+import threading
+from typing import Dict, List, Type
+
+from .base import DataSource
+
+# Display name -> "module:Class". A source's module is imported only when the
+# source is first created, so listing sources stays cheap.
+_SOURCES: Dict[str, str] = {
+    "LinkedIn": "src.data_sources.linkedin:LinkedInSource",
+    "PubMed": "src.data_sources.pubmed:PubMedSource",
+}
+_loaded: Dict[str, Type[DataSource]] = {}
+_lock = threading.Lock()
+
+
+def register_source(name: str, target: str):
+    """Register (or replace) source `name` as a "module:Class" path."""
+    module, _, attr = target.partition(":")
+    if not module or not attr:
+        raise ValueError(f"Source target must look like 'module:Class', got {target!r}")
+    with _lock:
+        _SOURCES[name] = target
+        _loaded.pop(name, None)
+
+
+def source_names() -> List[str]:
+    """Registered source names, in registration order. Imports nothing."""
+    return list(_SOURCES)
+
+
+def load_source(name: str) -> Type[DataSource]:
+    """The DataSource class registered as `name`, importing its module on first use."""
+    with _lock:
+        cls = _loaded.get(name)
+        if cls is not None:
+            return cls
+        try:
+            target = _SOURCES[name]
+        except KeyError:
+            raise KeyError(f"Unknown source {name!r}; registered: {', '.join(_SOURCES)}") from None
+        module, _, attr = target.partition(":")
+        cls = getattr(importlib.import_module(module), attr)
+        _loaded[name] = cls
+        return cls
+
+
+def create_source(name: str, **kwargs) -> DataSource:
+    """A new instance of source `name`."""
+    return load_source(name)(**kwargs)
@@ -0,0 +1,31 @@
+from typing import List, Dict, Any, Optional
+
+import requests
+
+from .base import DataSource
+
+
+class RestSource(DataSource):
+    """Data Source backed by a JSON HTTP endpoint returning a list of leads."""
+
+    def __init__(self, base_url: str, path: str = "/leads", session: Optional[requests.Session] = None,
+                 timeout: float = 10.0, source_name: str = None):
+        self.url = base_url.rstrip("/") + path
+        self.session = session or requests.Session()
+        self.timeout = timeout
+        self.source_name = source_name
+
+    def fetch_data(self, query: str = None, limit: int = 20, **kwargs) -> List[Dict[str, Any]]:
+        """
+        GET `url?q=<query>&limit=<limit>` and return the decoded leads.
+        """
+        params = {"limit": limit, **kwargs}
+        if query:
+            params["q"] = query
+        response = self.session.get(self.url, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        leads = response.json()
+        if self.source_name:
+            for lead in leads:
+                lead.setdefault("source", self.source_name)
+        return leads
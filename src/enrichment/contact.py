@@ -1,4 +1,10 @@
-from typing import Dict
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.data_sources.lead import accepts_batch
+from src.pipeline.instrumentation import timed
 
 def enrich_contact_info(profile: Dict[str, str]) -> Dict[str, str]:
     """
@@ -6,13 +12,51 @@ def enrich_contact_info(profile: Dict[str, str]) -> Dict[str, str]:
     """
     if "email" not in profile:
         # Mock pattern: firstname.lastname@company.com
-        name_parts = profile.get("name", "").lower().split()
-        if len(name_parts) >= 2:
-            email_local = f"{name_parts[0]}.{name_parts[-1]}"
-        else:
-            email_local = "info"
-            
-        company_domain = profile.get("company", "company").replace(" ", "").lower() + ".com"
+        email_local = email_local_part(profile.get("name", ""))
+        company_domain = company_domain_for(profile.get("company", "company"))
         profile["email"] = f"{email_local}@{company_domain}"
         
     return profile
+
+def email_local_part(name: str) -> str:
+    """firstname.lastname, or 'info' when the name has fewer than two parts."""
+    name_parts = name.lower().split()
+    if len(name_parts) >= 2:
+        return f"{name_parts[0]}.{name_parts[-1]}"
+    return "info"
+
+def company_domain_for(company: str) -> str:
+    return company.replace(" ", "").lower() + ".com"
+
+def factorize_filled(df: pd.DataFrame, column: str, missing: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Codes and uniques of `column`, with missing values (or a missing column)
+    coded as `missing`. Works on Categoricals without adding a category.
+    """
+    if column not in df.columns:
+        return np.zeros(len(df), dtype=np.intp), np.array([missing], dtype=object)
+    codes, uniques = pd.factorize(df[column])
+    uniques = np.append(np.asarray(uniques, dtype=object), missing)
+    return np.where(codes < 0, len(uniques) - 1, codes), uniques
+
+@timed()
+@accepts_batch
+def enrich_contact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Batch version of `enrich_contact_info` for a whole frame.
+
+    Local parts and domains are derived once per distinct name/company.
+    Rows that already have an email keep it.
+    """
+    df = df.copy()
+    codes, names = factorize_filled(df, "name", "")
+    local = np.array([email_local_part(name) for name in names], dtype=object)[codes]
+    codes, companies = factorize_filled(df, "company", "company")
+    domain = np.array([company_domain_for(company) for company in companies], dtype=object)[codes]
+
+    generated = local + "@" + domain
+    if "email" in df.columns:
+        df["email"] = df["email"].where(df["email"].notna(), generated)
+    else:
+        df["email"] = generated
+    return df
@@ -0,0 +1,157 @@
+import re
+import unicodedata
+from typing import Iterable, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Tokens dropped before comparing names
+HONORIFICS = frozenset([
+    "dr", "prof", "professor", "mr", "mrs", "ms", "miss", "mx",
+    "phd", "md", "jr", "sr", "ii", "iii", "iv", "dds", "dvm"
+])
+
+_NON_ALPHA = re.compile(r"[^a-z]+")
+
+# Fields a person may share across sources; each one forms a blocking pass
+BLOCKING_FIELDS = ("company", "location")
+
+
+def name_parts(name) -> Tuple[str, str]:
+    """Normalized (first, last) name tokens, ignoring accents, case and honorifics."""
+    if name is None or (isinstance(name, float) and np.isnan(name)):
+        return "", ""
+    text = str(name)
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    tokens = [token for token in _NON_ALPHA.split(text.lower()) if token and token not in HONORIFICS]
+    if not tokens:
+        return "", ""
+    return tokens[0], tokens[-1]
+
+
+def _column_codes(df: pd.DataFrame, column: str) -> np.ndarray:
+    if column not in df.columns:
+        return np.zeros(len(df), dtype=np.int64)
+    return pd.factorize(df[column])[0]
+
+
+def _connected_components(n: int, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Smallest row index in each row's component, via min-label propagation."""
+    labels = np.arange(n)
+    while True:
+        joined = np.minimum(labels[left], labels[right])
+        updated = labels.copy()
+        np.minimum.at(updated, left, joined)
+        np.minimum.at(updated, right, joined)
+        # Pointer jumping collapses chains quickly
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
+def find_duplicates(df: pd.DataFrame, window: int = 5, fields: Iterable[str] = BLOCKING_FIELDS) -> np.ndarray:
+    """
+    Cluster label per row; rows believed to be the same person share a label.
+
+    Candidates come from blocking on (last name, first initial, field) for each
+    blocking field, then a sorted-neighbourhood scan compares each row with the
+    next `window` rows of its block. Two rows match when their first names are
+    equal or both are only an initial. A cluster of initial-only rows then
+    joins a cluster of full names if that is the only one it was compared
+    with, so one "J Smith" never bridges "John Smith" and "Jane Smith". Cost
+    is O(n * window) plus the sorts, so it stays near-linear on large pools.
+    """
+    n = len(df)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    name_codes, names = pd.factorize(df["name"]) if "name" in df.columns else (np.zeros(n, dtype=np.int64), [""])
+    # Work on distinct names; the trailing slot serves missing names (code -1)
+    parts = [name_parts(name) for name in names] + [("", "")]
+    first_names = [first for first, _ in parts]
+    first_codes = pd.factorize(np.array(first_names, dtype=object))[0][name_codes]
+    last_codes = pd.factorize(np.array([last for _, last in parts], dtype=object))[0][name_codes]
+    initial_codes = pd.factorize(np.array([first[:1] for first in first_names], dtype=object))[0][name_codes]
+    is_initial = np.array([len(first) == 1 for first in first_names], dtype=bool)[name_codes]
+    named = np.array([bool(last) for _, last in parts], dtype=bool)[name_codes]
+
+    lefts, rights, bridges = [], [], []
+    for field in fields:
+        block = last_codes
+        for codes in (initial_codes, _column_codes(df, field)):
+            block = pd.factorize(block * (codes.max() + 2) + codes + 1)[0]
+        order = np.lexsort((first_codes, block))
+        for k in range(1, window + 1):
+            i, j = order[:-k], order[k:]
+            candidate = (block[i] == block[j]) & named[i]
+            match = candidate & (first_codes[i] == first_codes[j])
+            lefts.append(i[match])
+            rights.append(j[match])
+            bridge = candidate & (is_initial[i] != is_initial[j])
+            # (initial-only row, full-name row)
+            bridges.append(np.where(is_initial[i], i, j)[bridge])
+            bridges.append(np.where(is_initial[i], j, i)[bridge])
+
+    empty = np.zeros(0, dtype=np.int64)
+    left = np.concatenate(lefts) if lefts else empty
+    right = np.concatenate(rights) if rights else empty
+    labels = _connected_components(n, left, right)
+
+    # Attach each initial-only cluster to the one full-name cluster it met, if only one
+    if bridges:
+        pairs = np.unique(np.stack([labels[np.concatenate(bridges[0::2])],
+                                    labels[np.concatenate(bridges[1::2])]], axis=1), axis=0)
+        if len(pairs):
+            unique = np.bincount(pairs[:, 0], minlength=n)[pairs[:, 0]] == 1
+            left = np.concatenate([left, pairs[unique, 0]])
+            right = np.concatenate([right, pairs[unique, 1]])
+            labels = _connected_components(n, left, right)
+    return labels
+
+
+def dedupe_leads(df: pd.DataFrame, window: int = 5) -> pd.DataFrame:
+    """
+    Collapse duplicate people into one lead each.
+
+    The LinkedIn record of a cluster is kept when there is one (otherwise the
+    first record). PubMed signals are merged onto it: `has_recent_paper` is set
+    if any record in the cluster is a PubMed author, and `paper_title` /
+    `publication_date` are filled from the most recent paper. `duplicates`
+    counts the records merged into each kept lead.
+    """
+    if df.empty:
+        return df.assign(duplicates=pd.Series(dtype=np.int64))
+
+    labels = find_duplicates(df, window=window)
+    source = df["source"].astype(object).to_numpy() if "source" in df.columns else np.full(len(df), "")
+    is_pubmed = pd.Series(source == "PubMed")
+
+    # Canonical row per cluster: LinkedIn first, then original order
+    preference = np.lexsort((np.arange(len(df)), source != "LinkedIn", labels))
+    first_in_cluster = np.ones(len(df), dtype=bool)
+    first_in_cluster[1:] = labels[preference][1:] != labels[preference][:-1]
+    keep = np.sort(preference[first_in_cluster])
+
+    result = df.iloc[keep].copy()
+    kept_labels = labels[keep]
+    by_cluster = pd.Series(labels)
+    result["duplicates"] = by_cluster.value_counts().reindex(kept_labels).to_numpy() - 1
+
+    has_paper = is_pubmed.groupby(labels).any().reindex(kept_labels).to_numpy()
+    if "has_recent_paper" in result.columns:
+        has_paper = has_paper | result["has_recent_paper"].fillna(False).astype(bool).to_numpy()
+    result["has_recent_paper"] = has_paper
+
+    if "paper_title" in df.columns:
+        papers = df[["paper_title", "publication_date"]].copy() if "publication_date" in df.columns else df[["paper_title"]].copy()
+        papers["cluster"] = labels
+        papers = papers.dropna(subset=["paper_title"])
+        if "publication_date" in papers.columns:
+            papers = papers.sort_values("publication_date", ascending=False, kind="stable")
+        latest = papers.groupby("cluster").first().reindex(kept_labels)
+        for column in latest.columns:
+            result[column] = result[column].where(result[column].notna(), latest[column].to_numpy())
+
+    return result
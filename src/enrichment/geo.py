@@ -1,20 +1,63 @@
-from typing import Dict
+from typing import Dict, Tuple, Iterable
+import numpy as np
 from src.data_sources.mock_data import CITY_COORDINATES, COMPANY_HQS
 
-def enrich_location_data(profile: Dict[str, str]) -> Dict[str, str]:
+# Max coordinate offset (degrees) used to separate leads in the same city
+JITTER = 0.01
+
+# 64-bit FNV-1a over code points, finished with the splitmix64 mixer
+_FNV_OFFSET = 0xCBF29CE484222325
+_FNV_PRIME = 0x100000001B3
+_MASK = (1 << 64) - 1
+
+def _mix64(h: int) -> int:
+    h = ((h ^ (h >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    h = ((h ^ (h >> 27)) * 0x94D049BB133111EB) & _MASK
+    return h ^ (h >> 31)
+
+def id_hash(lead_id) -> int:
+    """Stable 64-bit hash of a lead id (same value as `id_hashes`)."""
+    h = _FNV_OFFSET
+    for ch in str(lead_id):
+        code = ord(ch)
+        if code:
+            h = ((h ^ code) * _FNV_PRIME) & _MASK
+    return _mix64(h)
+
+def id_hashes(ids: Iterable) -> np.ndarray:
+    """Vectorized `id_hash` over many ids, one pass per character column."""
+    chars = np.asarray(ids).astype(str)
+    width = chars.dtype.itemsize // 4
+    codes = np.ascontiguousarray(chars).view(np.uint32).reshape(len(chars), width)
+    h = np.full(len(chars), _FNV_OFFSET, dtype=np.uint64)
+    prime = np.uint64(_FNV_PRIME)
+    # Widen one character position at a time, so memory stays O(n) however long the ids
+    for j in range(width):
+        column = codes[:, j].astype(np.uint64)
+        np.copyto(h, (h ^ column) * prime, where=column != 0)
+    h = (h ^ (h >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    h = (h ^ (h >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return h ^ (h >> np.uint64(31))
+
+def jitter_offsets(hashes, scale: float = JITTER):
+    """Map id hashes to deterministic (lat, lon) offsets in [-scale, scale)."""
+    hi = hashes >> 32
+    lo = hashes & 0xFFFFFFFF
+    if isinstance(hashes, np.ndarray):
+        hi, lo = hi.astype(np.float64), lo.astype(np.float64)
+    return (hi / 2**32 * 2 - 1) * scale, (lo / 2**32 * 2 - 1) * scale
+
+def format_location_details(person_loc: str, hq_loc: str, is_remote: bool) -> str:
+    """Display text for a lead's location, naming the HQ for remote leads."""
+    return f"{person_loc} (HQ: {hq_loc})" if is_remote else person_loc
+
+def remote_status(company: str, person_loc: str) -> Tuple[str, bool]:
     """
-    Enrich profile with location analysis (Remote vs HQ).
-    For mock purposes, we define some known HQs.
+    Resolve (company_hq, is_remote) for a company/location pair.
     """
-    
     # Mock Company HQs are imported from mock_data
-    
-    person_loc = profile.get("location", "")
-    company = profile.get("company", "")
     hq_loc = COMPANY_HQS.get(company, "Unknown HQ")
     
-    profile["company_hq"] = hq_loc
-    
     # Simple string check for "Remote" or mismatch
     is_remote = False
     
@@ -23,16 +66,40 @@ def enrich_location_data(profile: Dict[str, str]) -> Dict[str, str]:
     elif hq_loc != "Unknown HQ" and person_loc.split(',')[0] not in hq_loc:
         is_remote = True
         
+    return hq_loc, is_remote
+
+def location_fields(company: str, person_loc: str) -> Tuple[str, bool, str]:
+    """
+    Resolve (company_hq, is_remote, location_details) for a company/location pair.
+    """
+    hq_loc, is_remote = remote_status(company, person_loc)
+    return hq_loc, is_remote, format_location_details(person_loc, hq_loc, is_remote)
+
+def enrich_location_data(profile: Dict[str, str], details: bool = True) -> Dict[str, str]:
+    """
+    Enrich profile with location analysis (Remote vs HQ).
+    For mock purposes, we define some known HQs.
+
+    With `details=False` the `location_details` text is left out; it can be
+    rendered later from `location`, `company_hq` and `is_remote`.
+    """
+    person_loc = profile.get("location", "")
+    company = profile.get("company", "")
+    hq_loc, is_remote = remote_status(company, person_loc)
+    
+    profile["company_hq"] = hq_loc
     profile["is_remote"] = is_remote
-    profile["location_details"] = f"{person_loc} (HQ: {hq_loc})" if is_remote else person_loc
+    if details:
+        profile["location_details"] = format_location_details(person_loc, hq_loc, is_remote)
     
     # Inject Coordinates for Map
     coords = CITY_COORDINATES.get(person_loc, [0, 0])
-    # Add small random jitter to separate points visually if they are identical
-    import random
+    # Add small jitter to separate points visually if they are identical;
+    # derived from the lead id so a lead always lands in the same spot
     if coords != [0, 0]:
-       profile["lat"] = coords[0] + random.uniform(-0.01, 0.01)
-       profile["lon"] = coords[1] + random.uniform(-0.01, 0.01)
+       d_lat, d_lon = jitter_offsets(id_hash(profile.get("id", "")))
+       profile["lat"] = coords[0] + d_lat
+       profile["lon"] = coords[1] + d_lon
     else:
        # Default fallback or skip
        profile["lat"] = None
@@ -0,0 +1,191 @@
+from functools import lru_cache
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.data_sources.lead import accepts_batch
+from src.pipeline.instrumentation import timed
+from src.data_sources.mock_data import CITY_COORDINATES, COMPANY_HQS, ACADEMIC_INSTITUTES
+from src.enrichment.geo import location_fields, format_location_details, id_hashes, jitter_offsets, JITTER
+from src.ranking.scorer import LeadScorer
+
+SOURCES = ["LinkedIn", "PubMed"]
+
+
+def _has_hub(value: str, hubs: Iterable[str]) -> bool:
+    return any(hub.lower() in value.lower() for hub in hubs)
+
+
+class LocationIndex:
+    """
+    Precomputed geo enrichment for every known (company, location) pair.
+
+    Lead frames store `company`, `location` and `source` as Categoricals whose
+    categories are this index's lists, so enriching a frame is a gather on the
+    category codes instead of per-row dict lookups and string splitting.
+    Tables carry one extra trailing slot for missing values, which code -1
+    selects. The tables never change after construction, so one index is
+    safely shared between threads: values it has not seen (free-text
+    affiliations, say) get codes past the end of its lists for the frame
+    that brings them, and only the pairs that frame holds are worked out.
+    """
+
+    def __init__(self, companies: Optional[List[str]] = None, locations: Optional[List[str]] = None,
+                 hubs: Optional[List[str]] = None):
+        self.companies = list(dict.fromkeys(companies or list(COMPANY_HQS) + list(ACADEMIC_INSTITUTES)))
+        self.locations = list(dict.fromkeys(locations or list(CITY_COORDINATES)))
+        self.sources = list(SOURCES)
+        self.hubs = list(hubs or LeadScorer.HUBS)
+        self._build()
+
+    def _build(self):
+        companies = self.companies + [""]
+        locations = self.locations + [""]
+
+        self.hq_categories = list(dict.fromkeys(location_fields(c, "")[0] for c in companies))
+        self.company_hq = np.array([self.hq_categories.index(location_fields(c, "")[0]) for c in companies])
+        self.hq_in_hub = np.array([_has_hub(self.hq_categories[code], self.hubs) for code in self.company_hq])
+
+        self.in_hub = np.array([_has_hub(loc, self.hubs) for loc in locations])
+        coords = np.array([CITY_COORDINATES.get(loc, [np.nan, np.nan]) for loc in locations], dtype=float)
+        self.lat, self.lon = coords[:, 0], coords[:, 1]
+
+        # Pair tables: rows are companies, columns are locations
+        shape = (len(companies), len(locations))
+        self.is_remote = np.zeros(shape, dtype=bool)
+        self.location_details = np.zeros(shape, dtype=np.int32)
+        details: dict = {}
+        for ci, company in enumerate(companies):
+            for li, location in enumerate(locations):
+                _, remote, detail = location_fields(company, location)
+                self.is_remote[ci, li] = remote
+                self.location_details[ci, li] = details.setdefault(detail, len(details))
+        self.detail_categories = list(details)
+
+    @staticmethod
+    def _codes(values: pd.Series, categories: List[str]) -> pd.Categorical:
+        """Encode `values` against `categories`, with values not in it appended after."""
+        if isinstance(values.dtype, pd.CategoricalDtype) and \
+                list(values.cat.categories[:len(categories)]) == categories:
+            return values.array
+        known = set(categories)
+        missing = [value for value in pd.unique(values.dropna().astype(str)) if value not in known]
+        return pd.Categorical(values, categories=categories + missing)
+
+    def categorize(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Return a copy of `df` with company/location/source keyed to this index."""
+        df = df.copy()
+        for column, attr in (("company", "companies"), ("location", "locations"), ("source", "sources")):
+            if column in df.columns:
+                df[column] = self._codes(df[column], getattr(self, attr))
+        return df
+
+    @accepts_batch
+    def enrich_frame(self, df: pd.DataFrame, jitter: float = JITTER, details: bool = True) -> pd.DataFrame:
+        """
+        Batch version of `enrich_location_data` as an integer gather.
+
+        Adds company_hq, is_remote, location_details and lat/lon (unknown
+        locations get NaN), plus the `in_hub` / `hq_in_hub` flags. Coordinate
+        jitter is derived from each lead's `id`, exactly as in the per-row path.
+        With `details=False` location_details is skipped; see
+        `render_location_details`.
+        """
+        df = self.categorize(df)
+        n = len(df)
+        company = df["company"].cat.codes.to_numpy() if "company" in df.columns else np.full(n, -1)
+        location = df["location"].cat.codes.to_numpy() if "location" in df.columns else np.full(n, -1)
+        companies = list(df["company"].cat.categories) if "company" in df.columns else self.companies
+        locations = list(df["location"].cat.categories) if "location" in df.columns else self.locations
+
+        # Per-company and per-location tables, extended by this frame's unseen values
+        hq_categories, company_hq, hq_in_hub = self.hq_categories, self.company_hq, self.hq_in_hub
+        new_companies = companies[len(self.companies):]
+        if new_companies:
+            hqs = [location_fields(value, "")[0] for value in new_companies]
+            slots = {hq: i for i, hq in enumerate(hq_categories)}
+            for hq in hqs:
+                slots.setdefault(hq, len(slots))
+            hq_categories = list(slots)
+            company_hq = _extend(company_hq, [slots[hq] for hq in hqs])
+            hq_in_hub = _extend(hq_in_hub, [_has_hub(hq, self.hubs) for hq in hqs])
+        in_hub, lat, lon = self.in_hub, self.lat, self.lon
+        new_locations = locations[len(self.locations):]
+        if new_locations:
+            in_hub = _extend(in_hub, [_has_hub(value, self.hubs) for value in new_locations])
+            coords = np.array([CITY_COORDINATES.get(value, [np.nan, np.nan]) for value in new_locations], dtype=float)
+            lat, lon = _extend(lat, coords[:, 0]), _extend(lon, coords[:, 1])
+
+        hq = company_hq[company]
+        df["company_hq"] = pd.Categorical.from_codes(hq, categories=hq_categories)
+
+        # Pair tables cover known values only; other pairs are formatted once each
+        known = (company < len(self.companies)) & (location < len(self.locations))
+        rows = np.flatnonzero(~known)
+        pair_company, pair_location = np.where(known, company, -1), np.where(known, location, -1)
+        is_remote = self.is_remote[pair_company, pair_location]
+        detail = self.location_details[pair_company, pair_location] if details else None
+        detail_categories = self.detail_categories
+        if len(rows):
+            pairs, inverse = np.unique(np.stack([company[rows], location[rows]], axis=1), axis=0, return_inverse=True)
+            slots = {text: i for i, text in enumerate(detail_categories)}
+            remote, codes = np.zeros(len(pairs), dtype=bool), np.zeros(len(pairs), dtype=np.int32)
+            for i, (ci, li) in enumerate(pairs):
+                _, remote[i], text = location_fields(companies[ci] if ci >= 0 else "", locations[li] if li >= 0 else "")
+                codes[i] = slots.setdefault(text, len(slots))
+            is_remote[rows] = remote[inverse.ravel()]
+            if details:
+                detail[rows] = codes[inverse.ravel()]
+                detail_categories = list(slots)
+        df["is_remote"] = is_remote
+        if details:
+            df["location_details"] = pd.Categorical.from_codes(detail, categories=detail_categories)
+
+        # Inject Coordinates for Map; unknown locations stay NaN through the add
+        ids = df["id"].fillna("").to_numpy() if "id" in df.columns else np.full(n, "")
+        d_lat, d_lon = jitter_offsets(id_hashes(ids), jitter)
+        df["lat"] = lat[location] + d_lat
+        df["lon"] = lon[location] + d_lon
+
+        df["in_hub"] = in_hub[location]
+        df["hq_in_hub"] = hq_in_hub[company]
+        return df
+
+
+def _extend(table: np.ndarray, values) -> np.ndarray:
+    """`table` with `values` inserted before its trailing missing-value slot."""
+    return np.concatenate([table[:-1], np.asarray(values, dtype=table.dtype), table[-1:]])
+
+
+@lru_cache(maxsize=1)
+def get_location_index() -> LocationIndex:
+    """Shared index over the mock_data constants, built on first use."""
+    return LocationIndex()
+
+
+@timed()
+@accepts_batch
+def enrich_location_frame(df: pd.DataFrame, details: bool = True) -> pd.DataFrame:
+    """Batch geo enrichment of a whole lead frame using the shared index."""
+    return get_location_index().enrich_frame(df, details=details)
+
+
+def render_location_details(df: pd.DataFrame) -> pd.Series:
+    """
+    `location_details` text for the rows of an enriched frame.
+
+    Formatted once per distinct (location, company_hq, is_remote), so it is
+    meant to be called on the rows about to be shown or exported.
+    """
+    parts = [df[column].astype(object).where(df[column].notna(), default)
+             for column, default in (("location", ""), ("company_hq", "Unknown HQ"), ("is_remote", False))]
+    key = np.zeros(len(df), dtype=np.int64)
+    for values in parts:
+        codes, uniques = pd.factorize(values)
+        key, _ = pd.factorize(key * (len(uniques) + 1) + codes + 1)
+    first = np.unique(key, return_index=True)[1]
+    text = np.array([
+        format_location_details(parts[0].iat[i], parts[1].iat[i], bool(parts[2].iat[i])) for i in first
+    ], dtype=object)
+    return pd.Series(text[key], index=df.index, name="location_details")
@@ -0,0 +1,73 @@
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+# Per-lead fields the map tooltip shows
+POINT_COLUMNS = ["lat", "lon", "score", "name", "company", "location"]
+
+# Above this many leads the map switches to aggregated grid cells
+POINT_LIMIT = 2000
+
+# Grid cell size in degrees; coarse enough to fold a metro area into one cell
+CELL_DEGREES = 0.5
+
+
+def map_points(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per-lead map rows: just the tooltip fields, for leads with coordinates.
+
+    Coordinates are rounded to ~10 m, which keeps the JSON sent to the
+    browser short without moving points visibly.
+    """
+    points = df.dropna(subset=["lat", "lon"])
+    points = points[[column for column in POINT_COLUMNS if column in points.columns]].copy()
+    points["lat"] = points["lat"].round(4)
+    points["lon"] = points["lon"].round(4)
+    for column in ("name", "company", "location"):
+        if column in points.columns:
+            points[column] = points[column].astype(object).where(points[column].notna(), "")
+    return points.reset_index(drop=True)
+
+
+def map_cells(df: pd.DataFrame, cell_degrees: float = CELL_DEGREES) -> pd.DataFrame:
+    """
+    Leads aggregated into `cell_degrees` grid cells.
+
+    One row per occupied cell with its centroid, lead `count`, `mean_score`
+    and the most common `location` as a label.
+    """
+    located = df.dropna(subset=["lat", "lon"])
+    lat, lon = located["lat"].to_numpy(), located["lon"].to_numpy()
+    cells = pd.DataFrame({
+        "row": np.floor(lat / cell_degrees).astype(np.int64),
+        "col": np.floor(lon / cell_degrees).astype(np.int64),
+        "lat": lat,
+        "lon": lon,
+        "score": located["score"].to_numpy(dtype=float),
+    })
+    grouped = cells.groupby(["row", "col"], sort=False)
+    summary = grouped.agg(lat=("lat", "mean"), lon=("lon", "mean"), count=("lat", "size"),
+                          mean_score=("score", "mean"))
+
+    labels = pd.DataFrame({"row": cells["row"], "col": cells["col"],
+                           "location": located["location"].astype(object).to_numpy()})
+    top = labels.value_counts(sort=True).reset_index().drop_duplicates(["row", "col"])
+    summary = summary.join(top.set_index(["row", "col"])["location"])
+
+    summary["lat"] = summary["lat"].round(4)
+    summary["lon"] = summary["lon"].round(4)
+    summary["mean_score"] = summary["mean_score"].round(1)
+    return summary.reset_index(drop=True)
+
+
+def map_layer_data(df: pd.DataFrame, point_limit: int = POINT_LIMIT,
+                   cell_degrees: float = CELL_DEGREES) -> Tuple[str, pd.DataFrame]:
+    """
+    Level-of-detail choice for the map: ("points", per-lead rows) while there
+    are at most `point_limit` located leads, else ("cells", grid aggregates).
+    """
+    located = int((df["lat"].notna() & df["lon"].notna()).sum())
+    if located <= point_limit:
+        return "points", map_points(df)
+    return "cells", map_cells(df, cell_degrees)
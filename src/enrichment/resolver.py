@@ -0,0 +1,232 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import Counter, deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.data_sources.lead import accepts_batch
+from src.enrichment.contact import company_domain_for, factorize_filled
+from src.pipeline.instrumentation import timed
+
+if TYPE_CHECKING:
+    import requests
+
+# How a company builds mailbox names from (first, last); the first listed wins ties
+EMAIL_PATTERNS: Dict[str, Callable[[str, str], str]] = {
+    "first.last": lambda first, last: f"{first}.{last}",
+    "firstlast": lambda first, last: f"{first}{last}",
+    "flast": lambda first, last: f"{first[:1]}{last}",
+    "first_last": lambda first, last: f"{first}_{last}",
+    "first": lambda first, last: first,
+}
+DEFAULT_PATTERN = "first.last"
+
+# Missing companies resolve like the mock enricher's placeholder
+UNKNOWN_COMPANY = "company"
+
+
+@dataclass(frozen=True)
+class CompanyContact:
+    """Where a company's mail goes and how its addresses are formed."""
+    domain: str
+    pattern: str = DEFAULT_PATTERN
+
+
+def local_part(name: str, pattern: str = DEFAULT_PATTERN) -> str:
+    """Mailbox name for `name` under `pattern`; 'info' when there is no first and last name."""
+    parts = name.lower().split()
+    if len(parts) < 2:
+        return "info"
+    return EMAIL_PATTERNS.get(pattern, EMAIL_PATTERNS[DEFAULT_PATTERN])(parts[0], parts[-1])
+
+
+def detect_pattern(name: str, email: str) -> Optional[str]:
+    """The EMAIL_PATTERNS key that produces `email`'s local part from `name`, if any."""
+    parts = name.lower().split()
+    if len(parts) < 2 or "@" not in email:
+        return None
+    local = email.split("@", 1)[0].lower()
+    for pattern, build in EMAIL_PATTERNS.items():
+        if build(parts[0], parts[-1]) == local:
+            return pattern
+    return None
+
+
+class ContactResolver(ABC):
+    """Looks up domains and email patterns for many companies in one request."""
+
+    @abstractmethod
+    def resolve_many(self, companies: List[str]) -> Dict[str, CompanyContact]:
+        """Resolve every company in `companies`; unknown ones may be left out."""
+
+
+class StubResolver(ContactResolver):
+    """
+    Offline resolver deriving `<company>.com` and the default pattern, with
+    optional per-company overrides. Records recent bulk requests for tests.
+    """
+
+    def __init__(self, overrides: Optional[Dict[str, CompanyContact]] = None):
+        self.overrides = dict(overrides or {})
+        self.requests: "deque[List[str]]" = deque(maxlen=100)
+
+    def resolve_many(self, companies: List[str]) -> Dict[str, CompanyContact]:
+        self.requests.append(list(companies))
+        return {
+            company: self.overrides.get(company) or CompanyContact(company_domain_for(company))
+            for company in companies
+        }
+
+
+class RestResolver(ContactResolver):
+    """
+    Resolver backed by a JSON HTTP service.
+
+    POSTs `{"companies": [...]}` to `url` and expects
+    `{"<company>": {"domain": ..., "pattern": ...}, ...}` back.
+    """
+
+    def __init__(self, base_url: str, path: str = "/companies/resolve",
+                 session: Optional["requests.Session"] = None, timeout: float = 10.0):
+        # requests is only needed once a REST resolver is configured
+        import requests
+        self.url = base_url.rstrip("/") + path
+        self.session = session or requests.Session()
+        self.timeout = timeout
+
+    def resolve_many(self, companies: List[str]) -> Dict[str, CompanyContact]:
+        response = self.session.post(self.url, json={"companies": companies}, timeout=self.timeout)
+        response.raise_for_status()
+        return {
+            company: CompanyContact(entry["domain"], entry.get("pattern") or DEFAULT_PATTERN)
+            for company, entry in response.json().items()
+            if entry and entry.get("domain")
+        }
+
+
+class DomainCache:
+    """Company -> CompanyContact with a per-entry time-to-live."""
+
+    def __init__(self, ttl: float = 24 * 3600, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: Dict[str, Tuple[float, CompanyContact]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_many(self, companies: Iterable[str]) -> Tuple[Dict[str, CompanyContact], List[str]]:
+        """(fresh entries found, companies missing or expired)."""
+        now = self.clock()
+        found, missing = {}, []
+        with self._lock:
+            for company in companies:
+                entry = self._entries.get(company)
+                if entry is not None and entry[0] > now:
+                    found[company] = entry[1]
+                else:
+                    missing.append(company)
+        return found, missing
+
+    def put_many(self, contacts: Dict[str, CompanyContact]):
+        expires = self.clock() + self.ttl
+        with self._lock:
+            for company, contact in contacts.items():
+                self._entries[company] = (expires, contact)
+
+
+class BatchContactEnricher:
+    """
+    Contact enrichment that resolves each company once per batch.
+
+    Leads are grouped by company; cached companies are served from the
+    DomainCache and the rest go to the resolver in a single bulk request.
+    Companies whose leads already carry emails have their domain and
+    dominant pattern learned from those instead. Companies the resolver
+    cannot place fall back to the mock `<company>.com` convention. Leads
+    that already have an email keep it.
+    """
+
+    def __init__(self, resolver: Optional[ContactResolver] = None, cache: Optional[DomainCache] = None):
+        self.resolver = resolver or StubResolver()
+        self.cache = cache if cache is not None else DomainCache()
+
+    def learn(self, pairs: Iterable[Tuple[str, str, str]]) -> Dict[str, CompanyContact]:
+        """
+        Dominant (domain, pattern) per company from (company, name, email)
+        triples of known addresses; learned entries are cached.
+        """
+        votes: Dict[str, Counter] = {}
+        for company, name, email in pairs:
+            pattern = detect_pattern(name, email)
+            if pattern is not None:
+                votes.setdefault(company, Counter())[(email.split("@", 1)[1].lower(), pattern)] += 1
+        learned = {company: CompanyContact(*counts.most_common(1)[0][0]) for company, counts in votes.items()}
+        self.cache.put_many(learned)
+        return learned
+
+    def resolve(self, companies: Iterable[str]) -> Dict[str, CompanyContact]:
+        """CompanyContact for each distinct company, with at most one resolver call."""
+        found, missing = self.cache.get_many(dict.fromkeys(companies))
+        if missing:
+            resolved = self.resolver.resolve_many(missing)
+            self.cache.put_many(resolved)
+            found.update(resolved)
+            for company in missing:
+                if company not in found:
+                    # Not cached, so the next batch asks the resolver again
+                    found[company] = CompanyContact(company_domain_for(company))
+        return found
+
+    def enrich(self, leads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Fill in `email` for a batch of lead dicts."""
+        self.learn(
+            (lead.get("company") or UNKNOWN_COMPANY, lead.get("name", ""), lead["email"])
+            for lead in leads if lead.get("email")
+        )
+        contacts = self.resolve(lead.get("company") or UNKNOWN_COMPANY for lead in leads if not lead.get("email"))
+        for lead in leads:
+            if not lead.get("email"):
+                contact = contacts[lead.get("company") or UNKNOWN_COMPANY]
+                lead["email"] = f"{local_part(lead.get('name', ''), contact.pattern)}@{contact.domain}"
+        return leads
+
+    # Marks `enrich` as a whole-batch pipeline stage
+    enrich.batched = True
+
+    @timed()
+    @accepts_batch
+    def enrich_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Columnwise `enrich`; local parts are built once per distinct (name, company)."""
+        df = df.copy()
+        n = len(df)
+        company_codes, company_uniques = factorize_filled(df, "company", UNKNOWN_COMPANY)
+        name_codes, name_uniques = factorize_filled(df, "name", "")
+        has_email = df["email"].notna().to_numpy() if "email" in df.columns else np.zeros(n, dtype=bool)
+
+        if has_email.any():
+            self.learn(zip(company_uniques[company_codes[has_email]], name_uniques[name_codes[has_email]],
+                           df["email"][has_email].astype(str)))
+
+        todo = np.flatnonzero(~has_email)
+        contacts = self.resolve(company_uniques[np.unique(company_codes[todo])])
+
+        pair_codes, _ = pd.factorize(company_codes[todo] * (len(name_uniques) + 1) + name_codes[todo])
+        first = todo[np.unique(pair_codes, return_index=True)[1]]
+        texts = np.empty(len(first), dtype=object)
+        for k, row in enumerate(first):
+            contact = contacts[company_uniques[company_codes[row]]]
+            texts[k] = f"{local_part(name_uniques[name_codes[row]], contact.pattern)}@{contact.domain}"
+        generated = np.full(n, None, dtype=object)
+        generated[todo] = texts[pair_codes]
+
+        if "email" in df.columns:
+            df["email"] = df["email"].where(df["email"].notna(), generated)
+        else:
+            df["email"] = generated
+        return df
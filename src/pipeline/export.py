@@ -0,0 +1,207 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, BinaryIO, Callable, Iterator, List, Optional, Sequence, Union
+
+import pandas as pd
+
+from src.pipeline.instrumentation import stage
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+    import requests
+
+# What spreadsheets get by default; score_flags and coordinates stay internal
+EXPORT_COLUMNS = [
+    "score", "name", "title", "company", "location", "email", "source",
+    "paper_title", "publication_date", "linkedin_url", "company_hq", "id",
+]
+
+# What a CRM upsert needs: the (id, source) key and the contact card
+CRM_COLUMNS = ["id", "source", "name", "title", "company", "location", "email", "score"]
+
+# Rows converted at a time; bounds export memory regardless of the frame size
+DEFAULT_CHUNK_ROWS = 50_000
+
+# Responses a CRM upsert is retried on, besides connection errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+Target = Union[str, BinaryIO]
+
+
+@dataclass
+class ExportStats:
+    """What an export wrote or sent."""
+    rows: int = 0
+    chunks: int = 0
+    bytes: int = 0
+    retries: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def export_columns(df: pd.DataFrame, columns: Optional[Sequence[str]] = None) -> List[str]:
+    """The `columns` (default EXPORT_COLUMNS) present in `df`, in the given order."""
+    return [column for column in (columns or EXPORT_COLUMNS) if column in df.columns]
+
+
+def iter_chunks(df: pd.DataFrame, chunk_rows: int, columns: Sequence[str]) -> Iterator[pd.DataFrame]:
+    """`df` projected to `columns`, `chunk_rows` rows at a time; only the current chunk is copied."""
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows][list(columns)]
+
+
+def _arrow():
+    try:
+        import pyarrow as pa
+    except ImportError as exc:
+        raise ImportError("Parquet and fast CSV export require pyarrow (pip install pyarrow)") from exc
+    return pa
+
+
+def _arrow_schema(pa, chunk: pd.DataFrame, plain: bool) -> "pa.Schema":
+    # Columns empty in the first chunk (e.g. paper_title on LinkedIn rows) become strings
+    schema = pa.Schema.from_pandas(chunk, preserve_index=False)
+    for i, field in enumerate(schema):
+        if pa.types.is_null(field.type):
+            schema = schema.set(i, field.with_type(pa.string()))
+        elif plain and pa.types.is_dictionary(field.type):
+            schema = schema.set(i, field.with_type(field.type.value_type))
+    return schema.remove_metadata()
+
+
+def _write_arrow(df: pd.DataFrame, target: Target, columns, chunk_rows: int, open_writer, plain: bool,
+                 name: str) -> ExportStats:
+    pa = _arrow()
+    stats = ExportStats()
+    start = time.perf_counter()
+    writer = None
+    columns = export_columns(df, columns)
+    with stage(name, rows=len(df)):
+        try:
+            for chunk in iter_chunks(df, chunk_rows, columns):
+                if writer is None:
+                    schema = _arrow_schema(pa, chunk, plain)
+                    writer = open_writer(pa, target, schema)
+                writer.write_table(pa.Table.from_pandas(chunk, preserve_index=False).cast(schema))
+                stats.rows += len(chunk)
+                stats.chunks += 1
+            if writer is None:
+                # Still write the header/schema for an empty frame
+                writer = open_writer(pa, target, _arrow_schema(pa, df.iloc[:0][columns], plain))
+        finally:
+            if writer is not None:
+                writer.close()
+    stats.seconds = time.perf_counter() - start
+    stats.bytes = os.path.getsize(target) if isinstance(target, str) else target.tell()
+    return stats
+
+
+def write_parquet(df: pd.DataFrame, target: Target, columns: Optional[Sequence[str]] = None,
+                  chunk_rows: int = DEFAULT_CHUNK_ROWS, compression: str = "zstd") -> ExportStats:
+    """
+    Write `df` to Parquet at `target` (a path or binary file), one row group
+    per chunk. Only `columns` (default EXPORT_COLUMNS) are written;
+    Categoricals stay dictionary-encoded.
+    """
+    def open_writer(pa, sink, schema):
+        import pyarrow.parquet as pq
+        return pq.ParquetWriter(sink, schema, compression=compression)
+    return _write_arrow(df, target, columns, chunk_rows, open_writer, plain=False, name="export.parquet")
+
+
+def write_csv(df: pd.DataFrame, target: Target, columns: Optional[Sequence[str]] = None,
+              chunk_rows: int = DEFAULT_CHUNK_ROWS) -> ExportStats:
+    """Write `df` as CSV with a header row to `target` (a path or binary file), chunk by chunk."""
+    def open_writer(pa, sink, schema):
+        import pyarrow.csv as pacsv
+        return pacsv.CSVWriter(sink, schema)
+    return _write_arrow(df, target, columns, chunk_rows, open_writer, plain=True, name="export.csv")
+
+
+def crm_session(pool_size: int = 4, retries: int = 3, backoff: float = 0.5) -> "requests.Session":
+    """
+    Session keeping up to `pool_size` connections per host alive, retrying
+    connection errors and RETRY_STATUSES up to `retries` times with
+    exponential backoff (honouring Retry-After).
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(total=retries, backoff_factor=backoff, status_forcelist=RETRY_STATUSES,
+                  allowed_methods=frozenset({"POST", "PUT"}), raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class CrmExporter:
+    """
+    Pushes leads to a CRM upsert endpoint in JSON batches.
+
+    Each batch of `batch_size` rows is POSTed to `url` as `{"leads": [...]}`.
+    Batches are serialized straight from the frame with `DataFrame.to_json`,
+    so no per-row dicts are built, and at most `workers` batches exist at a
+    time. Connections are pooled and failed requests are retried (see
+    `crm_session`); a batch that still fails raises `requests.HTTPError`.
+    """
+
+    def __init__(self, base_url: str, path: str = "/leads/upsert", session: Optional["requests.Session"] = None,
+                 batch_size: int = 500, workers: int = 4, retries: int = 3, backoff: float = 0.5,
+                 timeout: float = 30.0):
+        self.url = base_url.rstrip("/") + path
+        self.session = session or crm_session(pool_size=workers, retries=retries, backoff=backoff)
+        self.batch_size = batch_size
+        self.workers = workers
+        self.timeout = timeout
+
+    def batches(self, df: pd.DataFrame, columns: Optional[Sequence[str]] = None) -> Iterator[bytes]:
+        """Request bodies for `df`, `batch_size` rows each."""
+        for chunk in iter_chunks(df, self.batch_size, export_columns(df, columns or CRM_COLUMNS)):
+            yield b'{"leads":' + chunk.to_json(orient="records", date_format="iso").encode() + b"}"
+
+    def _post(self, body: bytes) -> int:
+        response = self.session.post(self.url, data=body, timeout=self.timeout,
+                                     headers={"Content-Type": "application/json"})
+        response.raise_for_status()
+        retries = getattr(response.raw, "retries", None)
+        return len(retries.history) if retries is not None else 0
+
+    def push(self, df: pd.DataFrame, columns: Optional[Sequence[str]] = None,
+             on_batch: Optional[Callable[[ExportStats], None]] = None) -> ExportStats:
+        """Upsert every row of `df`; `on_batch` gets the running stats after each batch."""
+        stats = ExportStats()
+        start = time.perf_counter()
+        with stage("export.crm", rows=len(df)), ThreadPoolExecutor(max_workers=self.workers) as pool:
+            pending = {}
+
+            def collect(done):
+                for future in done:
+                    rows, size = pending.pop(future)
+                    stats.retries += future.result()
+                    stats.rows += rows
+                    stats.bytes += size
+                    stats.chunks += 1
+                    if on_batch:
+                        on_batch(stats)
+
+            try:
+                for offset, body in zip(range(0, len(df), self.batch_size), self.batches(df, columns)):
+                    if len(pending) >= self.workers:
+                        collect(wait(pending, return_when=FIRST_COMPLETED).done)
+                    rows = min(self.batch_size, len(df) - offset)
+                    pending[pool.submit(self._post, body)] = (rows, len(body))
+                collect(wait(pending).done)
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
+        stats.seconds = time.perf_counter() - start
+        return stats
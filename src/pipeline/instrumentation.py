@@ -0,0 +1,241 @@
+import cProfile
+import io
+import json
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from functools import wraps
+from typing import Dict, Iterator, List, Optional
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+def process_max_rss() -> Optional[int]:
+    """Process high-water resident memory in bytes, where the OS reports it."""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and KiB on Linux
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+@dataclass
+class StageStats:
+    """Accumulated measurements for one named stage."""
+    calls: int = 0
+    rows: int = 0
+    seconds: float = 0.0
+    # Process-wide high-water mark when the stage last finished, not the stage's own peak
+    process_max_rss_bytes: Optional[int] = None
+    traced_peak_bytes: Optional[int] = None
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+class Span:
+    """Handle for an open `Collector.stage`; set `rows` once the count is known."""
+    __slots__ = ("name", "rows", "start", "traced_start", "traced_peak")
+
+    def __init__(self, name: str, rows: int):
+        self.name = name
+        self.rows = rows
+        self.start = 0.0
+        self.traced_start = 0
+        self.traced_peak = 0
+
+
+class Collector:
+    """
+    Per-stage wall time, row throughput and memory.
+
+    Stages are timed with `stage()` (a context manager) or `timed()` (a
+    decorator). Measurements accumulate by stage name across calls and
+    threads. Each stage also records the process's maximum RSS so far,
+    which only shows which stage first pushed it up; the per-stage figure is
+    the traced peak. Capture mode (`profile`, `trace_memory`) additionally
+    runs cProfile and tracemalloc around each stage; it is meant for
+    diagnosing a regression, not for always-on use. Under capture, a stage's
+    traced peak is the peak of Python allocations made while it ran, nested
+    stages included; concurrent threads share tracemalloc, so those peaks
+    overlap.
+    """
+
+    def __init__(self, profile: bool = False, trace_memory: bool = False):
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.stats: Dict[str, StageStats] = {}
+        self._profiles: Dict[str, pstats.Stats] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._started_tracing = False
+
+    def set_capture(self, enabled: bool):
+        """Switch capture mode (cProfile + tracemalloc) on or off."""
+        self.profile = self.trace_memory = enabled
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        elif not enabled and self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def reset(self):
+        with self._lock:
+            self.stats.clear()
+            self._profiles.clear()
+
+    @contextmanager
+    def stage(self, name: str, rows: int = 0) -> Iterator[Span]:
+        """Time the enclosed block as stage `name`, processing `rows` rows."""
+        span = Span(name, rows)
+        spans: List[Span] = self._local.__dict__.setdefault("spans", [])
+        profiler = None
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            span.traced_start, peak = tracemalloc.get_traced_memory()
+            for outer in spans:
+                outer.traced_peak = max(outer.traced_peak, peak)
+            tracemalloc.reset_peak()
+        if self.profile and not spans:
+            # cProfile allows one active profiler per thread; profile outermost stages
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                profiler = None
+        spans.append(span)
+        span.start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            elapsed = time.perf_counter() - span.start
+            spans.pop()
+            if profiler is not None:
+                profiler.disable()
+            traced = None
+            if self.trace_memory and tracemalloc.is_tracing():
+                peak = max(span.traced_peak, tracemalloc.get_traced_memory()[1])
+                traced = peak - span.traced_start
+                for outer in spans:
+                    outer.traced_peak = max(outer.traced_peak, peak)
+            self.record(name, elapsed, span.rows, traced, profiler)
+
+    def timed(self, name: Optional[str] = None):
+        """
+        Decorator form of `stage`. Rows are counted as `len(result)` when the
+        result has a length, otherwise one per call.
+        """
+        def decorate(func):
+            stage_name = name or func.__qualname__
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(stage_name) as span:
+                    result = func(*args, **kwargs)
+                    span.rows = len(result) if hasattr(result, "__len__") else 1
+                return result
+            return wrapper
+        return decorate
+
+    def record(self, name: str, seconds: float, rows: int = 0, traced_peak: Optional[int] = None,
+               profiler: Optional[cProfile.Profile] = None):
+        """Add one measurement of stage `name`."""
+        rss = process_max_rss()
+        with self._lock:
+            stats = self.stats.setdefault(name, StageStats())
+            stats.calls += 1
+            stats.rows += rows
+            stats.seconds += seconds
+            if rss is not None:
+                stats.process_max_rss_bytes = max(stats.process_max_rss_bytes or 0, rss)
+            if traced_peak is not None:
+                stats.traced_peak_bytes = max(stats.traced_peak_bytes or 0, traced_peak)
+            if profiler is not None:
+                if name in self._profiles:
+                    self._profiles[name].add(profiler)
+                else:
+                    self._profiles[name] = pstats.Stats(profiler)
+
+    def profile_report(self, name: str, limit: int = 20, sort: str = "cumulative") -> str:
+        """Top `limit` functions of stage `name` from capture mode, as text."""
+        with self._lock:
+            stats = self._profiles.get(name)
+            if stats is None:
+                return ""
+            out = io.StringIO()
+            stats.stream = out
+            stats.sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+    def profiled_stages(self) -> List[str]:
+        with self._lock:
+            return list(self._profiles)
+
+    def to_dict(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                name: dict(asdict(stats), rows_per_second=stats.rows_per_second)
+                for name, stats in self.stats.items()
+            }
+
+    def to_frame(self) -> pd.DataFrame:
+        """One row per stage, slowest first."""
+        frame = pd.DataFrame.from_dict(self.to_dict(), orient="index")
+        if frame.empty:
+            return frame
+        frame.index.name = "stage"
+        return frame.sort_values("seconds", ascending=False)
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def to_prometheus(self, prefix: str = "helix") -> str:
+        """Prometheus text exposition format, one series per stage."""
+        metrics = [
+            ("stage_seconds_total", "counter", "Wall time spent in the stage.", "seconds"),
+            ("stage_rows_total", "counter", "Rows processed by the stage.", "rows"),
+            ("stage_calls_total", "counter", "Times the stage ran.", "calls"),
+            ("stage_process_max_rss_bytes", "gauge", "Process-wide maximum RSS when the stage finished.",
+             "process_max_rss_bytes"),
+            ("stage_traced_peak_bytes", "gauge", "Peak Python allocations during the stage (capture mode).",
+             "traced_peak_bytes"),
+        ]
+        snapshot = self.to_dict()
+        lines = []
+        for metric, kind, help_text, field in metrics:
+            series = [(name, values[field]) for name, values in snapshot.items() if values[field] is not None]
+            if not series:
+                continue
+            lines.append(f"# HELP {prefix}_{metric} {help_text}")
+            lines.append(f"# TYPE {prefix}_{metric} {kind}")
+            for name, value in series:
+                label = name.replace("\\", "\\\\").replace('"', '\\"')
+                lines.append(f'{prefix}_{metric}{{stage="{label}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide collector the pipeline modules report into
+collector = Collector()
+
+
+def stage(name: str, rows: int = 0):
+    """`Collector.stage` on the shared collector."""
+    return collector.stage(name, rows)
+
+
+def timed(name: Optional[str] = None):
+    """`Collector.timed` on the shared collector."""
+    return collector.timed(name)
@@ -0,0 +1,83 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from src.enrichment.lookup import enrich_location_frame
+from src.enrichment.contact import enrich_contact_frame
+from src.ranking.cache import CachedScorer
+from src.ranking.scorer import LeadScorer
+
+# Below this many rows per worker, pool start-up and pickling cost more than they save
+MIN_ROWS_PER_WORKER = 50_000
+
+_worker_scorer = None
+
+
+def process_frame(df: pd.DataFrame, scorer=None) -> pd.DataFrame:
+    """Geo + contact enrichment and scoring of a lead frame, in this process."""
+    scorer = scorer or LeadScorer()
+    df = enrich_location_frame(df)
+    df = enrich_contact_frame(df)
+    return scorer.score_frame(df)
+
+
+def _init_worker(scorer):
+    global _worker_scorer
+    _worker_scorer = scorer
+
+
+def _process_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    return process_frame(chunk, _worker_scorer)
+
+
+def default_workers() -> int:
+    """CPUs this process may run on."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _concat(frames) -> pd.DataFrame:
+    """`pd.concat` that keeps Categorical columns whose chunks extended the categories differently."""
+    frames = list(frames)
+    for column in frames[0].columns:
+        parts = [frame[column] for frame in frames]
+        if all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts) and \
+                len({part.dtype for part in parts}) > 1:
+            categories = union_categoricals([part.array for part in parts]).categories
+            frames = [frame.assign(**{column: frame[column].cat.set_categories(categories)}) for frame in frames]
+    return pd.concat(frames)
+
+
+def parallel_process(df: pd.DataFrame, scorer=None, workers: Optional[int] = None,
+                     min_rows_per_worker: int = MIN_ROWS_PER_WORKER) -> pd.DataFrame:
+    """
+    `process_frame` sharded across a process pool.
+
+    The frame is split into contiguous row ranges, one per worker, which are
+    pickled as whole DataFrames (columnar buffers, not per-lead dicts) and
+    concatenated back in their original order. Inputs too small to give each
+    worker `min_rows_per_worker` rows run in-process instead.
+
+    The scorer is pickled to each worker. A `CachedScorer` is unwrapped to
+    the scorer it fronts, since its cache (a lock and a SQLite connection)
+    cannot cross processes; chunks are scored uncached.
+    """
+    scorer = scorer or LeadScorer()
+    if isinstance(scorer, CachedScorer):
+        scorer = scorer.scorer
+    workers = workers or default_workers()
+    workers = max(1, min(workers, len(df) // max(1, min_rows_per_worker)))
+    if workers == 1:
+        return process_frame(df, scorer)
+
+    bounds = np.linspace(0, len(df), workers + 1).astype(int)
+    chunks = [df.iloc[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(scorer,)) as pool:
+        results = list(pool.map(_process_chunk, chunks))
+    return _concat(results)
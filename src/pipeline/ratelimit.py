@@ -0,0 +1,67 @@
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+class TokenBucket:
+    """
+    Rate limit of `rate` acquisitions per second on average, allowing
+    bursts of up to `burst`. Thread-safe.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, clock: Callable[[], float] = time.monotonic):
+        if rate <= 0:
+            raise ValueError("Token bucket rate must be positive")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.clock = clock
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def try_acquire(self, tokens: int = 1) -> float:
+        """Take `tokens` and return 0, or take nothing and return the seconds until they are available."""
+        if tokens > self.burst:
+            raise ValueError(f"Cannot take {tokens} tokens from a bucket of {self.burst}")
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: int = 1, stop: Optional[threading.Event] = None) -> float:
+        """
+        Block until `tokens` are taken; returns the seconds spent waiting.
+        Returns early, without tokens, once `stop` is set.
+        """
+        waited = 0.0
+        while True:
+            delay = self.try_acquire(tokens)
+            if not delay:
+                return waited
+            if stop is None:
+                time.sleep(delay)
+            elif stop.wait(delay):
+                return waited
+            waited += delay
+
+
+@dataclass
+class Backoff:
+    """
+    Exponential backoff with jitter: the n-th consecutive failure waits
+    between half and all of `min(cap, base * factor ** (n - 1))` seconds, so
+    sources failing together do not retry in lockstep.
+    """
+    base: float = 5.0
+    cap: float = 900.0
+    factor: float = 2.0
+
+    def delay(self, failures: int, rng: random.Random = random) -> float:
+        ceiling = min(self.cap, self.base * self.factor ** max(0, failures - 1))
+        return ceiling / 2 + rng.uniform(0, ceiling / 2)
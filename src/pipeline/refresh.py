@@ -0,0 +1,243 @@
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from src.data_sources.base import DataSource
+from src.pipeline.instrumentation import stage as timed_stage
+from src.pipeline.ratelimit import Backoff, TokenBucket
+from src.storage.lead_store import LeadStore, RefreshStats, Stage
+
+
+@dataclass
+class SourceSchedule:
+    """How often, how much and how fast one source is polled."""
+    name: str
+    source: DataSource
+    limit: int
+    interval: Optional[float] = None
+    page_size: int = 25
+    query: Optional[str] = None
+    bucket: Optional[TokenBucket] = None
+
+
+@dataclass
+class SourceStatus:
+    """
+    Refresh state of one source. `state` is "idle", "queued", "running" or
+    "backoff"; times are `time.time()` values.
+    """
+    name: str
+    state: str = "idle"
+    last_attempt: Optional[float] = None
+    last_success: Optional[float] = None
+    last_error: Optional[str] = None
+    failures: int = 0
+    next_run: Optional[float] = None
+    stats: Optional[RefreshStats] = None
+    throttled: float = 0.0
+
+
+class RefreshScheduler:
+    """
+    Polls DataSources in the background and upserts their leads into a LeadStore.
+
+    Each source is polled every `interval` seconds (give or take `jitter`,
+    as a fraction), or only when `trigger`ed if it has no interval. Due
+    sources are queued and `workers` threads fetch them in pages (through
+    `DataSource.iter_chunks`), each page waiting for a token from the
+    source's bucket, so upstream quotas hold however often polls are due.
+    Every page is upserted through `stages()`, called once per poll so
+    scoring rule changes apply to the next one; readers keep serving what
+    the store already has meanwhile.
+
+    A failed poll keeps the pages stored before the failure and is retried
+    after `backoff`; a success resets the failure count. `status` and
+    `queue_depth` report progress to the dashboard.
+    """
+
+    def __init__(self, store: LeadStore, stages: Callable[[], Iterable[Stage]], workers: int = 2,
+                 backoff: Optional[Backoff] = None, jitter: float = 0.1, rng: Optional[random.Random] = None,
+                 clock: Callable[[], float] = time.time):
+        self.store = store
+        self.stages = stages
+        self.workers = workers
+        self.backoff = backoff or Backoff()
+        self.jitter = jitter
+        self.rng = rng or random.Random()
+        self.clock = clock
+        self._schedules: Dict[str, SourceSchedule] = {}
+        self._status: Dict[str, SourceStatus] = {}
+        self._queue: Deque[Tuple[str, int]] = deque()
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def add(self, name: str, source: DataSource, limit: int, interval: Optional[float] = None,
+            rate: Optional[float] = None, burst: int = 1, page_size: int = 25,
+            query: Optional[str] = None) -> "RefreshScheduler":
+        """
+        Poll `source` for `limit` leads every `interval` seconds, first as soon
+        as the scheduler starts; at most `rate` fetch calls per second.
+        """
+        bucket = TokenBucket(rate, burst) if rate else None
+        with self._cond:
+            self._schedules[name] = SourceSchedule(name, source, limit, interval, page_size, query, bucket)
+            self._status[name] = SourceStatus(name, next_run=self.clock() if interval else None)
+            self._cond.notify_all()
+        return self
+
+    def start(self) -> "RefreshScheduler":
+        if not self._threads:
+            self._stop.clear()
+            self._threads = [threading.Thread(target=self._work, name=f"lead-refresh-{i}", daemon=True)
+                             for i in range(self.workers)]
+            for thread in self._threads:
+                thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop after the pages in flight; queued polls are dropped."""
+        self._stop.set()
+        with self._cond:
+            for name, _ in self._queue:
+                self._reset(name)
+            self._queue.clear()
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def __enter__(self) -> "RefreshScheduler":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def running(self) -> bool:
+        return bool(self._threads) and not self._stop.is_set()
+
+    def trigger(self, names: Optional[Iterable[str]] = None, limit: Optional[int] = None) -> List[str]:
+        """
+        Queue a poll of `names` (default all sources) now, fetching `limit`
+        leads instead of the scheduled amount. Sources already queued or
+        running are skipped; returns the names queued.
+        """
+        queued = []
+        with self._cond:
+            for name in self._schedules if names is None else names:
+                if self._status[name].state not in ("queued", "running"):
+                    self._enqueue(name, limit)
+                    queued.append(name)
+            self._cond.notify_all()
+        return queued
+
+    def queue_depth(self) -> int:
+        """Polls waiting for a worker."""
+        with self._cond:
+            return len(self._queue)
+
+    def busy(self) -> bool:
+        """Whether any poll is queued or running."""
+        with self._cond:
+            return any(status.state in ("queued", "running") for status in self._status.values())
+
+    def status(self) -> Dict[str, SourceStatus]:
+        """A snapshot of each source's status."""
+        with self._cond:
+            return {name: replace(status, stats=status.stats and replace(status.stats))
+                    for name, status in self._status.items()}
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until nothing is queued or running; False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not any(status.state in ("queued", "running") for status in self._status.values()),
+                timeout)
+
+    def _enqueue(self, name: str, limit: Optional[int] = None):
+        self._queue.append((name, limit or self._schedules[name].limit))
+        status = self._status[name]
+        status.state = "queued"
+        status.next_run = None
+
+    def _reset(self, name: str):
+        status = self._status[name]
+        status.state = "idle"
+        status.next_run = self.clock() if self._schedules[name].interval else None
+
+    def _next(self) -> Optional[Tuple[SourceSchedule, int]]:
+        # Waits, under the lock, until a poll is queued or due
+        while not self._stop.is_set():
+            now = self.clock()
+            for name, status in self._status.items():
+                if status.state in ("idle", "backoff") and status.next_run is not None and status.next_run <= now:
+                    self._enqueue(name)
+            if self._queue:
+                name, limit = self._queue.popleft()
+                self._status[name].state = "running"
+                return self._schedules[name], limit
+            upcoming = [status.next_run for status in self._status.values() if status.next_run is not None]
+            self._cond.wait(min(upcoming) - now if upcoming else None)
+        return None
+
+    def _work(self):
+        while True:
+            with self._cond:
+                job = self._next()
+            if job is None:
+                return
+            schedule, limit = job
+            status = self._status[schedule.name]
+            with self._cond:
+                status.last_attempt = self.clock()
+                status.stats = RefreshStats()
+                status.throttled = 0.0
+            try:
+                self._poll(schedule, limit, status)
+            except Exception as exc:
+                with self._cond:
+                    status.failures += 1
+                    status.last_error = f"{type(exc).__name__}: {exc}"
+                    status.state = "backoff"
+                    status.next_run = self.clock() + self.backoff.delay(status.failures, self.rng)
+                    self._cond.notify_all()
+                continue
+            with self._cond:
+                if self._stop.is_set():
+                    # Interrupted: poll again as soon as the scheduler restarts
+                    self._reset(schedule.name)
+                    self._cond.notify_all()
+                    return
+                status.failures = 0
+                status.last_error = None
+                status.last_success = self.clock()
+                status.state = "idle"
+                if schedule.interval:
+                    spread = 1 + self.rng.uniform(-self.jitter, self.jitter)
+                    status.next_run = status.last_success + schedule.interval * spread
+                self._cond.notify_all()
+
+    def _poll(self, schedule: SourceSchedule, limit: int, status: SourceStatus):
+        stages = list(self.stages())
+        stats = RefreshStats()
+        # Paginated sources map these chunks onto their own pages (see DataSource.iter_chunks)
+        chunks = schedule.source.iter_chunks(schedule.query, limit=limit, chunk_size=schedule.page_size)
+        with timed_stage(f"refresh.{schedule.name}") as span:
+            while not self._stop.is_set():
+                if schedule.bucket is not None:
+                    waited = schedule.bucket.acquire(stop=self._stop)
+                    with self._cond:
+                        status.throttled += waited
+                    if self._stop.is_set():
+                        break
+                batch = next(chunks, None)
+                if batch is None:
+                    break
+                self.store.upsert(batch, stages, stats)
+                with self._cond:
+                    status.stats = replace(stats)
+            span.rows = stats.total
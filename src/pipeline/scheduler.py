@@ -0,0 +1,169 @@
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from src.data_sources.base import DataSource
+
+Lead = Dict[str, Any]
+
+
+@dataclass
+class SourceJob:
+    """A registered source plus how it should be fetched."""
+    name: str
+    source: DataSource
+    limit: int
+    timeout: Optional[float] = None
+    max_concurrency: int = 1
+    page_size: Optional[int] = None
+
+    def pages(self) -> List[int]:
+        """Split `limit` into page sizes fetched as separate calls."""
+        size = self.page_size or self.limit
+        full, rest = divmod(self.limit, size) if size else (0, 0)
+        return [size] * full + ([rest] if rest else [])
+
+
+@dataclass
+class FetchResult:
+    """Leads per source, with failures and timeouts kept separately."""
+    leads: Dict[str, List[Lead]] = field(default_factory=dict)
+    errors: Dict[str, Exception] = field(default_factory=dict)
+    timed_out: List[str] = field(default_factory=list)
+    elapsed: Dict[str, float] = field(default_factory=dict)
+
+    def all_leads(self) -> List[Lead]:
+        return [lead for leads in self.leads.values() for lead in leads]
+
+    @property
+    def complete(self) -> bool:
+        return not self.errors and not self.timed_out
+
+
+class FetchScheduler:
+    """
+    Fetches several DataSources concurrently.
+
+    Each source may be split into pages; at most `max_concurrency` pages of a
+    source are in flight at once. A source that exceeds its `timeout` keeps
+    whatever pages finished in time and is listed in `timed_out`; a source that
+    raises is listed in `errors`. Other sources are unaffected either way.
+    """
+
+    def __init__(self, max_workers: int = 8):
+        self.max_workers = max_workers
+        self.jobs: List[SourceJob] = []
+
+    def register(self, source: DataSource, limit: int, name: str = None, timeout: float = None,
+                 max_concurrency: int = 1, page_size: int = None) -> "FetchScheduler":
+        name = name or type(source).__name__
+        self.jobs.append(SourceJob(name, source, limit, timeout, max_concurrency, page_size))
+        return self
+
+    # --- Thread pool ---
+    def run(self, query: str = None, **kwargs) -> FetchResult:
+        """
+        Fetch all registered sources on a thread pool.
+
+        Pages are handed to the pool only when a thread is free for them,
+        round-robin across sources and never more than a source's
+        `max_concurrency` at once, so a source with many pages cannot hold
+        every thread. A source's timeout starts when its first page starts.
+        """
+        result = FetchResult()
+        started = time.perf_counter()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        remaining = {job.name: deque(job.pages()) for job in self.jobs}
+        running = {job.name: 0 for job in self.jobs}
+        pending: Dict[Future, SourceJob] = {}
+        # Pages of expired sources still occupying a thread
+        abandoned = set()
+        deadlines = {}
+        for job in self.jobs:
+            result.leads[job.name] = []
+
+        def fill():
+            while True:
+                submitted = False
+                for job in self.jobs:
+                    if len(pending) + len(abandoned) >= self.max_workers:
+                        return
+                    if remaining[job.name] and running[job.name] < job.max_concurrency:
+                        size = remaining[job.name].popleft()
+                        pending[executor.submit(job.source.fetch_data, query, limit=size, **kwargs)] = job
+                        running[job.name] += 1
+                        if job.timeout is not None and job.name not in deadlines:
+                            deadlines[job.name] = time.perf_counter() + job.timeout
+                        submitted = True
+                if not submitted:
+                    return
+
+        try:
+            fill()
+            while pending:
+                now = time.perf_counter()
+                # Drop sources whose deadline has passed
+                for name, deadline in list(deadlines.items()):
+                    if now >= deadline:
+                        self._expire(result, name, pending, abandoned)
+                        remaining[name].clear()
+                        del deadlines[name]
+                fill()
+                if not pending:
+                    break
+                wait_for = max(0.0, min(deadlines.values()) - now) if deadlines else None
+                done, _ = wait(set(pending) | abandoned, timeout=wait_for, return_when=FIRST_COMPLETED)
+                abandoned -= done
+                for future in done:
+                    job = pending.pop(future, None)
+                    if job is None:
+                        continue
+                    running[job.name] -= 1
+                    try:
+                        result.leads[job.name].extend(future.result())
+                    except Exception as exc:
+                        result.errors[job.name] = exc
+                    if not running[job.name] and not remaining[job.name]:
+                        result.elapsed[job.name] = time.perf_counter() - started
+                        deadlines.pop(job.name, None)
+                fill()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return result
+
+    @staticmethod
+    def _expire(result: FetchResult, name: str, pending: Dict, abandoned: set) -> None:
+        for future, job in list(pending.items()):
+            if job.name == name:
+                if not future.cancel():
+                    abandoned.add(future)
+                del pending[future]
+        result.timed_out.append(name)
+
+    # --- asyncio ---
+    async def arun(self, query: str = None, **kwargs) -> FetchResult:
+        """Fetch all registered sources concurrently on the running event loop."""
+        result = FetchResult()
+        started = time.perf_counter()
+
+        async def fetch_job(job: SourceJob):
+            gate = asyncio.Semaphore(job.max_concurrency)
+            collected = result.leads[job.name] = []
+
+            async def fetch_page(size: int):
+                async with gate:
+                    collected.extend(await job.source.afetch_data(query, limit=size, **kwargs))
+
+            try:
+                await asyncio.wait_for(asyncio.gather(*(fetch_page(size) for size in job.pages())), job.timeout)
+            except asyncio.TimeoutError:
+                result.timed_out.append(job.name)
+            except Exception as exc:
+                result.errors[job.name] = exc
+            result.elapsed[job.name] = time.perf_counter() - started
+
+        await asyncio.gather(*(fetch_job(job) for job in self.jobs))
+        return result
@@ -0,0 +1,154 @@
+import heapq
+import itertools
+import queue
+import threading
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.data_sources.base import DataSource
+from src.enrichment.geo import enrich_location_data
+from src.enrichment.contact import enrich_contact_info
+from src.ranking.scorer import LeadScorer
+from src.pipeline.instrumentation import stage as timed_stage
+
+Lead = Dict[str, Any]
+Stage = Callable[[Lead], Lead]
+
+_DONE = object()
+
+
+def default_stages(scorer: Optional[LeadScorer] = None, text: bool = True, contacts=None) -> List[Stage]:
+    """
+    The standard enrichment -> ranking chain used by the dashboard.
+
+    With `text=False` the display strings (`location_details`,
+    `score_reasons`) are not built; render them for the rows that are shown.
+    `contacts` (e.g. a BatchContactEnricher) replaces the mock per-lead
+    contact enricher with its batched `enrich`.
+    """
+    scorer = scorer or LeadScorer()
+    contact_stage = contacts.enrich if contacts is not None else enrich_contact_info
+    if not text:
+        return [partial(enrich_location_data, details=False), contact_stage,
+                partial(scorer.score_profile, reasons=False)]
+    return [enrich_location_data, contact_stage, scorer.score_profile]
+
+
+def stage_name(stage: Stage) -> str:
+    """Name a stage is reported under in the instrumentation collector."""
+    func = stage.func if isinstance(stage, partial) else stage
+    return getattr(func, "__qualname__", type(func).__name__)
+
+
+def run_stages(stages: List[Stage], leads: List[Lead]) -> List[Lead]:
+    """
+    Apply each stage to the whole batch in turn, timing it per batch.
+
+    Stages marked `batched` take and return the whole list of leads.
+    """
+    for stage in stages:
+        with timed_stage(stage_name(stage), rows=len(leads)):
+            if getattr(stage, "batched", False):
+                leads = stage(leads)
+            else:
+                leads = [stage(lead) for lead in leads]
+    return leads
+
+
+class TopK:
+    """Keeps the `k` highest-scoring leads seen so far."""
+
+    def __init__(self, k: int = 10, key: str = "score"):
+        self.k = k
+        self.key = key
+        self._heap: List[Tuple[float, int, Lead]] = []
+        self._counter = itertools.count()
+
+    def push(self, lead: Lead):
+        # Earlier leads win ties, matching a stable sort on score
+        item = (lead.get(self.key, 0), -next(self._counter), lead)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, item)
+        elif item[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, item)
+
+    def items(self) -> List[Lead]:
+        """Leads ordered best first."""
+        return [lead for _, _, lead in sorted(self._heap, key=lambda item: item[:2], reverse=True)]
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+class LeadPipeline:
+    """
+    Streams leads from one or more DataSources through enrichment and scoring.
+
+    A background thread fetches chunks into a bounded buffer; once the buffer
+    holds `buffer_chunks` chunks the fetcher blocks until the consumer catches
+    up, so memory stays proportional to `chunk_size * buffer_chunks` regardless
+    of how many leads are requested.
+    """
+
+    def __init__(self, stages: Optional[List[Stage]] = None, chunk_size: int = 500,
+                 buffer_chunks: int = 4, top_k: int = 10):
+        self.stages = stages if stages is not None else default_stages()
+        self.chunk_size = chunk_size
+        self.buffer_chunks = buffer_chunks
+        self.top = TopK(top_k)
+        self.processed = 0
+
+    def process(self, lead: Lead) -> Lead:
+        """Run a single lead through every stage."""
+        return run_stages(self.stages, [lead])[0]
+
+    def stream(self, requests: Iterable[Tuple[DataSource, int]], query: str = None) -> Iterator[List[Lead]]:
+        """
+        Yield processed chunks for each `(source, limit)` request.
+
+        Each source is fetched on its own thread, so chunks from different
+        sources interleave as they arrive. The running top-K is updated before
+        each chunk is yielded.
+        """
+        buffer: "queue.Queue" = queue.Queue(maxsize=self.buffer_chunks)
+        stop = threading.Event()
+
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    buffer.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce(source: DataSource, limit: int):
+            try:
+                for chunk in source.iter_chunks(query, limit=limit, chunk_size=self.chunk_size):
+                    if not put(chunk):
+                        return
+                put(_DONE)
+            except Exception as exc:  # surfaced to the consumer
+                put(exc)
+
+        producers = [threading.Thread(target=produce, args=request, daemon=True) for request in requests]
+        for producer in producers:
+            producer.start()
+        remaining = len(producers)
+        try:
+            while remaining:
+                item = buffer.get()
+                if item is _DONE:
+                    remaining -= 1
+                    continue
+                if isinstance(item, Exception):
+                    raise item
+                chunk = run_stages(self.stages, item)
+                for lead in chunk:
+                    self.top.push(lead)
+                self.processed += len(chunk)
+                yield chunk
+        finally:
+            stop.set()
+            for producer in producers:
+                producer.join()
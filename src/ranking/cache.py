@@ -0,0 +1,280 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.data_sources.lead import accepts_batch
+from src.enrichment.geo import id_hash, _mix64, _FNV_OFFSET, _FNV_PRIME, _MASK
+from src.ranking.scorer import LeadScorer
+
+# Profile fields that LeadScorer reads; nothing else can change its scores
+SCORED_FIELDS = ("title", "company", "location", "company_hq", "source", "has_recent_paper")
+
+# Scorer attributes that make up its configuration
+CONFIG_ATTRS = (
+    "WEIGHTS", "PARTIAL_POINTS", "CAP", "HUBS", "HIGH_INTENT_ROLES", "MEDIUM_INTENT_ROLES",
+    "FUNDED_COMPANIES", "TECH_COMPANIES"
+)
+
+def _field_text(profile: Dict[str, Any], field: str) -> str:
+    value = profile.get(field)
+    if field == "has_recent_paper":
+        return "1" if value and not pd.isna(value) else ""
+    return "" if value is None or (isinstance(value, float) and np.isnan(value)) else str(value)
+
+
+def _combine(field_hashes: List[int]) -> int:
+    h = _FNV_OFFSET
+    for field_hash in field_hashes:
+        h = ((h ^ field_hash) * _FNV_PRIME) & _MASK
+    return _mix64(h)
+
+
+def scored_fields(scorer: LeadScorer) -> Tuple[str, ...]:
+    """Profile fields a scorer reads, e.g. every field named by a RuleSet's tiers."""
+    return tuple(scorer.fields()) if hasattr(scorer, "fields") else SCORED_FIELDS
+
+
+def profile_fingerprint(profile: Dict[str, Any], fields: Iterable[str] = SCORED_FIELDS) -> int:
+    """64-bit fingerprint of the `fields` a score depends on."""
+    return _combine([id_hash(_field_text(profile, field)) for field in fields])
+
+
+def frame_fingerprints(df: pd.DataFrame, fields: Iterable[str] = SCORED_FIELDS) -> np.ndarray:
+    """
+    `profile_fingerprint` for every row of `df`.
+
+    Each field is hashed once per distinct value and the per-field hashes are
+    combined with NumPy, so cost is dominated by factorizing the columns.
+    """
+    h = np.full(len(df), _FNV_OFFSET, dtype=np.uint64)
+    prime = np.uint64(_FNV_PRIME)
+    for field in fields:
+        if field not in df.columns:
+            field_hash = np.full(len(df), id_hash(""), dtype=np.uint64)
+        else:
+            if field == "has_recent_paper":
+                values = pd.Series(np.where(df[field].fillna(False).astype(bool), "1", ""), index=df.index)
+            else:
+                values = df[field]
+            codes, uniques = pd.factorize(values)
+            texts = ["" if pd.isna(value) else str(value) for value in uniques] + [""]  # code -1 = missing
+            field_hash = np.array([id_hash(text) for text in texts], dtype=np.uint64)[codes]
+        h = (h ^ field_hash) * prime
+    h = (h ^ (h >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    h = (h ^ (h >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return h ^ (h >> np.uint64(31))
+
+
+def scorer_fingerprint(scorer: LeadScorer) -> str:
+    """Fingerprint of a scorer's weights and keyword/company lists."""
+    if hasattr(scorer, "fingerprint"):
+        # e.g. a RuleSet loaded from a rules file
+        return scorer.fingerprint()
+    config = {}
+    for attr in CONFIG_ATTRS:
+        value = getattr(scorer, attr)
+        config[attr] = value if isinstance(value, (dict, int, float)) else sorted(value)
+    return hashlib.sha1(json.dumps(config, sort_keys=True).encode()).hexdigest()[:16]
+
+
+class ScoreCache:
+    """
+    LRU cache of (score, score_flags) keyed on (scorer-config fingerprint,
+    profile fingerprint).
+
+    Every configuration shares one `max_entries` bound, so toggling between
+    rule sets keeps each one's scores warm and several scorers can share a
+    cache, or its SQLite file at `path`. Only entries falling off the
+    least-recently-used end are dropped. On disk, rows are ordered by when
+    they were last written or read back; once a put takes the table past
+    `max_disk_entries`, the oldest are deleted down to 90% of it, so puts
+    in between cost only their own rows.
+    """
+
+    def __init__(self, max_entries: int = 100_000, path: Optional[str] = None,
+                 max_disk_entries: int = 1_000_000):
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._entries: "OrderedDict[Tuple[str, int], Tuple[int, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        if path:
+            if os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            with self._conn:
+                columns = [row[1] for row in self._conn.execute("PRAGMA table_info(scores)")]
+                if columns and "used" not in columns:
+                    # Older caches had no recency column; they are cheap to rebuild
+                    self._conn.execute("DROP TABLE scores")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS scores ("
+                    "fingerprint INTEGER NOT NULL, config TEXT NOT NULL, score INTEGER NOT NULL, "
+                    "flags INTEGER NOT NULL, used REAL NOT NULL, PRIMARY KEY (fingerprint, config))"
+                )
+                self._conn.execute("CREATE INDEX IF NOT EXISTS scores_used ON scores (used)")
+                self._disk_rows = self._conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _signed(fingerprint: int) -> int:
+        # SQLite integers are signed 64-bit
+        return fingerprint - (1 << 64) if fingerprint >= 1 << 63 else fingerprint
+
+    def get_many(self, config: str, fingerprints: Iterable[int]) -> Dict[int, Tuple[int, int]]:
+        found = {}
+        missing = []
+        with self._lock:
+            for fingerprint in fingerprints:
+                entry = self._entries.get((config, fingerprint))
+                if entry is None:
+                    missing.append(fingerprint)
+                else:
+                    self._entries.move_to_end((config, fingerprint))
+                    found[fingerprint] = entry
+        if missing and self._conn:
+            from_disk = {}
+            with self._lock, self._conn:
+                for start in range(0, len(missing), 500):
+                    batch = [self._signed(f) for f in missing[start:start + 500]]
+                    placeholders = ", ".join("?" * len(batch))
+                    rows = self._conn.execute(
+                        f"SELECT fingerprint, score, flags FROM scores WHERE config = ? "
+                        f"AND fingerprint IN ({placeholders})",
+                        [config, *batch],
+                    )
+                    from_disk.update((fp % (1 << 64), (score, flags)) for fp, score, flags in rows)
+                    self._conn.execute(
+                        f"UPDATE scores SET used = ? WHERE config = ? AND fingerprint IN ({placeholders})",
+                        [time.time(), config, *batch],
+                    )
+            self._remember(config, from_disk.items())
+            found.update(from_disk)
+        return found
+
+    def put_many(self, config: str, items: List[Tuple[int, Tuple[int, int]]]):
+        self._remember(config, items)
+        if self._conn:
+            now = time.time()
+            rows = [(score, flags, now, self._signed(fp), config) for fp, (score, flags) in items]
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "UPDATE scores SET score = ?, flags = ?, used = ? WHERE fingerprint = ? AND config = ?", rows
+                )
+                # Existing rows were just updated, so this counts exactly the new ones
+                inserted = self._conn.executemany(
+                    "INSERT OR IGNORE INTO scores (score, flags, used, fingerprint, config) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                ).rowcount
+                self._disk_rows += inserted
+                if self._disk_rows > self.max_disk_entries:
+                    # Other caches may share the file; recount before trimming
+                    self._disk_rows = self._conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+                    excess = self._disk_rows - self.max_disk_entries * 9 // 10
+                    if self._disk_rows > self.max_disk_entries and excess > 0:
+                        self._disk_rows -= self._conn.execute(
+                            "DELETE FROM scores WHERE rowid IN (SELECT rowid FROM scores ORDER BY used LIMIT ?)",
+                            (excess,),
+                        ).rowcount
+
+    def _remember(self, config: str, items):
+        with self._lock:
+            for fingerprint, entry in items:
+                self._entries[config, fingerprint] = entry
+                self._entries.move_to_end((config, fingerprint))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class CachedScorer:
+    """
+    LeadScorer (or RuleSet) front-end that memoizes scores in a ScoreCache.
+
+    The scorer configuration is re-fingerprinted on every call, so editing
+    `WEIGHTS` or a keyword list takes effect immediately without manual
+    cache clearing.
+    """
+
+    def __init__(self, scorer: Optional[LeadScorer] = None, cache: Optional[ScoreCache] = None):
+        self.scorer = scorer or LeadScorer()
+        self.cache = cache if cache is not None else ScoreCache()
+        self.hits = 0
+        self.misses = 0
+
+    def score_profile(self, profile: Dict[str, Any], reasons: bool = True) -> Dict[str, Any]:
+        config = scorer_fingerprint(self.scorer)
+        fingerprint = profile_fingerprint(profile, scored_fields(self.scorer))
+        entry = self.cache.get_many(config, [fingerprint]).get(fingerprint)
+        if entry is None:
+            self.misses += 1
+            profile = self.scorer.score_profile(profile, reasons=reasons)
+            self.cache.put_many(config, [(fingerprint, (profile["score"], profile["score_flags"]))])
+        else:
+            self.hits += 1
+            profile["score"], profile["score_flags"] = entry
+            if reasons:
+                profile["score_reasons"] = self.scorer.describe(profile["score_flags"], profile)
+        return profile
+
+    def describe(self, flags: int, profile: Dict[str, Any]) -> str:
+        return self.scorer.describe(flags, profile)
+
+    def reason_masks(self) -> Dict[str, int]:
+        return self.scorer.reason_masks()
+
+    def render_reasons(self, df: pd.DataFrame) -> pd.Series:
+        return self.scorer.render_reasons(df)
+
+    def weights(self) -> Dict[str, int]:
+        return self.scorer.weights()
+
+    def rescore(self, df: pd.DataFrame) -> pd.DataFrame:
+        return self.scorer.rescore(df)
+
+    @accepts_batch
+    def score_frame(self, df: pd.DataFrame, reasons: bool = True) -> pd.DataFrame:
+        """Batch scoring; only rows with unseen fingerprints reach the scorer."""
+        config = scorer_fingerprint(self.scorer)
+        codes, unique = pd.factorize(frame_fingerprints(df, scored_fields(self.scorer)))
+        found = self.cache.get_many(config, [int(fp) for fp in unique])
+
+        unique_scores = np.zeros(len(unique), dtype=np.int64)
+        unique_flags = np.zeros(len(unique), dtype=np.int64)
+        known = np.zeros(len(unique), dtype=bool)
+        for j, fp in enumerate(unique):
+            entry = found.get(int(fp))
+            if entry is not None:
+                known[j] = True
+                unique_scores[j], unique_flags[j] = entry
+
+        # Score one representative row per unseen fingerprint
+        unseen = np.flatnonzero(~known)
+        if len(unseen):
+            first_row = np.full(len(unique), -1)
+            first_row[codes[::-1]] = np.arange(len(codes))[::-1]
+            scored = self.scorer.score_frame(df.iloc[first_row[unseen]], reasons=False)
+            unique_scores[unseen] = scored["score"].to_numpy()
+            unique_flags[unseen] = scored["score_flags"].to_numpy()
+            self.cache.put_many(config, [
+                (int(unique[j]), (int(unique_scores[j]), int(unique_flags[j]))) for j in unseen
+            ])
+
+        hit = known[codes]
+        self.hits += int(hit.sum())
+        self.misses += int((~hit).sum())
+        result = df.copy()
+        result["score"] = unique_scores[codes]
+        result["score_flags"] = unique_flags[codes]
+        if reasons:
+            result["score_reasons"] = self.render_reasons(result)
+        return result
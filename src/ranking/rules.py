@@ -0,0 +1,264 @@
+import copy
+import hashlib
+import itertools
+import json
+import os
+import re
+import string
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.data_sources.lead import accepts_batch
+from src.ranking.scorer import LeadScorer, rescore_flags
+
+
+def default_rules() -> Dict[str, Any]:
+    """The hardcoded LeadScorer behaviour expressed as a rule definition."""
+    s = LeadScorer
+    w = s.WEIGHTS
+    return {
+        "cap": s.CAP,
+        "criteria": [
+            {"name": "role_fit", "tiers": [
+                {"field": "title", "keywords": list(s.HIGH_INTENT_ROLES), "points": w["role_fit"],
+                 "reason": "Role Fit: '{title}' matches key terms (+30)"},
+                {"field": "title", "keywords": list(s.MEDIUM_INTENT_ROLES), "points": s.PARTIAL_POINTS["role_fit"],
+                 "reason": "Role Fit: '{title}' is relevant (+15)"},
+            ]},
+            {"name": "scientific_intent", "tiers": [
+                {"field": "source", "in": ["PubMed"], "points": w["scientific_intent"],
+                 "reason": "Scientific Intent: Recent Publication (+40)"},
+                {"field": "has_recent_paper", "truthy": True, "points": w["scientific_intent"],
+                 "reason": "Scientific Intent: Recent Publication (+40)"},
+            ]},
+            {"name": "company_intent", "tiers": [
+                {"field": "company", "in": sorted(s.FUNDED_COMPANIES), "points": w["company_intent"],
+                 "reason": "Company Intent: {company} recently funded (+20)"},
+            ]},
+            {"name": "location", "tiers": [
+                {"field": "location", "keywords": list(s.HUBS), "points": w["location"],
+                 "reason": "Location: Located in hub '{location}' (+10)"},
+                {"field": "company_hq", "keywords": list(s.HUBS), "points": s.PARTIAL_POINTS["location"],
+                 "reason": "Location: HQ in hub (+5)"},
+            ]},
+            {"name": "technographic", "tiers": [
+                {"field": "company", "in": sorted(s.TECH_COMPANIES), "points": w["technographic"],
+                 "reason": "Technographic: Uses similar tech (+15)"},
+            ]},
+        ],
+    }
+
+
+class Tier:
+    """One compiled matching rule: a field test, its points and reason template."""
+
+    def __init__(self, spec: Dict[str, Any]):
+        if "field" not in spec or "points" not in spec:
+            raise ValueError(f"Rule tier needs 'field' and 'points': {spec}")
+        matchers = [key for key in ("keywords", "in", "truthy") if key in spec]
+        if len(matchers) != 1:
+            raise ValueError(f"Rule tier needs exactly one of keywords/in/truthy: {spec}")
+
+        self.field = spec["field"]
+        self.points = int(spec["points"])
+        self.kind = matchers[0]
+        self.pattern = None
+        self.members = frozenset()
+        if self.kind == "keywords":
+            # One alternation over all keywords, matched against lowercased text
+            self.pattern = re.compile("|".join(re.escape(k.lower()) for k in spec["keywords"])) if spec["keywords"] else None
+        elif self.kind == "in":
+            self.members = frozenset(spec["in"])
+
+        self.reason = spec.get("reason", "")
+        self.reason_fields = sorted({name for _, name, _, _ in string.Formatter().parse(self.reason) if name})
+
+    def matches(self, value: Any) -> bool:
+        if self.kind == "truthy":
+            return bool(value)
+        if self.kind == "in":
+            return value in self.members
+        return self.pattern is not None and self.pattern.search(str(value).lower()) is not None
+
+    def render(self, profile: Dict[str, Any]) -> str:
+        if not self.reason_fields:
+            return self.reason
+        return self.reason.format(**{name: profile.get(name, "") for name in self.reason_fields})
+
+
+class RuleSet:
+    """
+    Compiled scoring rules with the same interface as LeadScorer.
+
+    Criteria are summed; within a criterion the first matching tier wins.
+    Keyword tiers compile to a single regex, set tiers to a frozenset, and
+    reason templates are parsed once so constant reasons skip formatting.
+    Every tier owns one bit of `score_flags`, numbered in file order, so the
+    default rules use the same bits as `scorer.Reason`.
+    """
+
+    def __init__(self, definition: Dict[str, Any]):
+        self.definition = definition
+        self.cap = definition.get("cap", 100)
+        self.criteria: List[Tuple[str, List[Tier]]] = []
+        for criterion in definition.get("criteria", []):
+            if "name" not in criterion or not criterion.get("tiers"):
+                raise ValueError(f"Criterion needs a 'name' and at least one tier: {criterion}")
+            self.criteria.append((criterion["name"], [Tier(tier) for tier in criterion["tiers"]]))
+        # First score_flags bit of each criterion
+        self.offsets = list(itertools.accumulate([0] + [len(tiers) for _, tiers in self.criteria[:-1]]))
+        self.flag_dtype = np.min_scalar_type((1 << sum(len(tiers) for _, tiers in self.criteria)) - 1)
+
+    @classmethod
+    def load(cls, path: str) -> "RuleSet":
+        """Read a rule definition from a .json or .yaml/.yml file."""
+        with open(path) as handle:
+            if os.path.splitext(path)[1].lower() in (".yaml", ".yml"):
+                try:
+                    import yaml
+                except ImportError as exc:
+                    raise ImportError("YAML scoring rules require PyYAML (pip install pyyaml)") from exc
+                return cls(yaml.safe_load(handle))
+            return cls(json.load(handle))
+
+    def fingerprint(self) -> str:
+        """Identifies this configuration for score caching."""
+        return hashlib.sha1(json.dumps(self.definition, sort_keys=True).encode()).hexdigest()[:16]
+
+    def fields(self) -> List[str]:
+        """Profile fields the rules read, in tier tests or reason text."""
+        return sorted({field for _, tiers in self.criteria for tier in tiers
+                       for field in [tier.field, *tier.reason_fields]})
+
+    def score_profile(self, profile: Dict[str, Any], reasons: bool = True) -> Dict[str, Any]:
+        score = 0
+        flags = 0
+        for offset, (_, tiers) in zip(self.offsets, self.criteria):
+            for t, tier in enumerate(tiers):
+                if tier.matches(profile.get(tier.field, "")):
+                    score += tier.points
+                    flags |= 1 << (offset + t)
+                    break
+        profile["score"] = min(score, self.cap)
+        profile["score_flags"] = flags
+        if reasons:
+            profile["score_reasons"] = self.describe(flags, profile)
+        return profile
+
+    def _chosen(self, flags: int):
+        """(criterion index, tier) pairs whose bits are set in `flags`."""
+        for c, (offset, (_, tiers)) in enumerate(zip(self.offsets, self.criteria)):
+            for t, tier in enumerate(tiers):
+                if flags >> (offset + t) & 1:
+                    yield c, tier
+                    break
+
+    def describe(self, flags: int, profile: Dict[str, Any]) -> str:
+        """Render the reasons text for a `score_flags` value."""
+        return "; ".join(tier.render(profile) for _, tier in self._chosen(int(flags)))
+
+    def reason_masks(self) -> Dict[str, int]:
+        """`score_flags` bits each criterion can set, for filtering by signal."""
+        return {name: ((1 << len(tiers)) - 1) << offset for offset, (name, tiers) in zip(self.offsets, self.criteria)}
+
+    def tier_points(self) -> np.ndarray:
+        """Points for each `score_flags` bit, in bit order."""
+        return np.array([tier.points for _, tiers in self.criteria for tier in tiers], dtype=np.int64)
+
+    def weights(self) -> Dict[str, int]:
+        """Points of each criterion's top tier."""
+        return {name: tiers[0].points for name, tiers in self.criteria}
+
+    def with_weights(self, weights: Dict[str, int]) -> "RuleSet":
+        """
+        The same rules with criterion `name`'s top tier worth `weights[name]`
+        points. Lower tiers keep their proportion to the top tier, and
+        "(+N)" in reason texts follows the new points. Matching is unchanged,
+        so `score_flags` from either rule set can be rescored with the other.
+        """
+        unknown = set(weights) - {name for name, _ in self.criteria}
+        if unknown:
+            raise ValueError(f"Unknown criteria: {', '.join(sorted(unknown))}")
+        definition = copy.deepcopy(self.definition)
+        for criterion in definition["criteria"]:
+            if criterion["name"] not in weights:
+                continue
+            top, new = criterion["tiers"][0]["points"], int(weights[criterion["name"]])
+            for tier in criterion["tiers"]:
+                points = round(tier["points"] * new / top) if top else new
+                if "reason" in tier:
+                    tier["reason"] = tier["reason"].replace(f"(+{tier['points']})", f"(+{points})")
+                tier["points"] = points
+        return RuleSet(definition)
+
+    def rescore(self, df: pd.DataFrame) -> pd.DataFrame:
+        """`df` with `score` recomputed from its `score_flags` under the current points."""
+        return df.assign(score=rescore_flags(df["score_flags"].to_numpy(), self.tier_points(), self.cap))
+
+    @accepts_batch
+    def score_frame(self, df: pd.DataFrame, reasons: bool = True) -> pd.DataFrame:
+        """Columnwise scoring; each tier is tested once per distinct field value."""
+        n = len(df)
+        columns: Dict[str, Tuple[np.ndarray, Any]] = {}
+
+        def factorized(field: str):
+            if field not in columns:
+                columns[field] = pd.factorize(LeadScorer._text_column(df, field))
+            return columns[field]
+
+        score = np.zeros(n, dtype=np.int64)
+        flags = np.zeros(n, dtype=self.flag_dtype)
+        for offset, (_, tiers) in zip(self.offsets, self.criteria):
+            chosen = np.zeros(n, dtype=bool)
+            for t, tier in enumerate(tiers):
+                if tier.kind == "truthy":
+                    if tier.field in df.columns:
+                        hit = df[tier.field].fillna(False).astype(bool).to_numpy()
+                    else:
+                        hit = np.zeros(n, dtype=bool)
+                else:
+                    codes, uniques = factorized(tier.field)
+                    hit = np.fromiter((tier.matches(u) for u in uniques), dtype=bool, count=len(uniques))[codes]
+                newly = hit & ~chosen
+                chosen |= newly
+                score += np.where(newly, tier.points, 0)
+                flags |= newly.astype(self.flag_dtype) << self.flag_dtype.type(offset + t)
+
+        result = df.copy()
+        result["score"] = np.minimum(score, self.cap)
+        result["score_flags"] = flags
+        if reasons:
+            result["score_reasons"] = self.render_reasons(result)
+        return result
+
+    def render_reasons(self, df: pd.DataFrame) -> pd.Series:
+        """`score_reasons` text for the rows of a scored frame, from `score_flags`."""
+        flags = df["score_flags"].to_numpy().astype(np.uint64)
+        key, _ = pd.factorize(flags)
+        columns: Dict[str, Tuple[np.ndarray, Any]] = {}
+        # Fold in the values referenced by each tier's reason, where that tier fired
+        for offset, (_, tiers) in zip(self.offsets, self.criteria):
+            for t, tier in enumerate(tiers):
+                fired = (flags >> np.uint64(offset + t)) & np.uint64(1) == 1
+                for field in tier.reason_fields:
+                    if field not in columns:
+                        columns[field] = pd.factorize(LeadScorer._text_column(df, field))
+                    codes, uniques = columns[field]
+                    key, _ = pd.factorize(key * (len(uniques) + 2) + np.where(fired, codes + 2, 0))
+
+        # Render reasons once per distinct (tiers, referenced values) combination
+        first = np.unique(key, return_index=True)[1]
+        text = np.empty(len(first), dtype=object)
+        for k, row in enumerate(first):
+            values = {field: uniques[codes[row]] for field, (codes, uniques) in columns.items()}
+            text[k] = self.describe(flags[row], values)
+        return pd.Series(text[key], index=df.index, name="score_reasons")
+
+
+def load_scorer(path: Optional[str] = None):
+    """RuleSet from `path` if it exists, otherwise the built-in LeadScorer."""
+    if path and os.path.exists(path):
+        return RuleSet.load(path)
+    return LeadScorer()
@@ -1,4 +1,74 @@
-from typing import Dict
+import copy
+import enum
+import re
+from typing import Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+from src.data_sources.lead import accepts_batch
+
+
+def _keyword_pattern(keywords: Iterable[str]) -> "re.Pattern":
+    """Compile a single alternation matching any (lowercased) keyword."""
+    return re.compile("|".join(re.escape(keyword.lower()) for keyword in keywords))
+
+
+class Reason(enum.IntFlag):
+    """
+    Bits of `score_flags`: one per scoring criterion that fired, with partial
+    credit tiers as their own bits. Reasons text is rendered from these.
+    """
+    ROLE_FIT = 1
+    ROLE_RELEVANT = 2
+    PUBLICATION = 4
+    RECENT_PAPER = 8
+    FUNDED = 16
+    HUB = 32
+    HQ_IN_HUB = 64
+    TECHNOGRAPHIC = 128
+
+
+# Criterion name (as in WEIGHTS) -> every bit it can set
+CRITERION_FLAGS = {
+    "role_fit": Reason.ROLE_FIT | Reason.ROLE_RELEVANT,
+    "scientific_intent": Reason.PUBLICATION | Reason.RECENT_PAPER,
+    "company_intent": Reason.FUNDED,
+    "location": Reason.HUB | Reason.HQ_IN_HUB,
+    "technographic": Reason.TECHNOGRAPHIC,
+}
+
+
+def tier_matrix(flags, tiers: int) -> np.ndarray:
+    """
+    Unpack `score_flags` into an (n, tiers) 0/1 uint8 matrix: the per-lead
+    feature matrix, one column per tier bit.
+    """
+    flags = np.ascontiguousarray(flags)
+    as_bytes = flags.astype(flags.dtype.newbyteorder("<"), copy=False).view(np.uint8).reshape(len(flags), -1)
+    return np.unpackbits(as_bytes, axis=1, count=tiers, bitorder="little")
+
+
+def rescore_flags(flags, points, cap: int = 100) -> np.ndarray:
+    """
+    Scores for `score_flags` under per-tier `points`: min(F @ points, cap)
+    with F the tier matrix.
+
+    Which tiers fired does not depend on the points, so a weights-only
+    change needs no re-matching. Leads share few flag combinations, so the
+    product is taken once per possible (narrow dtypes) or distinct value and
+    gathered back.
+    """
+    points = np.asarray(points, dtype=np.int64)
+    flags = np.asarray(flags)
+    if flags.dtype.kind == "u" and flags.dtype.itemsize <= 2:
+        # Narrow flags: score every possible value and index straight into the table
+        table = np.minimum(tier_matrix(np.arange(1 << (8 * flags.dtype.itemsize), dtype=flags.dtype),
+                                       len(points)) @ points, cap)
+        return table[flags]
+    codes, uniques = pd.factorize(flags)
+    return np.minimum(tier_matrix(uniques, len(points)) @ points, cap)[codes]
+
 
 class LeadScorer:
     """
@@ -13,17 +83,29 @@ class LeadScorer:
         "scientific_intent": 40
     }
     
+    # Partial credit tiers; `with_weights` keeps their proportion to the criterion's weight
+    PARTIAL_POINTS = {"role_fit": 15, "location": 5}
+
+    CAP = 100
+
     HUBS = ["Boston", "Cambridge", "San Francisco", "Bay Area", "Basel", "London", "Oxford"]
     
     HIGH_INTENT_ROLES = ["Toxicology", "Safety", "Hepatic", "3D", "Liver", "Preclinical"]
     MEDIUM_INTENT_ROLES = ["Scientist", "Investigator"]
+
+    # Mocked funding / tech-stack data
+    FUNDED_COMPANIES = frozenset(["StartUp Bio", "Moderna", "BioTech Inc"])
+    TECH_COMPANIES = frozenset(["Roche", "Novartis", "Genentech"])
     
-    def score_profile(self, profile: Dict[str, str]) -> Dict[str, str]:
+    def score_profile(self, profile: Dict[str, str], reasons: bool = True) -> Dict[str, str]:
         """
         Calculate the Propensity to Buy score (0-100).
+
+        Sets `score` and the `score_flags` bitmask of fired criteria (see
+        `Reason`); `score_reasons` text only when `reasons` is true.
         """
         score = 0
-        reasons = []
+        flags = 0
         
         title = profile.get("title", "")
         company = profile.get("company", "")
@@ -34,47 +116,231 @@ class LeadScorer:
         # Check for high intent keywords
         if any(keyword.lower() in title.lower() for keyword in self.HIGH_INTENT_ROLES):
             score += self.WEIGHTS["role_fit"]
-            reasons.append(f"Role Fit: '{title}' matches key terms (+30)")
+            flags |= Reason.ROLE_FIT
         elif any(keyword.lower() in title.lower() for keyword in self.MEDIUM_INTENT_ROLES):
-            score += 15 # Partial credit
-            reasons.append(f"Role Fit: '{title}' is relevant (+15)")
+            score += self.PARTIAL_POINTS["role_fit"] # Partial credit
+            flags |= Reason.ROLE_RELEVANT
             
         # 2. Scientific Intent (+40)
         # If source is PubMed or they have recent papers (mocked via source for now)
         if source == "PubMed":
             score += self.WEIGHTS["scientific_intent"]
-            reasons.append("Scientific Intent: Recent Publication (+40)")
+            flags |= Reason.PUBLICATION
         # For LinkedIn profiles, we might simulate checking a database
         elif profile.get("has_recent_paper", False):
              score += self.WEIGHTS["scientific_intent"]
-             reasons.append("Scientific Intent: Recent Publication (+40)")
+             flags |= Reason.RECENT_PAPER
 
         # 3. Company Intent (+20)
         # Mocking funding data
-        funded_companies = ["StartUp Bio", "Moderna", "BioTech Inc"]
-        if company in funded_companies:
+        if company in self.FUNDED_COMPANIES:
             score += self.WEIGHTS["company_intent"]
-            reasons.append(f"Company Intent: {company} recently funded (+20)")
+            flags |= Reason.FUNDED
             
         # 4. Location (+10)
         if any(hub.lower() in location.lower() for hub in self.HUBS):
             score += self.WEIGHTS["location"]
-            reasons.append(f"Location: Located in hub '{location}' (+10)")
+            flags |= Reason.HUB
         elif any(hub.lower() in profile.get("company_hq", "").lower() for hub in self.HUBS):
-            score += 5 # Partial for HQ being in hub
-            reasons.append(f"Location: HQ in hub (+5)")
+            score += self.PARTIAL_POINTS["location"] # Partial for HQ being in hub
+            flags |= Reason.HQ_IN_HUB
 
         # 5. Technographic (+15)
         # Mocking tech stack
-        tech_companies = ["Roche", "Novartis", "Genentech"]
-        if company in tech_companies:
+        if company in self.TECH_COMPANIES:
              score += self.WEIGHTS["technographic"]
-             reasons.append("Technographic: Uses similar tech (+15)")
+             flags |= Reason.TECHNOGRAPHIC
 
         # Cap at 100
-        score = min(score, 100)
+        score = min(score, self.CAP)
         
         profile["score"] = score
-        profile["score_reasons"] = "; ".join(reasons)
+        profile["score_flags"] = int(flags)
+        if reasons:
+            profile["score_reasons"] = self.describe(flags, profile)
         
         return profile
+
+    def describe(self, flags: int, profile: Dict[str, str]) -> str:
+        """Render the reasons text for a `score_flags` value."""
+        return self._format_reasons(
+            flags, profile.get("title", ""), profile.get("company", ""), profile.get("location", ""),
+            self._points()
+        )
+
+    def reason_masks(self) -> Dict[str, int]:
+        """`score_flags` bits each criterion can set, for filtering by signal."""
+        return {name: int(mask) for name, mask in CRITERION_FLAGS.items()}
+
+    @accepts_batch
+    def score_frame(self, df: pd.DataFrame, reasons: bool = True) -> pd.DataFrame:
+        """
+        Batch version of `score_profile` over a whole DataFrame.
+
+        Produces the same `score`, `score_flags` and `score_reasons` values as
+        scoring each row individually, computed columnwise. Missing values are
+        treated like absent keys. Returns a copy of `df` with the columns added;
+        with `reasons=False` the text is left for `render_reasons`.
+        """
+        n = len(df)
+        title_codes, titles = pd.factorize(self._text_column(df, "title"))
+        company_codes, companies = pd.factorize(self._text_column(df, "company"))
+        location_codes, locations = pd.factorize(self._text_column(df, "location"))
+        hq_codes, hqs = pd.factorize(self._text_column(df, "company_hq"))
+        source = self._text_column(df, "source")
+
+        high_pattern = _keyword_pattern(self.HIGH_INTENT_ROLES)
+        medium_pattern = _keyword_pattern(self.MEDIUM_INTENT_ROLES)
+        hub_pattern = _keyword_pattern(self.HUBS)
+
+        # 1. Role Fit (+30 / +15)
+        high_role = self._matches(titles, high_pattern)[title_codes]
+        medium_role = ~high_role & self._matches(titles, medium_pattern)[title_codes]
+
+        # 2. Scientific Intent (+40)
+        if "has_recent_paper" in df.columns:
+            has_paper = df["has_recent_paper"].fillna(False).astype(bool).to_numpy()
+        else:
+            has_paper = np.zeros(n, dtype=bool)
+        publication = (source == "PubMed").to_numpy(dtype=bool)
+        recent_paper = ~publication & has_paper
+
+        # 3. Company Intent (+20)
+        funded = companies.isin(list(self.FUNDED_COMPANIES))[company_codes]
+
+        # 4. Location (+10 / +5)
+        in_hub = self._matches(locations, hub_pattern)[location_codes]
+        hq_in_hub = ~in_hub & self._matches(hqs, hub_pattern)[hq_codes]
+
+        # 5. Technographic (+15)
+        tech = companies.isin(list(self.TECH_COMPANIES))[company_codes]
+
+        score = (
+            np.where(high_role, self.WEIGHTS["role_fit"], 0)
+            + np.where(medium_role, self.PARTIAL_POINTS["role_fit"], 0)
+            + np.where(publication | recent_paper, self.WEIGHTS["scientific_intent"], 0)
+            + np.where(funded, self.WEIGHTS["company_intent"], 0)
+            + np.where(in_hub, self.WEIGHTS["location"], 0)
+            + np.where(hq_in_hub, self.PARTIAL_POINTS["location"], 0)
+            + np.where(tech, self.WEIGHTS["technographic"], 0)
+        )
+        # Bit order follows `Reason`
+        fired = (high_role, medium_role, publication, recent_paper, funded, in_hub, hq_in_hub, tech)
+        flags = np.zeros(n, dtype=np.uint8)
+        for bit, hit in enumerate(fired):
+            flags |= hit.astype(np.uint8) << bit
+
+        result = df.copy()
+        result["score"] = np.minimum(score, self.CAP)
+        result["score_flags"] = flags
+        if reasons:
+            result["score_reasons"] = self.render_reasons(result)
+        return result
+
+    def tier_points(self) -> np.ndarray:
+        """Points for each `score_flags` bit, in `Reason` order."""
+        return np.array(self._points())
+
+    def _points(self) -> List[int]:
+        w, partial = self.WEIGHTS, self.PARTIAL_POINTS
+        return [
+            w["role_fit"], partial["role_fit"], w["scientific_intent"], w["scientific_intent"],
+            w["company_intent"], w["location"], partial["location"], w["technographic"],
+        ]
+
+    def weights(self) -> Dict[str, int]:
+        """Points of each criterion's top tier."""
+        return dict(self.WEIGHTS)
+
+    def with_weights(self, weights: Dict[str, int]) -> "LeadScorer":
+        """
+        A copy scoring with `weights` (criterion -> points) merged into
+        WEIGHTS. Partial credit keeps its proportion to the criterion's
+        weight, as lower tiers do in `RuleSet.with_weights`.
+        """
+        unknown = set(weights) - set(self.WEIGHTS)
+        if unknown:
+            raise ValueError(f"Unknown criteria: {', '.join(sorted(unknown))}")
+        scorer = copy.copy(self)
+        scorer.WEIGHTS = {**self.WEIGHTS, **weights}
+        scorer.PARTIAL_POINTS = {
+            name: round(points * scorer.WEIGHTS[name] / self.WEIGHTS[name]) if self.WEIGHTS[name]
+            else scorer.WEIGHTS[name]
+            for name, points in self.PARTIAL_POINTS.items()
+        }
+        return scorer
+
+    def rescore(self, df: pd.DataFrame) -> pd.DataFrame:
+        """`df` with `score` recomputed from its `score_flags` under the current weights."""
+        return df.assign(score=rescore_flags(df["score_flags"].to_numpy(), self.tier_points(), self.CAP))
+
+    def render_reasons(self, df: pd.DataFrame) -> pd.Series:
+        """
+        `score_reasons` text for the rows of a scored frame, from `score_flags`.
+
+        Reasons only vary with the fired criteria and the interpolated values,
+        so each distinct combination is formatted once and gathered back.
+        """
+        flags = df["score_flags"].to_numpy().astype(np.int64)
+        title_codes, titles = pd.factorize(self._text_column(df, "title"))
+        company_codes, companies = pd.factorize(self._text_column(df, "company"))
+        location_codes, locations = pd.factorize(self._text_column(df, "location"))
+
+        key = flags
+        for codes, uniques, mask in (
+            (title_codes, titles, Reason.ROLE_FIT | Reason.ROLE_RELEVANT),
+            (company_codes, companies, Reason.FUNDED),
+            (location_codes, locations, Reason.HUB),
+        ):
+            key, _ = pd.factorize(key * (len(uniques) + 1) + np.where(flags & mask, codes + 1, 0))
+        first = np.unique(key, return_index=True)[1]
+        points = self._points()
+        text = np.array([
+            self._format_reasons(
+                flags[i], titles[title_codes[i]], companies[company_codes[i]], locations[location_codes[i]], points
+            )
+            for i in first
+        ], dtype=object)
+        return pd.Series(text[key], index=df.index, name="score_reasons")
+
+    @staticmethod
+    def _text_column(df: pd.DataFrame, column: str) -> pd.Series:
+        """Return `column` as strings, with missing values as empty strings."""
+        if column not in df.columns:
+            return pd.Series("", index=df.index, dtype=object)
+        values = df[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Keep categoricals encoded; factorizing them is just a code remap
+            if values.isna().any():
+                if "" not in values.cat.categories:
+                    values = values.cat.add_categories([""])
+                values = values.fillna("")
+            return values
+        return values.fillna("").astype(str)
+
+    @staticmethod
+    def _matches(values, pattern: "re.Pattern") -> np.ndarray:
+        """Case-insensitive keyword test for each distinct value."""
+        return np.fromiter((pattern.search(v.lower()) is not None for v in values), dtype=bool, count=len(values))
+
+    @staticmethod
+    def _format_reasons(flags: int, title: str, company: str, location: str, p: List[int]) -> str:
+        """Render the reasons string for one combination of fired criteria, `p` being the tier points."""
+        reasons = []
+        if flags & Reason.ROLE_FIT:
+            reasons.append(f"Role Fit: '{title}' matches key terms (+{p[0]})")
+        elif flags & Reason.ROLE_RELEVANT:
+            reasons.append(f"Role Fit: '{title}' is relevant (+{p[1]})")
+        if flags & Reason.PUBLICATION:
+            reasons.append(f"Scientific Intent: Recent Publication (+{p[2]})")
+        elif flags & Reason.RECENT_PAPER:
+            reasons.append(f"Scientific Intent: Recent Publication (+{p[3]})")
+        if flags & Reason.FUNDED:
+            reasons.append(f"Company Intent: {company} recently funded (+{p[4]})")
+        if flags & Reason.HUB:
+            reasons.append(f"Location: Located in hub '{location}' (+{p[5]})")
+        elif flags & Reason.HQ_IN_HUB:
+            reasons.append(f"Location: HQ in hub (+{p[6]})")
+        if flags & Reason.TECHNOGRAPHIC:
+            reasons.append(f"Technographic: Uses similar tech (+{p[7]})")
+        return "; ".join(reasons)
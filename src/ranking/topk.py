@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+
+def top_k_positions(scores, k: int) -> np.ndarray:
+    """
+    Positions of the `k` highest scores, best first.
+
+    Uses a partial selection (O(n)) to find the cut-off score and only sorts
+    the rows above it. Ties keep their original order, so the result equals
+    the first `k` positions of a stable descending sort. Missing scores rank
+    last.
+    """
+    scores = np.asarray(scores, dtype=float)
+    scores = np.where(np.isnan(scores), -np.inf, scores)
+    n = len(scores)
+    k = max(0, min(k, n))
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+    if k < n:
+        cutoff = np.partition(scores, n - k)[n - k]
+        above = np.flatnonzero(scores > cutoff)
+        ties = np.flatnonzero(scores == cutoff)[:k - len(above)]
+        candidates = np.sort(np.concatenate([above, ties]))
+    else:
+        candidates = np.arange(n)
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def top_k(df: pd.DataFrame, k: int, by: str = "score") -> pd.DataFrame:
+    """The `k` best rows of `df` by column `by`, best first."""
+    return df.iloc[top_k_positions(df[by].to_numpy(dtype=float, na_value=np.nan), k)]
+
+
+def rank_page(df: pd.DataFrame, page: int, page_size: int, by: str = "score") -> pd.DataFrame:
+    """
+    One page of `df` in descending `by` order, without sorting the whole frame.
+
+    Page numbers start at 0; a page past the end is empty.
+    """
+    start = max(page, 0) * page_size
+    return top_k(df, start + page_size, by=by).iloc[start:]
+
+
+def page_count(rows: int, page_size: int) -> int:
+    """Pages needed to show `rows` rows; at least 1 so an empty view still has a page."""
+    return max(1, -(-rows // page_size))
+
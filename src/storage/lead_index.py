@@ -0,0 +1,337 @@
+import re
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.pipeline.instrumentation import timed
+
+# Lead text fields the index tokenizes
+INDEXED_FIELDS = ("location", "title", "company", "paper_title")
+
+_WORD = re.compile(r"[a-z0-9]+")
+_QUERY_PART = re.compile(r"\(|\)|[^\s()]+")
+_EMPTY = np.empty(0, dtype=np.intp)
+
+# Above this share of the pool, unions and intersections go through a row bitmap
+_DENSE_SHARE = 1 / 16
+
+
+def tokenize(text) -> List[str]:
+    """Lower-case alphanumeric words of `text`; nothing for missing values."""
+    if text is None or (isinstance(text, float) and np.isnan(text)):
+        return []
+    return _WORD.findall(str(text).lower())
+
+
+def field_query(field: str, text: str) -> str:
+    """Query matching rows whose `field` has a word starting with each word of `text`."""
+    return " ".join(f"{field}:{word}*" for word in tokenize(text))
+
+
+def parse_query(query: str, fields: Sequence[str] = INDEXED_FIELDS):
+    """
+    Parse `query` into ("and", [...]), ("or", [...]) and
+    ("term", field, word, prefix) nodes, or None when it has no terms.
+
+    Terms are words, optionally written `field:word` to search one field
+    and ending in `*` to match word prefixes; unqualified words search all
+    `fields`. Adjacent terms are ANDed; `AND`, `OR` (binding looser) and
+    parentheses work as usual. A term holding several words, such as
+    `location:new-york`, needs all of them.
+    """
+    parts = _QUERY_PART.findall(query)
+    pos = 0
+
+    def parse_or():
+        nonlocal pos
+        children = [parse_and()]
+        while pos < len(parts) and parts[pos] == "OR":
+            pos += 1
+            children.append(parse_and())
+        children = [child for child in children if child is not None]
+        if not children:
+            return None
+        return children[0] if len(children) == 1 else ("or", children)
+
+    def parse_and():
+        nonlocal pos
+        children = []
+        while pos < len(parts) and parts[pos] not in (")", "OR"):
+            part = parts[pos]
+            pos += 1
+            if part == "AND":
+                continue
+            if part == "(":
+                children.append(parse_or())
+                if pos >= len(parts) or parts[pos] != ")":
+                    raise ValueError("Unbalanced parentheses in query")
+                pos += 1
+            else:
+                children.extend(_terms(part, fields))
+        children = [child for child in children if child is not None]
+        if not children:
+            return None
+        return children[0] if len(children) == 1 else ("and", children)
+
+    tree = parse_or()
+    if pos < len(parts):
+        raise ValueError("Unbalanced parentheses in query")
+    return tree
+
+
+def _terms(part: str, fields: Sequence[str]) -> List[tuple]:
+    field, _, text = part.partition(":")
+    if not text or field.lower() not in fields:
+        field, text = None, part
+    else:
+        field = field.lower()
+    words = tokenize(text)
+    prefix = text.endswith("*")
+    return [("term", field, word, prefix and i == len(words) - 1) for i, word in enumerate(words)]
+
+
+class LeadIndex:
+    """
+    In-memory inverted index over lead text fields, with a score column.
+
+    Each (field, word) pair maps to a posting list: the sorted positions of
+    the rows whose field contains the word. Queries combine posting lists
+    with AND/OR and then apply a score range, so their cost follows the
+    size of the lists involved, not the number of leads.
+
+    Rows are numbered in the order they are added. `add` only tokenizes the
+    new rows, once per distinct value, and appends to the posting lists.
+    With `key` columns, adding a row whose key is already indexed replaces
+    the old row. Replaced and removed rows stay in the lists, marked dead,
+    until `compact` renumbers the live rows. Compaction runs on its own
+    once dead rows outnumber live ones.
+    """
+
+    def __init__(self, fields: Sequence[str] = INDEXED_FIELDS, key: Optional[Sequence[str]] = None):
+        self.fields = tuple(fields)
+        self.key = tuple(key) if key else None
+        self.keys: List[Hashable] = []
+        self._positions: Dict[Hashable, int] = {}
+        self._chunks: Dict[Tuple[str, str], List[np.ndarray]] = defaultdict(list)
+        self._vocabulary: Dict[str, List[str]] = {}
+        self._scores = np.empty(0, dtype=float)
+        self._alive = np.empty(0, dtype=bool)
+        self._size = 0
+        self._dead = 0
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, fields: Sequence[str] = INDEXED_FIELDS,
+                   key: Optional[Sequence[str]] = None) -> "LeadIndex":
+        """Index `df`; without `key`, positions are `df`'s row positions."""
+        index = cls(fields, key)
+        index.add(df)
+        return index
+
+    def __len__(self) -> int:
+        return self._size - self._dead
+
+    @timed()
+    def add(self, df: pd.DataFrame) -> np.ndarray:
+        """Index the rows of `df`; returns their positions."""
+        with self._lock:
+            start, n = self._size, len(df)
+            if not n:
+                return np.arange(start, start)
+            self._reserve(start + n)
+            if "score" in df.columns:
+                self._scores[start:start + n] = df["score"].to_numpy(dtype=float, na_value=np.nan)
+            else:
+                self._scores[start:start + n] = np.nan
+            self._alive[start:start + n] = True
+            self._size += n
+            if self.key is not None:
+                keys = list(zip(*(df[column].astype(str) for column in self.key)))
+                for position, key in enumerate(keys, start):
+                    previous = self._positions.get(key)
+                    if previous is not None:
+                        self._kill(previous)
+                    self._positions[key] = position
+                self.keys.extend(keys)
+            for field in self.fields:
+                if field in df.columns:
+                    self._index_column(field, df[field], start)
+            self._maybe_compact()
+            return np.arange(start, start + n)
+
+    def remove(self, keys: Iterable[Hashable]) -> int:
+        """Drop the rows with these keys (tuples of the `key` columns, as strings)."""
+        removed = 0
+        with self._lock:
+            for key in keys:
+                position = self._positions.pop(key, None)
+                if position is not None:
+                    self._kill(position)
+                    removed += 1
+            self._maybe_compact()
+        return removed
+
+    def positions(self, query: Optional[str] = None, min_score: Optional[float] = None,
+                  max_score: Optional[float] = None, scores: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Sorted positions of the live rows matching `query` (see `parse_query`)
+        with `min_score <= score <= max_score`. Range bounds are optional;
+        with either set, rows without a score never match. `scores`, one per
+        position, replaces the indexed scores for the range test (e.g. the
+        same rows rescored under what-if weights).
+        """
+        tree = parse_query(query, self.fields) if query else None
+        with self._lock:
+            all_scores = self._scores[:self._size] if scores is None else np.asarray(scores, dtype=float)
+            if tree is None:
+                mask = self._alive[:self._size].copy()
+                if min_score is not None:
+                    mask &= all_scores >= min_score
+                if max_score is not None:
+                    mask &= all_scores <= max_score
+                return np.flatnonzero(mask)
+            rows = self._evaluate(tree)
+            if self._dead:
+                rows = rows[self._alive[rows]]
+            if min_score is not None or max_score is not None:
+                scores = all_scores[rows]
+                keep = np.ones(len(rows), dtype=bool)
+                if min_score is not None:
+                    keep &= scores >= min_score
+                if max_score is not None:
+                    keep &= scores <= max_score
+                rows = rows[keep]
+            return rows.astype(np.intp, copy=False)
+
+    def keys_for(self, positions: Iterable[int]) -> List[Hashable]:
+        """The `key` values of rows at `positions`."""
+        with self._lock:
+            return [self.keys[position] for position in positions]
+
+    def vocabulary(self, field: str) -> List[str]:
+        """Sorted words indexed for `field`."""
+        with self._lock:
+            words = self._vocabulary.get(field)
+            if words is None:
+                words = self._vocabulary[field] = sorted(word for f, word in self._chunks if f == field)
+            return words
+
+    def compact(self):
+        """Drop dead rows from the posting lists and renumber the live ones."""
+        with self._lock:
+            if not self._dead:
+                return
+            alive = self._alive[:self._size]
+            renumber = np.cumsum(alive) - 1
+            for key in list(self._chunks):
+                posting = self._posting(key)
+                kept = posting[alive[posting]]
+                if len(kept):
+                    self._chunks[key] = [renumber[kept].astype(np.int32)]
+                else:
+                    del self._chunks[key]
+            self._scores = self._scores[:self._size][alive]
+            self._alive = np.ones(len(self._scores), dtype=bool)
+            if self.key is not None:
+                self.keys = [key for key, live in zip(self.keys, alive) if live]
+                self._positions = {key: position for position, key in enumerate(self.keys)}
+            self._size = len(self._scores)
+            self._dead = 0
+            self._vocabulary.clear()
+
+    def _reserve(self, size: int):
+        if size > len(self._scores):
+            capacity = max(size, 2 * len(self._scores), 1024)
+            self._scores = np.resize(self._scores, capacity)
+            alive = np.zeros(capacity, dtype=bool)
+            alive[:self._size] = self._alive[:self._size]
+            self._alive = alive
+
+    def _kill(self, position: int):
+        if self._alive[position]:
+            self._alive[position] = False
+            self._dead += 1
+
+    def _maybe_compact(self):
+        if self._dead > max(1024, self._size - self._dead):
+            self.compact()
+
+    def _index_column(self, field: str, column: pd.Series, start: int):
+        # Tokenize each distinct value once; its rows are a slice of the code-sorted order
+        codes, uniques = pd.factorize(column)
+        order = np.argsort(codes, kind="stable").astype(np.int32)
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        word_codes: Dict[str, List[int]] = defaultdict(list)
+        for code, value in enumerate(uniques):
+            for word in dict.fromkeys(tokenize(value)):
+                word_codes[word].append(code)
+        for word, value_codes in word_codes.items():
+            parts = [order[bounds[code]:bounds[code + 1]] for code in value_codes]
+            rows = parts[0] if len(parts) == 1 else np.sort(np.concatenate(parts))
+            key = (field, word)
+            if key not in self._chunks:
+                self._vocabulary.pop(field, None)
+            self._chunks[key].append(rows + np.int32(start))
+
+    def _posting(self, key: Tuple[str, str]) -> np.ndarray:
+        chunks = self._chunks.get(key)
+        if not chunks:
+            return _EMPTY
+        if len(chunks) > 1:
+            # Later chunks hold later positions, so joining them keeps the list sorted
+            chunks[:] = [np.concatenate(chunks)]
+        return chunks[0]
+
+    def _term(self, field: Optional[str], word: str, prefix: bool) -> np.ndarray:
+        postings = []
+        for name in (field,) if field else self.fields:
+            if not prefix:
+                postings.append(self._posting((name, word)))
+                continue
+            words = self.vocabulary(name)
+            i = bisect_left(words, word)
+            while i < len(words) and words[i].startswith(word):
+                postings.append(self._posting((name, words[i])))
+                i += 1
+        return self._union(postings)
+
+    def _evaluate(self, node) -> np.ndarray:
+        if node[0] == "term":
+            return self._term(*node[1:])
+        if node[0] == "or":
+            return self._union([self._evaluate(child) for child in node[1]])
+        # AND: start from the smallest result and stop as soon as nothing is left
+        results = sorted((self._evaluate(child) for child in node[1]), key=len)
+        rows = results[0]
+        for other in results[1:]:
+            if not len(rows):
+                break
+            rows = self._intersect(rows, other)
+        return rows
+
+    def _union(self, postings: List[np.ndarray]) -> np.ndarray:
+        postings = [posting for posting in postings if len(posting)]
+        if not postings:
+            return _EMPTY
+        if len(postings) == 1:
+            return postings[0]
+        if sum(len(posting) for posting in postings) > self._size * _DENSE_SHARE:
+            mask = np.zeros(self._size, dtype=bool)
+            for posting in postings:
+                mask[posting] = True
+            return np.flatnonzero(mask)
+        return np.unique(np.concatenate(postings))
+
+    def _intersect(self, rows: np.ndarray, other: np.ndarray) -> np.ndarray:
+        if len(other) > len(rows) * 32:
+            # Few candidates against a long list: binary search beats a bitmap pass
+            found = np.searchsorted(other, rows)
+            found[found == len(other)] = 0
+            return rows[other[found] == rows]
+        mask = np.zeros(self._size, dtype=bool)
+        mask[other] = True
+        return rows[mask[rows]]
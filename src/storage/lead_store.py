@@ -0,0 +1,222 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from src.data_sources.base import DataSource
+from src.pipeline.streaming import LeadPipeline, run_stages
+from src.pipeline.instrumentation import stage as timed_stage
+from src.storage.lead_index import LeadIndex
+
+Lead = Dict[str, Any]
+Stage = Callable[[Lead], Lead]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS leads (
+    id TEXT NOT NULL,
+    source TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    fetched_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    score REAL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (id, source)
+)
+"""
+
+
+def content_hash(lead: Lead) -> str:
+    """Fingerprint of a lead as fetched, before any enrichment."""
+    return hashlib.sha1(json.dumps(lead, sort_keys=True, default=str).encode()).hexdigest()
+
+
+@dataclass
+class RefreshStats:
+    """What a refresh found, by lead."""
+    new: int = 0
+    changed: int = 0
+    unchanged: int = 0
+
+    @property
+    def processed(self) -> int:
+        return self.new + self.changed
+
+    @property
+    def total(self) -> int:
+        return self.new + self.changed + self.unchanged
+
+
+class LeadStore:
+    """
+    SQLite-backed store of processed leads keyed by (id, source).
+
+    Each row keeps the hash of the raw fetched record, so a refresh only
+    re-enriches and re-scores leads that are new or whose content changed;
+    unchanged leads just get their `fetched_at` timestamp bumped.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._index: Optional[LeadIndex] = None
+        self._index_lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM leads").fetchone()[0]
+
+    def _select_keys(self, columns: str, keys: List[Tuple[str, str]]) -> List[tuple]:
+        found = []
+        with self._lock:
+            # Batched row-value lookups, kept under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 400):
+                batch = keys[start:start + 400]
+                placeholders = ", ".join("(?, ?)" for _ in batch)
+                found.extend(self._conn.execute(
+                    f"SELECT {columns} FROM leads WHERE (id, source) IN (VALUES {placeholders})",
+                    [value for key in batch for value in key],
+                ))
+        return found
+
+    def _known_hashes(self, keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], str]:
+        rows = self._select_keys("id, source, content_hash", keys)
+        return {(id_, source): digest for id_, source, digest in rows}
+
+    def upsert(self, raw_leads: List[Lead], stages: Iterable[Stage], stats: Optional[RefreshStats] = None) -> RefreshStats:
+        """
+        Store a batch of freshly fetched leads, processing only new/changed ones.
+        """
+        stats = stats or RefreshStats()
+        now = time.time()
+        keyed = [((str(lead["id"]), str(lead.get("source", ""))), content_hash(lead), lead) for lead in raw_leads]
+        known = self._known_hashes([key for key, _, _ in keyed])
+        stages = list(stages)
+
+        pending, touches = [], []
+        for key, digest, lead in keyed:
+            previous = known.get(key)
+            if previous == digest:
+                stats.unchanged += 1
+                touches.append((now, *key))
+                continue
+            if previous is None:
+                stats.new += 1
+            else:
+                stats.changed += 1
+            pending.append((key, digest, dict(lead)))
+
+        processed = run_stages(stages, [lead for _, _, lead in pending])
+        writes = [
+            (*key, digest, now, now, now, lead.get("score"), json.dumps(lead, default=str))
+            for (key, digest, _), lead in zip(pending, processed)
+        ]
+
+        with timed_stage("LeadStore.write", rows=len(writes)), self._lock, self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO leads (id, source, content_hash, first_seen, fetched_at, updated_at, score, payload)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (id, source) DO UPDATE SET
+                    content_hash = excluded.content_hash,
+                    fetched_at = excluded.fetched_at,
+                    updated_at = excluded.updated_at,
+                    score = excluded.score,
+                    payload = excluded.payload
+                """,
+                writes,
+            )
+            self._conn.executemany("UPDATE leads SET fetched_at = ? WHERE id = ? AND source = ?", touches)
+        with self._index_lock:
+            if self._index is not None and processed:
+                # Only new and changed leads are (re)indexed
+                self._index.add(pd.DataFrame(
+                    dict(lead, id=key[0], source=key[1]) for (key, _, _), lead in zip(pending, processed)
+                ))
+        return stats
+
+    def refresh(self, requests: Iterable[Tuple[DataSource, int]], stages: Iterable[Stage], query: str = None,
+                chunk_size: int = 500, on_chunk: Optional[Callable[[RefreshStats], None]] = None) -> RefreshStats:
+        """
+        Fetch each `(source, limit)` in chunks and upsert the results.
+
+        Raw chunks come from a stage-less LeadPipeline, so sources are fetched
+        concurrently; `on_chunk` is called with the running stats after each chunk.
+        """
+        stats = RefreshStats()
+        stages = list(stages)
+        fetcher = LeadPipeline(stages=[], chunk_size=chunk_size)
+        for chunk in fetcher.stream(requests, query):
+            self.upsert(chunk, stages, stats)
+            if on_chunk:
+                on_chunk(stats)
+        return stats
+
+    def load(self, sources: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """All stored leads (optionally only some sources) as a DataFrame."""
+        sql = "SELECT payload FROM leads"
+        params: Tuple = ()
+        if sources is not None:
+            sources = list(sources)
+            sql += f" WHERE source IN ({', '.join('?' * len(sources))})"
+            params = tuple(sources)
+        with timed_stage("LeadStore.load") as span:
+            with self._lock:
+                rows = self._conn.execute(sql, params).fetchall()
+            span.rows = len(rows)
+            return pd.DataFrame([json.loads(payload) for (payload,) in rows])
+
+    def index(self) -> LeadIndex:
+        """
+        Inverted index over the stored leads' text fields and scores, keyed by
+        (id, source). Built from the table on first use, then kept current
+        by `upsert`.
+        """
+        with self._index_lock:
+            if self._index is None:
+                index = LeadIndex(key=("id", "source"))
+                index.add(self.load())
+                self._index = index
+            return self._index
+
+    def search(self, query: Optional[str] = None, min_score: Optional[float] = None,
+               max_score: Optional[float] = None) -> pd.DataFrame:
+        """
+        Stored leads matching an index query (see `lead_index.parse_query`)
+        and score range, in the order they were indexed.
+        """
+        index = self.index()
+        keys = index.keys_for(index.positions(query, min_score, max_score))
+        rows = self._select_keys("id, source, payload", keys)
+        payloads = {(id_, source): payload for id_, source, payload in rows}
+        return pd.DataFrame([json.loads(payloads[key]) for key in keys if key in payloads])
+
+    def revision(self) -> tuple:
+        """Changes whenever leads are added or updated; used as a cache key."""
+        with self._lock:
+            return tuple(self._conn.execute("SELECT COUNT(*), MAX(updated_at) FROM leads").fetchone())
+
+    def top(self, k: int = 10) -> pd.DataFrame:
+        """The `k` highest-scoring stored leads."""
+        with self._lock:
+            rows = self._conn.execute("SELECT payload FROM leads ORDER BY score DESC LIMIT ?", (k,)).fetchall()
+        return pd.DataFrame([json.loads(payload) for (payload,) in rows])
+
+    def last_fetched(self) -> Dict[str, float]:
+        """Most recent fetch timestamp per source."""
+        with self._lock:
+            return dict(self._conn.execute("SELECT source, MAX(fetched_at) FROM leads GROUP BY source").fetchall())
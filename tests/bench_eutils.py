@@ -0,0 +1,44 @@
+import sys
+import os
+import re
+import tempfile
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data_sources.eutils import PubMedEUtilsSource
+from fake_eutils import FakeEutils
+
+ARTICLES = 1_000
+# Round trip to NCBI, roughly
+LATENCY = 0.05
+_PMID = re.compile(rb"<PMID Version=\"1\">(\d+)</PMID>")
+
+
+def sweep(url, cache_dir, batch_size):
+    # No request pacing, so the numbers show round trips rather than NCBI's 3/s limit
+    source = PubMedEUtilsSource(url, batch_size=batch_size, cache_dir=cache_dir)
+    source.bucket.rate = 1e9
+    start = time.perf_counter()
+    leads = source.fetch_data(limit=10 * ARTICLES)
+    return time.perf_counter() - start, len(leads), source.stats
+
+
+if __name__ == "__main__":
+    print(f"Benchmark: keyword sweep of {ARTICLES:,} PubMed articles at {LATENCY * 1e3:.0f} ms per request")
+    with FakeEutils(latency=LATENCY) as eutils, tempfile.TemporaryDirectory() as folder:
+        # The recorded articles, repeated under distinct PMIDs
+        fixtures = eutils.articles
+        eutils.articles = [
+            _PMID.sub(lambda m: b'<PMID Version="1">%d</PMID>' % (int(m.group(1)) + 100 * i), fixtures[i % len(fixtures)])
+            for i in range(ARTICLES)
+        ]
+        for label, batch_size, cache in [
+            ("efetch per article", 1, "per_article"),
+            ("efetch 500 per call", 500, "batched"),
+            ("repeat within TTL (cache)", 500, "batched"),
+        ]:
+            seconds, leads, stats = sweep(eutils.url, os.path.join(folder, cache), batch_size)
+            print(f"  {label:<28} {seconds:7.2f} s | {stats.requests:>5} requests | {stats.cache_hits:>5} cache hits | "
+                  f"{leads:,} leads")
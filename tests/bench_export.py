@@ -0,0 +1,30 @@
+import sys
+import os
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data_sources.bulk import generate_leads
+from src.pipeline.parallel import process_frame
+from src.pipeline.export import CrmExporter, write_csv, write_parquet
+from fake_crm import FakeCrm
+
+SIZES = [100_000, 1_000_000]
+
+
+if __name__ == "__main__":
+    print("Benchmark: chunked export of the scored pool (50k-row chunks, so memory does not grow with the pool)")
+    with tempfile.TemporaryDirectory() as folder, FakeCrm() as crm:
+        crm_exporter = CrmExporter(crm.url, batch_size=5000)
+        for rows in SIZES:
+            df = process_frame(generate_leads(rows, seed=42))
+            print(f"\n{rows:>9,} leads")
+            for name, export in [
+                ("csv", lambda: write_csv(df, os.path.join(folder, "leads.csv"))),
+                ("parquet (zstd)", lambda: write_parquet(df, os.path.join(folder, "leads.parquet"))),
+                ("crm batches of 5000", lambda: crm_exporter.push(df)),
+            ]:
+                stats = export()
+                print(f"  {name:<22} {stats.seconds:6.2f} s | {stats.rows_per_second:>12,.0f} rows/s | "
+                      f"{stats.bytes / 1e6:8.1f} MB | {stats.chunks:>4} chunks")
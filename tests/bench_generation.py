@@ -0,0 +1,32 @@
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data_sources.linkedin import LinkedInSource
+from src.data_sources.pubmed import PubMedSource
+from src.data_sources.bulk import generate_leads
+
+PER_ROW_SIZE = 10_000
+BULK_SIZES = [10_000, 100_000, 1_000_000, 3_000_000]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    print("Benchmark: per-row fetch_data vs bulk generate_leads")
+
+    half = PER_ROW_SIZE // 2
+    _, row_time = timed(lambda: LinkedInSource().fetch_data(limit=half) + PubMedSource().fetch_data(limit=half))
+    print(f"{PER_ROW_SIZE:>10,} rows | fetch_data     {row_time:8.3f}s | {PER_ROW_SIZE / row_time:>12,.0f} rows/s")
+
+    for size in BULK_SIZES:
+        df, bulk_time = timed(lambda: generate_leads(size, seed=42))
+        assert len(df) == size
+        print(f"{size:>10,} rows | generate_leads {bulk_time:8.3f}s | {size / bulk_time:>12,.0f} rows/s")
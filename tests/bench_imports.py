@@ -0,0 +1,114 @@
+"""
+Cold-start import benchmark for the modules the dashboard loads on every run.
+
+Runs `python -X importtime` in a fresh interpreter, `--repeat` times, and
+reports the best total import time with the heaviest top-level imports. The
+run fails (exit code 1) when the total is over `--budget-ms` or when a module
+that should only load on demand (Faker, pydeck, requests) was imported.
+
+    python tests/bench_imports.py
+    python tests/bench_imports.py --budget-ms 1200 --repeat 5
+"""
+import sys
+import os
+import argparse
+import subprocess
+from typing import Dict, List, NamedTuple, Optional
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# The project imports at the top of app.py (streamlit itself is measured separately)
+APP_IMPORTS = [
+    "src.data_sources.registry",
+    "src.ranking.rules",
+    "src.pipeline.streaming",
+    "src.ranking.cache",
+    "src.storage.lead_store",
+    "src.storage.lead_index",
+    "src.enrichment.dedup",
+    "src.enrichment.lookup",
+    "src.ranking.topk",
+    "src.pipeline.export",
+    "src.pipeline.refresh",
+    "src.enrichment.map_data",
+    "src.pipeline.instrumentation",
+    "src.enrichment.resolver",
+]
+
+# Loaded only when a source generates data, the map renders or a REST resolver is configured
+DEFERRED = ["faker", "pydeck", "requests"]
+
+# Best-of total on a laptop-class machine is ~0.6 s, nearly all of it pandas/numpy/pyarrow
+BUDGET_MS = 1000.0
+
+
+class ImportTime(NamedTuple):
+    self_us: int
+    cumulative_us: int
+    top_level: bool
+
+
+def import_times(modules: List[str]) -> Dict[str, ImportTime]:
+    """Per-module import timings for importing `modules` in a fresh interpreter."""
+    code = "; ".join(f"import {module}" for module in modules) or "pass"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # Top-level imports are indented by one space, nested ones by more
+        top_level = len(name) - len(name.lstrip()) == 1
+        times[name.strip()] = ImportTime(int(self_us), int(cumulative_us), top_level)
+    return times
+
+
+def total_ms(times: Dict[str, ImportTime]) -> float:
+    return sum(entry.self_us for entry in times.values()) / 1e3
+
+
+def best_run(modules: List[str], repeat: int) -> Dict[str, ImportTime]:
+    """Fastest of `repeat` runs, leaving out what a bare interpreter imports at startup."""
+    startup = import_times([])
+    runs = [
+        {name: entry for name, entry in import_times(modules).items() if name not in startup}
+        for _ in range(repeat)
+    ]
+    return min(runs, key=total_ms)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+    parser.add_argument("--top", type=int, default=10, help="Heaviest top-level imports to list")
+    args = parser.parse_args(argv)
+
+    times = best_run(APP_IMPORTS, args.repeat)
+    total = total_ms(times)
+    print(f"Benchmark: dashboard imports, best of {args.repeat}")
+    top_level = sorted(((entry.cumulative_us, name) for name, entry in times.items() if entry.top_level),
+                       reverse=True)
+    for cumulative, name in top_level[:args.top]:
+        print(f"  {name:<40} {cumulative / 1e3:8.1f} ms")
+    print(f"  {'total':<40} {total:8.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    streamlit = total_ms(best_run(["streamlit"], args.repeat))
+    print(f"  {'streamlit (for reference)':<40} {streamlit:8.1f} ms")
+
+    failures = []
+    loaded = [module for module in DEFERRED if module in times]
+    if loaded:
+        failures.append(f"imported eagerly: {', '.join(loaded)}")
+    if total > args.budget_ms:
+        failures.append(f"total {total:.0f} ms is over the {args.budget_ms:.0f} ms budget")
+    if failures:
+        print("\nFAIL: " + "; ".join(failures))
+        return 1
+    print("\nWithin budget; deferred modules stay unloaded.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
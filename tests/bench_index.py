@@ -0,0 +1,64 @@
+import sys
+import os
+import time
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data_sources.bulk import generate_leads
+from src.storage.lead_index import LeadIndex, field_query
+
+SIZES = [100_000, 1_000_000]
+QUERIES = [
+    ("location 'boston'", "boston", None),
+    ("location 'san' (prefix)", "san", None),
+    ("title:director AND location:boston", "boston", "title:director"),
+    ("(director OR head) company:pfizer", "", "(title:director OR title:head) company:pfizer"),
+    ("toxicity OR hepatic", "", "toxicity OR hepatic"),
+]
+
+
+def scan(df, location, query_columns, min_score):
+    # What the dashboard did before: a case-insensitive substring scan per filter
+    mask = df["score"] >= min_score
+    if location:
+        mask &= df["location"].str.contains(location, case=False, na=False)
+    for column, word in query_columns:
+        mask &= df[column].str.contains(word, case=False, na=False)
+    return np.flatnonzero(mask.to_numpy())
+
+
+def best_ms(func, repeat=5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+if __name__ == "__main__":
+    print("Benchmark: inverted index filtering vs substring scans (min score 50)")
+    for rows in SIZES:
+        df = generate_leads(rows, seed=42)
+        df["score"] = np.random.default_rng(42).integers(0, 101, rows)
+
+        start = time.perf_counter()
+        index = LeadIndex.from_frame(df)
+        build = time.perf_counter() - start
+        more = generate_leads(10_000, seed=43)
+        start = time.perf_counter()
+        index.add(more)
+        append = time.perf_counter() - start
+        print(f"\n{rows:>9,} leads | build {build:6.2f} s | add 10k more {append * 1e3:6.1f} ms")
+
+        for label, location, query in QUERIES:
+            text = " ".join(filter(None, [field_query("location", location), query and f"({query})"]))
+            ms = best_ms(lambda: index.positions(text, min_score=50))
+            matches = len(index.positions(text, min_score=50))
+            print(f"  {label:<38} {matches:>8,} rows | index {ms:6.2f} ms")
+
+        baseline = best_ms(lambda: scan(df, "boston", [("title", "director")], 50), repeat=3)
+        print(f"  {'scan: boston + director':<38} {'':>13} | str.contains {baseline:6.1f} ms")
@@ -0,0 +1,32 @@
+import sys
+import os
+import json
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data_sources.bulk import generate_leads
+from src.pipeline.parallel import process_frame
+from src.enrichment.map_data import map_layer_data
+
+SIZES = [1_000, 10_000, 100_000]
+
+
+def payload_bytes(frame) -> int:
+    """Size of the records JSON pydeck sends to the browser."""
+    return len(json.dumps(frame.to_dict("records"), default=str))
+
+
+if __name__ == "__main__":
+    print("Benchmark: map payload, whole filtered frame vs map data stage")
+    for rows in SIZES:
+        df = process_frame(generate_leads(rows, seed=42))
+        full = payload_bytes(df.dropna(subset=["lat", "lon"]))
+
+        start = time.perf_counter()
+        kind, data = map_layer_data(df)
+        elapsed = time.perf_counter() - start
+
+        print(f"{rows:>8,} leads | full frame {full / 1e3:10.1f} KB | {kind:<6} {len(data):>6,} rows "
+              f"{payload_bytes(data) / 1e3:7.1f} KB | stage {elapsed * 1e3:6.1f} ms")
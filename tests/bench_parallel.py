@@ -0,0 +1,30 @@
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data_sources.bulk import generate_leads
+from src.pipeline.parallel import process_frame, parallel_process, default_workers
+
+ROWS = 1_000_000
+
+
+if __name__ == "__main__":
+    df = generate_leads(ROWS, seed=42)
+    print(f"Benchmark: enrichment + scoring of {ROWS:,} rows ({default_workers()} CPUs available)")
+
+    start = time.perf_counter()
+    baseline = process_frame(df)
+    serial_time = time.perf_counter() - start
+    print(f"in-process   | {serial_time:7.3f}s")
+
+    workers = 2
+    while workers <= max(2, default_workers()):
+        start = time.perf_counter()
+        result = parallel_process(df, workers=workers, min_rows_per_worker=1)
+        elapsed = time.perf_counter() - start
+        assert result["score"].equals(baseline["score"])
+        print(f"{workers:>2} workers   | {elapsed:7.3f}s | speedup {serial_time / elapsed:5.2f}x")
+        workers *= 2
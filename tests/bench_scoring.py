@@ -0,0 +1,62 @@
+import sys
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data_sources.mock_data import (
+    CITY_COORDINATES, COMPANY_HQS, ACADEMIC_INSTITUTES, LINKEDIN_TITLES, PUBMED_TITLES
+)
+from src.ranking.scorer import LeadScorer
+
+SIZES = [10_000, 100_000, 1_000_000]
+
+
+def make_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Build a synthetic lead frame by sampling the mock constants."""
+    rng = np.random.default_rng(seed)
+    companies = list(COMPANY_HQS.keys()) + list(ACADEMIC_INSTITUTES.keys())
+    hqs = {**COMPANY_HQS, **ACADEMIC_INSTITUTES}
+    company = rng.choice(companies, rows)
+    return pd.DataFrame({
+        "title": rng.choice(LINKEDIN_TITLES + PUBMED_TITLES, rows),
+        "company": company,
+        "company_hq": [hqs[c] for c in company],
+        "location": rng.choice(list(CITY_COORDINATES.keys()), rows),
+        "source": rng.choice(["LinkedIn", "PubMed"], rows),
+    })
+
+
+def bench(rows: int):
+    df = make_frame(rows)
+    scorer = LeadScorer()
+
+    start = time.perf_counter()
+    records = df.to_dict("records")
+    per_row = [scorer.score_profile(record) for record in records]
+    row_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = scorer.score_frame(df)
+    frame_time = time.perf_counter() - start
+
+    # Flags only; reasons text is rendered later for the rows on screen
+    start = time.perf_counter()
+    scorer.score_frame(df, reasons=False)
+    flags_time = time.perf_counter() - start
+
+    assert list(batch["score"]) == [r["score"] for r in per_row]
+    assert list(batch["score_reasons"]) == [r["score_reasons"] for r in per_row]
+
+    print(f"{rows:>10,} rows | score_profile {row_time:8.3f}s | score_frame {frame_time:8.3f}s "
+          f"| speedup {row_time / frame_time:5.1f}x | flags only {flags_time:8.3f}s")
+
+
+if __name__ == "__main__":
+    print("Benchmark: LeadScorer.score_profile vs LeadScorer.score_frame")
+    for size in SIZES:
+        bench(size)
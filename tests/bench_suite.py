@@ -0,0 +1,198 @@
+"""
+Throughput benchmark suite for the fetch -> enrich -> score -> view pipeline.
+
+Every stage runs on seeded data at each pool size; the best of `--repeat`
+runs is reported as rows/s and compared with the stored baseline. The run
+fails (exit code 1) when any stage is more than `--threshold` slower than
+its baseline. Baselines are machine specific: record one on the machine that
+runs the check with `--update-baseline`.
+
+    python tests/bench_suite.py                      # compare with baseline
+    python tests/bench_suite.py --update-baseline    # record a new baseline
+    python tests/bench_suite.py --sizes 1000 --stages score
+"""
+import sys
+import os
+import argparse
+import json
+import platform
+import random
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data_sources.linkedin import LinkedInSource
+from src.data_sources.pubmed import PubMedSource
+from src.data_sources.bulk import generate_leads
+from src.data_sources.fakes import get_faker
+from src.enrichment.geo import enrich_location_data
+from src.enrichment.contact import enrich_contact_info, enrich_contact_frame
+from src.enrichment.lookup import enrich_location_frame
+from src.enrichment.resolver import BatchContactEnricher
+from src.ranking.scorer import LeadScorer
+from src.ranking.topk import top_k
+
+SIZES = [1_000, 10_000, 100_000]
+SEED = 42
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "bench_baseline.json")
+
+# Per-row stages take seconds per 100k rows; past this size they are skipped
+PER_ROW_LIMIT = 10_000
+
+
+class Stage(NamedTuple):
+    name: str
+    setup: Callable[[int], object]  # rows -> input, untimed
+    run: Callable[[object], object]
+    max_rows: Optional[int] = None
+
+
+def _seeded(rows: int) -> int:
+    """Reseed the per-row generators so every run fetches the same leads."""
+    random.seed(SEED)
+    get_faker().seed_instance(SEED)
+    return rows
+
+
+def _raw_frame(rows: int) -> pd.DataFrame:
+    return generate_leads(rows, seed=SEED)
+
+
+def _raw_records(rows: int) -> List[dict]:
+    return _raw_frame(rows).astype(object).to_dict("records")
+
+
+def _enriched_frame(rows: int) -> pd.DataFrame:
+    return enrich_contact_frame(enrich_location_frame(_raw_frame(rows)))
+
+
+def _enriched_records(rows: int) -> List[dict]:
+    frame = _enriched_frame(rows).astype(object)
+    return frame.where(frame.notna(), None).to_dict("records")
+
+
+def _scored_records(rows: int) -> List[dict]:
+    scorer = LeadScorer()
+    return [scorer.score_profile(lead) for lead in _enriched_records(rows)]
+
+
+def _scored_frame(rows: int) -> pd.DataFrame:
+    return LeadScorer().score_frame(_enriched_frame(rows), reasons=False)
+
+
+def _build_filter_sort(records: List[dict]) -> pd.DataFrame:
+    # What the dashboard does per view: frame from stored records, filters, top page
+    df = pd.DataFrame(records)
+    df = df[df["location"].str.contains("Boston", case=False, na=False) | (df["score"] >= 50)]
+    return top_k(df, 50)
+
+
+def _per_row(func):
+    return lambda leads: [func(lead) for lead in leads]
+
+
+STAGES = [
+    Stage("fetch.linkedin", _seeded, lambda rows: LinkedInSource().fetch_data(limit=rows), PER_ROW_LIMIT),
+    Stage("fetch.pubmed", _seeded, lambda rows: PubMedSource().fetch_data(limit=rows), PER_ROW_LIMIT),
+    Stage("fetch.linkedin_frame", lambda rows: rows, lambda rows: LinkedInSource().fetch_frame(rows, seed=SEED)),
+    Stage("fetch.pubmed_frame", lambda rows: rows, lambda rows: PubMedSource().fetch_frame(rows, seed=SEED)),
+    Stage("geo.per_row", _raw_records, _per_row(enrich_location_data), PER_ROW_LIMIT),
+    Stage("geo.frame", _raw_frame, enrich_location_frame),
+    Stage("contact.per_row", _raw_records, _per_row(enrich_contact_info), PER_ROW_LIMIT),
+    Stage("contact.frame", _raw_frame, enrich_contact_frame),
+    Stage("contact.batched", _raw_frame, lambda df: BatchContactEnricher().enrich_frame(df)),
+    Stage("score.per_row", _enriched_records, _per_row(LeadScorer().score_profile), PER_ROW_LIMIT),
+    Stage("score.frame", _enriched_frame, LeadScorer().score_frame),
+    Stage("score.reweight", _scored_frame, LeadScorer().with_weights({"role_fit": 45, "location": 5}).rescore),
+    Stage("view.build_filter_sort", _scored_records, _build_filter_sort),
+]
+
+
+def measure(stage: Stage, rows: int, repeat: int) -> float:
+    """Best-of-`repeat` throughput of `stage` at `rows` rows, in rows/s."""
+    best = float("inf")
+    for _ in range(repeat):
+        data = stage.setup(rows)
+        start = time.perf_counter()
+        stage.run(data)
+        best = min(best, time.perf_counter() - start)
+    return rows / best
+
+
+def run_suite(sizes: List[int], repeat: int, names: Optional[List[str]] = None) -> Dict[str, float]:
+    results = {}
+    for stage in STAGES:
+        if names and not any(stage.name.startswith(name) for name in names):
+            continue
+        for rows in sizes:
+            if stage.max_rows is not None and rows > stage.max_rows:
+                continue
+            key = f"{stage.name}@{rows}"
+            results[key] = measure(stage, rows, repeat)
+            print(f"  {key:<32} {results[key]:>14,.0f} rows/s", flush=True)
+    return results
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], threshold: float) -> List[str]:
+    """Keys whose throughput fell more than `threshold` below the baseline."""
+    print(f"\n{'stage@rows':<32} {'baseline':>14} {'current':>14} {'change':>8}")
+    regressions = []
+    for key, current in results.items():
+        if key not in baseline:
+            print(f"{key:<32} {'-':>14} {current:>14,.0f} {'new':>8}")
+            continue
+        change = current / baseline[key] - 1
+        flag = ""
+        if change < -threshold:
+            regressions.append(key)
+            flag = "  REGRESSION"
+        print(f"{key:<32} {baseline[key]:>14,.0f} {current:>14,.0f} {change:>+8.1%}{flag}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--stages", nargs="+", help="Only stages whose name starts with one of these")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed throughput drop vs baseline, as a fraction (default 0.25)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="Merge these results into the baseline")
+    args = parser.parse_args(argv)
+
+    print(f"Benchmark suite: sizes {args.sizes}, best of {args.repeat}")
+    results = run_suite(args.sizes, args.repeat, args.stages)
+
+    if args.update_baseline:
+        stored = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as handle:
+                stored = json.load(handle).get("results", {})
+        stored.update({key: round(value, 1) for key, value in results.items()})
+        with open(args.baseline, "w") as handle:
+            json.dump({"machine": platform.machine(), "python": platform.python_version(),
+                       "results": dict(sorted(stored.items()))}, handle, indent=2)
+            handle.write("\n")
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline first.")
+        return 1
+    with open(args.baseline) as handle:
+        baseline = json.load(handle)["results"]
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} stage(s) regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    print(f"\nNo regressions beyond {args.threshold:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
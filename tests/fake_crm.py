@@ -0,0 +1,57 @@
+"""
+Stand-in CRM for exercising the export pipeline offline.
+
+`FakeCrm` accepts `POST /leads/upsert` with `{"leads": [...]}` and upserts
+each lead by (id, source). It can fail the first requests with 503 to
+exercise retries. Run it standalone to point the dashboard at it:
+
+    python tests/fake_crm.py --port 8765
+    CRM_URL=http://127.0.0.1:8765 streamlit run app.py
+"""
+import sys
+import os
+import argparse
+import json
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+
+from fake_server import FakeServer
+
+
+class FakeCrm(FakeServer):
+    """FakeServer with an in-memory lead table behind `/leads/upsert`."""
+
+    def __init__(self, fail_first: int = 0, latency: float = 0.0, port: int = 0):
+        super().__init__({"/leads/upsert": self._upsert}, latency=latency, port=port)
+        self.leads = {}
+        self.batches = 0
+        self.failures_left = fail_first
+        self._lock = threading.Lock()
+
+    def _upsert(self, params, body):
+        with self._lock:
+            if self.failures_left > 0:
+                self.failures_left -= 1
+                return 503, {"Retry-After": "0"}, b"busy"
+            leads = json.loads(body)["leads"]
+            for lead in leads:
+                self.leads[(lead["id"], lead["source"])] = lead
+            self.batches += 1
+        return 200, {"Content-Type": "application/json"}, json.dumps({"upserted": len(leads)}).encode()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stand-in CRM upsert endpoint")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fail-first", type=int, default=0, help="Answer the first N requests with 503")
+    args = parser.parse_args()
+    with FakeCrm(fail_first=args.fail_first, port=args.port) as crm:
+        print(f"Fake CRM listening on {crm.url}/leads/upsert (Ctrl-C to stop)")
+        try:
+            while True:
+                time.sleep(5)
+                print(f"  {len(crm.leads):,} leads in {crm.batches:,} batches")
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,108 @@
+"""
+Stand-in for NCBI E-utilities, serving recorded PubMed responses offline.
+
+`FakeEutils` answers `esearch.fcgi` with the recorded search (one result
+set on a fake history server) and `efetch.fcgi` with the recorded articles
+sliced by `retstart`/`retmax`, each page with an ETag. An efetch naming
+another WebEnv gets NCBI's `<ERROR>` answer, as after the history server
+drops a search; `expire()` triggers that. Point the dashboard at it with:
+
+    python tests/fake_eutils.py --port 8766
+    PUBMED_SOURCE=eutils EUTILS_URL=http://127.0.0.1:8766 streamlit run app.py
+
+Re-record the fixtures from NCBI (network needed) with:
+
+    python tests/fake_eutils.py --record '"hepatic spheroids"[tiab]' --max 50
+"""
+import sys
+import os
+import argparse
+import hashlib
+import json
+import time
+import xml.etree.ElementTree as ET
+
+import requests
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+
+from fake_server import FakeServer
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "eutils")
+EUTILS_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
+
+_HEADER = (b'<?xml version="1.0" ?>\n<!DOCTYPE PubmedArticleSet PUBLIC "-//NLM//DTD PubMedArticle, '
+           b'1st January 2025//EN" "https://dtd.nlm.nih.gov/ncbi/pubmed/out/pubmed_250101.dtd">\n')
+
+
+class FakeEutils(FakeServer):
+    """FakeServer with `esearch.fcgi` and `efetch.fcgi` backed by the fixtures in `fixtures`."""
+
+    def __init__(self, fixtures: str = FIXTURES, latency: float = 0.0, port: int = 0):
+        super().__init__({"/esearch.fcgi": self._esearch, "/efetch.fcgi": self._efetch}, latency=latency, port=port)
+        with open(os.path.join(fixtures, "esearch.json")) as f:
+            self.search = json.load(f)
+        root = ET.parse(os.path.join(fixtures, "efetch.xml")).getroot()
+        self.articles = [ET.tostring(article) for article in root.iter("PubmedArticle")]
+        self.webenv = self.search["esearchresult"]["webenv"]
+        self.generation = 0
+
+    def expire(self):
+        """Forget the parked search, as NCBI does after a while; the next search gets a new WebEnv."""
+        self.generation += 1
+        self.webenv = f"{self.search['esearchresult']['webenv']}_{self.generation}"
+
+    def _esearch(self, params, body):
+        result = dict(self.search["esearchresult"], webenv=self.webenv, count=str(len(self.articles)))
+        payload = json.dumps(dict(self.search, esearchresult=result)).encode()
+        return 200, {"Content-Type": "application/json"}, payload
+
+    def _efetch(self, params, body):
+        if params.get("WebEnv") != self.webenv:
+            error = b"<eFetchResult>\n\t<ERROR>Unable to obtain query #1</ERROR>\n</eFetchResult>\n"
+            return 200, {"Content-Type": "text/xml"}, error
+        start = int(params.get("retstart", 0))
+        articles = self.articles[start:start + int(params.get("retmax", 20))]
+        payload = _HEADER + b"<PubmedArticleSet>\n" + b"\n".join(articles) + b"\n</PubmedArticleSet>\n"
+        etag = '"%s"' % hashlib.sha1(payload).hexdigest()[:16]
+        return 200, {"Content-Type": "text/xml", "ETag": etag}, payload
+
+
+def record(term: str, limit: int, fixtures: str = FIXTURES, api_key: str = None):
+    """Save NCBI's esearch and the first `limit` efetch articles for `term` as fixtures."""
+    identity = {"tool": "helix-iq", **({"api_key": api_key} if api_key else {})}
+    search = requests.get(f"{EUTILS_URL}/esearch.fcgi", timeout=30, params={
+        "db": "pubmed", "term": term, "usehistory": "y", "retmax": 0, "sort": "pub_date", "retmode": "json",
+        **identity})
+    search.raise_for_status()
+    result = search.json()["esearchresult"]
+    time.sleep(0.4)
+    fetch = requests.get(f"{EUTILS_URL}/efetch.fcgi", timeout=60, params={
+        "db": "pubmed", "WebEnv": result["webenv"], "query_key": result["querykey"], "retstart": 0,
+        "retmax": limit, "retmode": "xml", **identity})
+    fetch.raise_for_status()
+    os.makedirs(fixtures, exist_ok=True)
+    with open(os.path.join(fixtures, "esearch.json"), "w") as f:
+        json.dump(search.json(), f, indent=2)
+    with open(os.path.join(fixtures, "efetch.xml"), "wb") as f:
+        f.write(fetch.content)
+    print(f"Recorded {fetch.content.count(b'<PubmedArticle>')} of {result['count']} articles for {term!r}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stand-in NCBI E-utilities server")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--record", metavar="TERM", help="Re-record the fixtures from NCBI for TERM and exit")
+    parser.add_argument("--max", type=int, default=50, help="Articles to record")
+    parser.add_argument("--api-key", default=os.environ.get("NCBI_API_KEY"))
+    args = parser.parse_args()
+    if args.record:
+        record(args.record, args.max, api_key=args.api_key)
+        sys.exit()
+    with FakeEutils(port=args.port) as eutils:
+        print(f"Fake E-utilities serving {len(eutils.articles)} articles on {eutils.url} (Ctrl-C to stop)")
+        try:
+            while True:
+                time.sleep(5)
+        except KeyboardInterrupt:
+            pass
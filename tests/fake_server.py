@@ -0,0 +1,87 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Tuple
+from urllib.parse import urlparse, parse_qs
+
+# A route takes (query params, request body) and returns (status, headers, body)
+Route = Callable[[Dict[str, str], bytes], Tuple[int, Dict[str, str], bytes]]
+
+
+def json_route(handler: Callable[[Dict[str, str], bytes], object]) -> Route:
+    """Wrap a function returning a JSON-serialisable object as a 200 route."""
+    def route(params, body):
+        return 200, {"Content-Type": "application/json"}, json.dumps(handler(params, body)).encode()
+    return route
+
+
+class FakeServer:
+    """
+    Local HTTP server for offline tests.
+
+    Listens on `port` (a free one by default). Every request sleeps `latency`
+    seconds before being dispatched to the route registered for its path. Use
+    as a context manager; `url` is the base address once started and
+    `requests` records (method, path, params) tuples. Responses carrying an
+    ETag are answered 304 Not Modified when the request's If-None-Match
+    matches it.
+    """
+
+    def __init__(self, routes: Dict[str, Route], latency: float = 0.0, port: int = 0):
+        self.routes = routes
+        self.latency = latency
+        self.port = port
+        self.requests = []
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "FakeServer":
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _dispatch(self, method):
+                parsed = urlparse(self.path)
+                params = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                fake.requests.append((method, parsed.path, params))
+                time.sleep(fake.latency)
+                route = fake.routes.get(parsed.path)
+                if route is None:
+                    status, headers, payload = 404, {}, b"not found"
+                else:
+                    status, headers, payload = route(params, body)
+                    etag = headers.get("ETag")
+                    if status == 200 and etag and self.headers.get("If-None-Match") == etag:
+                        # Conditional GET of an unchanged resource
+                        status, payload = 304, b""
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                self._dispatch("GET")
+
+            def do_POST(self):
+                self._dispatch("POST")
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.port), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,163 @@
+import sys
+import os
+import asyncio
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data_sources.linkedin import LinkedInSource
+from src.data_sources.pubmed import PubMedSource
+from src.data_sources.rest import RestSource
+from src.pipeline.scheduler import FetchScheduler
+from src.pipeline.ratelimit import Backoff, TokenBucket
+from src.pipeline.refresh import RefreshScheduler
+from src.pipeline.streaming import default_stages
+from src.storage.lead_store import LeadStore
+from fake_server import FakeServer, json_route
+
+LATENCY = 0.3
+
+
+class FlakySource(PubMedSource):
+    """PubMed source whose first `failures` fetches raise, as an API over quota would."""
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.calls = []
+
+    def fetch_data(self, query: str = None, limit: int = 10, **kwargs):
+        self.calls.append(time.perf_counter())
+        if len(self.calls) <= self.failures:
+            raise ConnectionError("429 Too Many Requests")
+        return super().fetch_data(query, limit=limit, **kwargs)
+
+
+class SlowSource(LinkedInSource):
+    """LinkedIn source taking `delay` seconds per fetch."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def fetch_data(self, query: str = None, limit: int = 20, **kwargs):
+        time.sleep(self.delay)
+        return super().fetch_data(query, limit=limit, **kwargs)
+
+
+def leads_route(source):
+    return json_route(lambda params, body: source.fetch_data(limit=int(params.get("limit", 10))))
+
+
+def test_scheduler():
+    print("----------------------------------------------------------------")
+    print("Running Fetch Scheduler Verification")
+    print("----------------------------------------------------------------")
+
+    routes = {"/linkedin": leads_route(LinkedInSource()), "/pubmed": leads_route(PubMedSource())}
+    with FakeServer(routes, latency=LATENCY) as server:
+        linkedin = RestSource(server.url, "/linkedin")
+        pubmed = RestSource(server.url, "/pubmed")
+
+        # 1. Sequential baseline, as app.py used to do it
+        start = time.perf_counter()
+        sequential = linkedin.fetch_data(limit=10) + pubmed.fetch_data(limit=10)
+        sequential_time = time.perf_counter() - start
+
+        # 2. Thread pool
+        scheduler = FetchScheduler().register(linkedin, 10, "LinkedIn").register(pubmed, 10, "PubMed")
+        start = time.perf_counter()
+        result = scheduler.run()
+        threaded_time = time.perf_counter() - start
+        assert result.complete and len(result.all_leads()) == len(sequential) == 20
+        print(f"[1] Sequential {sequential_time:.2f}s vs thread pool {threaded_time:.2f}s")
+        assert threaded_time < sequential_time * 0.75
+
+        # 3. asyncio
+        start = time.perf_counter()
+        result = asyncio.run(scheduler.arun())
+        async_time = time.perf_counter() - start
+        assert result.complete and len(result.all_leads()) == 20
+        print(f"[2] asyncio {async_time:.2f}s")
+
+        # 4. Paging with a concurrency limit of 2: 4 pages -> 2 round trips
+        paged = FetchScheduler().register(linkedin, 40, "LinkedIn", max_concurrency=2, page_size=10)
+        start = time.perf_counter()
+        result = paged.run()
+        paged_time = time.perf_counter() - start
+        assert len(result.leads["LinkedIn"]) == 40
+        assert 2 * LATENCY <= paged_time < 3 * LATENCY
+        print(f"[3] 4 pages at concurrency 2 took {paged_time:.2f}s")
+
+        # 5. Timeouts keep partial results and do not block other sources
+        partial = FetchScheduler()
+        partial.register(linkedin, 30, "Slow", timeout=LATENCY * 1.5, page_size=10)
+        partial.register(pubmed, 5, "Fast")
+        for runner in (partial.run, lambda: asyncio.run(partial.arun())):
+            result = runner()
+            assert result.timed_out == ["Slow"] and len(result.leads["Fast"]) == 5
+            assert len(result.leads["Slow"]) == 10
+        print("[4] Timed-out source kept its finished page; other sources complete.")
+
+        # 6. Failures are isolated
+        broken = FetchScheduler().register(RestSource(server.url, "/missing"), 5, "Broken").register(pubmed, 5, "Fast")
+        result = broken.run()
+        assert "Broken" in result.errors and len(result.leads["Fast"]) == 5
+        print("[5] Failed source reported without losing the others.")
+
+    # 7. A many-page source at concurrency 1 holds one thread, not the pool; timeouts start with the first page
+    crowded = FetchScheduler(max_workers=8)
+    crowded.register(SlowSource(0.2), 16, "Slow", timeout=1.0, max_concurrency=1, page_size=1)
+    crowded.register(PubMedSource(), 5, "Fast", timeout=1.0)
+    result = crowded.run()
+    assert result.timed_out == ["Slow"] and len(result.leads["Fast"]) == 5, (result.timed_out, result.leads["Fast"])
+    assert 4 <= len(result.leads["Slow"]) <= 6
+    print(f"[6] Fast source done behind a 16-page source at concurrency 1; slow one kept "
+          f"{len(result.leads['Slow'])} pages.")
+
+    # 8. Token bucket: a burst of 2, then 10 per second
+    bucket = TokenBucket(rate=10, burst=2)
+    start = time.perf_counter()
+    for _ in range(6):
+        bucket.acquire()
+    paced = time.perf_counter() - start
+    assert 0.35 <= paced < 0.6, paced
+    print(f"[7] 6 acquisitions at 10/s with a burst of 2 took {paced:.2f}s")
+
+    # 9. Background refresh: rate-limited pages, backoff on failure, status for the dashboard
+    store = LeadStore()
+    flaky = FlakySource(failures=2)
+    refresher = RefreshScheduler(store, default_stages, workers=1, backoff=Backoff(base=0.1, cap=1.0))
+    refresher.add("LinkedIn", LinkedInSource(), 40, interval=60, rate=20, page_size=10)
+    refresher.add("PubMed", flaky, 10, interval=60)
+    assert refresher.queue_depth() == 0
+    with refresher:
+        time.sleep(0.05)
+        # One worker: LinkedIn runs while PubMed waits in the queue
+        assert refresher.queue_depth() == 1
+        deadline = time.time() + 10
+        while time.time() < deadline and refresher.status()["PubMed"].last_success is None:
+            time.sleep(0.05)
+        status = refresher.status()
+    assert status["LinkedIn"].stats.new == 40 and status["LinkedIn"].state == "idle"
+    assert status["LinkedIn"].next_run > time.time() + 50
+    assert status["PubMed"].failures == 0 and status["PubMed"].stats.new == 10
+    gaps = [later - earlier for earlier, later in zip(flaky.calls, flaky.calls[1:])]
+    assert len(flaky.calls) == 3 and 0.05 <= gaps[0] <= 0.1 + 0.05 and 0.1 <= gaps[1] <= 0.2 + 0.05, gaps
+    assert len(store) == 50 and store.top(1)["score"].notna().all()
+    print(f"[8] 4 LinkedIn pages paced at 20/s; PubMed retried after {gaps[0]:.2f}s and {gaps[1]:.2f}s "
+          f"of backoff; {len(store)} leads stored")
+
+    # 10. Triggered polls: queued once, fetched with their own limit
+    with RefreshScheduler(store, default_stages, workers=1).add("LinkedIn", LinkedInSource(), 10) as manual:
+        assert manual.status()["LinkedIn"].next_run is None
+        assert manual.trigger(limit=5) == ["LinkedIn"] and manual.trigger() == []
+        assert manual.wait_idle(timeout=5)
+        assert manual.status()["LinkedIn"].stats.new == 5 and manual.queue_depth() == 0
+    print("[9] Triggered poll queued once and fetched its own limit.")
+
+    print("[10] Verification Complete.")
+    print("----------------------------------------------------------------")
+
+
+if __name__ == "__main__":
+    test_scheduler()